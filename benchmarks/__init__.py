@@ -0,0 +1 @@
+"""性能基准脚本：本地站点/本地服务驱动，不访问外网。"""
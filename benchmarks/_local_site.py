@@ -0,0 +1,66 @@
+"""基准测试用的本地多页面新闻站点（仅监听 127.0.0.1，不访问外网）。"""
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+PARAGRAPH = (
+    "Officials said on Tuesday that the measure would take effect next month, "
+    "according to a statement released by the ministry. Analysts expect the change "
+    "to affect trade flows across the region for the rest of the year."
+)
+
+
+def article_html(i: int, paragraphs: int = 12) -> str:
+    body = "\n".join(f"<p>{PARAGRAPH} ({i}.{n})</p>" for n in range(paragraphs))
+    return (
+        f"<html><head><title>Local story {i}</title></head><body>"
+        f"<nav><a href='/'>Home</a> <a href='/world'>World</a></nav>"
+        f"<article><h1>Local story {i}</h1>{body}</article>"
+        f"<footer><a href='/about'>About</a></footer></body></html>"
+    )
+
+
+def portal_html(pages: int) -> str:
+    links = "\n".join(
+        f"<li><a href='/news/2025/local-story-{i}'>Local story headline number {i}</a></li>" for i in range(pages)
+    )
+    return f"<html><head><title>Local portal</title></head><body><ul>{links}</ul></body></html>"
+
+
+@contextmanager
+def serve_site(pages: int = 10, delay: float = 0.0) -> Iterator[str]:
+    """启动本地站点：/ 为门户首页，/news/2025/local-story-{i} 为文章；delay 为每个响应的人为延迟（秒）。"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if delay:
+                time.sleep(delay)
+            if self.path.rstrip("/") == "":
+                html = portal_html(pages)
+            elif self.path.startswith("/news/2025/local-story-"):
+                html = article_html(int(self.path.rsplit("-", 1)[-1] or 0))
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
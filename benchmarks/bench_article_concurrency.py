@@ -0,0 +1,57 @@
+"""
+基准：ArticleCrawlerTool 顺序抓取 vs 并发抓取（全局/单站点并发上限）。
+
+用法：python -m benchmarks.bench_article_concurrency [页数] [每页人为延迟秒]
+所有抓取都绕过抓取缓存（否则预热后各模式计时的都是缓存命中），也不写入本地证据索引。
+"""
+import json
+import sys
+import time
+
+from benchmarks._local_site import serve_site
+from news_verify.tools.browser_pool import shutdown_crawler_pool
+from news_verify.tools.crawl import ArticleCrawlerTool, CRAWL_CONCURRENCY, CRAWL_PER_HOST
+
+
+def make_tool(**limits: int) -> ArticleCrawlerTool:
+    return ArticleCrawlerTool(use_cache=False, index_evidence=False, **limits)
+
+
+def timed_crawl(tool: ArticleCrawlerTool, articles_json: str) -> float:
+    t0 = time.perf_counter()
+    data = json.loads(tool._run(articles_json))
+    elapsed = time.perf_counter() - t0
+    errors = [u for u, e in data.items() if e.get("error")]
+    if errors:
+        print(f"  {len(errors)} 个页面失败: {errors[:3]}")
+    return elapsed
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    try:
+        with serve_site(pages=pages, delay=delay) as base:
+            articles = [{"url": f"{base}/news/2025/local-story-{i}"} for i in range(pages)]
+            articles_json = json.dumps(articles)
+            # 预热浏览器池，使两种模式都不含冷启动时间
+            make_tool(max_concurrency=CRAWL_CONCURRENCY)._run(articles_json)
+            sequential = timed_crawl(make_tool(max_concurrency=1, per_host_limit=1), articles_json)
+            concurrent = timed_crawl(
+                make_tool(max_concurrency=CRAWL_CONCURRENCY, per_host_limit=CRAWL_CONCURRENCY),
+                articles_json,
+            )
+            polite = timed_crawl(
+                make_tool(max_concurrency=CRAWL_CONCURRENCY, per_host_limit=CRAWL_PER_HOST),
+                articles_json,
+            )
+    finally:
+        shutdown_crawler_pool()
+    print(f"pages={pages}, delay={delay}s, concurrency={CRAWL_CONCURRENCY}, per_host={CRAWL_PER_HOST}")
+    print(f"sequential            : {sequential:.2f}s")
+    print(f"concurrent            : {concurrent:.2f}s  ({sequential / concurrent:.1f}x)")
+    print(f"concurrent (per-host) : {polite:.2f}s  ({sequential / polite:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
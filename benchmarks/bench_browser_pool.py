@@ -0,0 +1,56 @@
+"""
+基准：每次调用新建浏览器（冷启动） vs 共享浏览器池（预热后复用）。
+
+用法：python -m benchmarks.bench_browser_pool [调用次数]
+"""
+import asyncio
+import sys
+import time
+
+from crawl4ai import AsyncWebCrawler
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+
+from benchmarks._local_site import serve_site
+from news_verify.tools.browser_pool import CrawlerPool
+
+
+def _run_config() -> CrawlerRunConfig:
+    return CrawlerRunConfig(page_timeout=90_000, wait_until="commit")
+
+
+def bench_cold(url: str, calls: int) -> float:
+    async def once() -> None:
+        async with AsyncWebCrawler(config=BrowserConfig()) as crawler:
+            await crawler.arun(url=url, config=_run_config())
+
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        asyncio.run(once())
+    return time.perf_counter() - t0
+
+
+def bench_pool(url: str, calls: int) -> float:
+    pool = CrawlerPool(size=1)
+    try:
+        pool.warm()
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            pool.run(pool.arun(url, _run_config()))
+        return time.perf_counter() - t0
+    finally:
+        pool.close()
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with serve_site(pages=5) as base:
+        cold = bench_cold(base + "/", calls)
+        warm = bench_pool(base + "/", calls)
+    print(f"calls={calls}")
+    print(f"cold start : total {cold:.2f}s, {cold / calls * 1000:.0f} ms/call")
+    print(f"warm pool  : total {warm:.2f}s, {warm / calls * 1000:.0f} ms/call")
+    print(f"speedup    : {cold / warm:.1f}x" if warm else "speedup    : n/a")
+
+
+if __name__ == "__main__":
+    main()
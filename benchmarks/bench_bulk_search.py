@@ -0,0 +1,111 @@
+"""
+基准：核查 Agent 逐轮调用 serper_search（每轮一次 LLM 调用 + 一次搜索）vs 批量并发执行全部查询后一次性交给 Agent。
+
+搜索请求发往本地搜索替身服务（tools/search_local.py，不访问外网、不消耗 API 配额）。两种模式都由 ScriptedAgent
+驱动：它按核查任务的步骤逐轮发起工具调用（读文件、搜索）并计数，轮次数来自实际执行的循环（批量模式下证据为空的声明
+会多一轮补搜）；不调用模型，LLM 耗时按给定的单轮秒数估算，输出中标为 assumed。
+
+用法：python -m benchmarks.bench_bulk_search [声明数] [每声明查询数] [搜索延迟秒] [单轮 LLM 秒]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from news_verify.bulk_search import BulkSearchExecutor, SEARCH_CONCURRENCY
+from news_verify.structured import SearchQueryPlan
+from news_verify.tools.search import LocalSearchBackend
+from news_verify.tools.search_local import serve_local_search
+
+
+class ScriptedAgent:
+    """ReAct 循环替身：每次 step() 计为一轮 LLM 调用，带工具时真实执行并累计工具耗时。"""
+
+    def __init__(self):
+        self.turns = 0
+        self.tool_seconds = 0.0
+
+    def step(self, tool: Optional[Callable[..., Any]] = None, *args: Any) -> Any:
+        self.turns += 1
+        if tool is None:
+            return None
+        t0 = time.perf_counter()
+        try:
+            return tool(*args)
+        finally:
+            self.tool_seconds += time.perf_counter() - t0
+
+
+def read_file(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def make_plan(claims: int, per_claim: int) -> SearchQueryPlan:
+    return SearchQueryPlan.model_validate({
+        "search_queries": [
+            {
+                "claim_id": c + 1,
+                "claim": f"Local claim number {c}",
+                "queries": [f"interest rates inflation claim{c}q{q}" for q in range(per_claim)],
+            }
+            for c in range(claims)
+        ]
+    })
+
+
+def main() -> None:
+    claims = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    per_claim = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.4
+    turn = float(sys.argv[4]) if len(sys.argv) > 4 else 2.0
+    plan = make_plan(claims, per_claim)
+    queries = [q.query for _, q in plan.all_queries()]
+
+    with tempfile.TemporaryDirectory() as tmp, serve_local_search(latency=latency) as server:
+        plan_path, bundle_path = Path(tmp) / "search_queries.json", Path(tmp) / "evidence_bundle.json"
+        plan_path.write_text(plan.model_dump_json(), encoding="utf-8")
+        # 本地后端不读写搜索缓存与证据索引，两种模式都真实请求
+        client = LocalSearchBackend(url=server.url)
+        client.search("warm up connection", num_results=1)
+
+        # 逐轮：读计划一轮，每个查询一轮 serper_search，最后一轮写结论
+        agent = ScriptedAgent()
+        t0 = time.perf_counter()
+        agent.step(read_file, plan_path)
+        for q in queries:
+            agent.step(client.search, q, 5)
+        agent.step()
+        sequential, sequential_turns = time.perf_counter() - t0, agent.turns
+
+        # 批量：流程先并发执行全部查询（不占 LLM 轮次），Agent 读计划与证据包，只为没有证据的声明补搜，再写结论
+        executor = BulkSearchExecutor(
+            client=client, concurrency=SEARCH_CONCURRENCY, num_results=5, use_local_index=False
+        )
+        agent = ScriptedAgent()
+        t0 = time.perf_counter()
+        bundle = executor.run(plan)
+        bundle_path.write_text(json.dumps(bundle, ensure_ascii=False), encoding="utf-8")
+        agent.step(read_file, plan_path)
+        for claim in json.loads(agent.step(read_file, bundle_path))["claims"]:
+            if not claim["evidence"]:
+                agent.step(client.search, claim["claim"], 5)
+        agent.step()
+        bulk, bulk_turns = time.perf_counter() - t0, agent.turns
+        client.close()
+
+    evidence = sum(len(c["evidence"]) for c in bundle["claims"])
+    print(f"claims={claims}, queries={len(queries)}, search_latency={latency}s, "
+          f"concurrency={SEARCH_CONCURRENCY}, llm_turn={turn}s (assumed)")
+    print(f"sequential : tools {sequential:.2f}s, llm turns {sequential_turns:3d} (counted), "
+          f"est. total {sequential + sequential_turns * turn:.1f}s")
+    print(f"bulk       : tools {bulk:.2f}s, llm turns {bulk_turns:3d} (counted), "
+          f"est. total {bulk + bulk_turns * turn:.1f}s  ({sequential / bulk:.1f}x search speedup)")
+    print("             est. total = measured tool time + counted turns x assumed llm_turn; no model is called")
+    print(f"bundle     : {evidence} deduplicated results across {len(bundle['claims'])} claims, "
+          f"{bundle['stats']['requests_avoided']} requests avoided by query merging")
+
+
+if __name__ == "__main__":
+    main()
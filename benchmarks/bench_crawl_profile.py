@@ -0,0 +1,134 @@
+"""
+基准：浏览器抓取 full 配置档 vs text 配置档（拦截图片/字体/样式表与广告追踪请求）。
+
+用法：python -m benchmarks.bench_crawl_profile [页数] [资源延迟秒]
+本地站点的文章页引用大图、字体、样式表，以及从 localhost（模拟第三方追踪域名）加载的脚本；
+统计服务端实际发送的字节数与拿到正文的耗时。
+"""
+import os
+import sys
+
+# 把 localhost 当作追踪域名，须在导入 news_verify 之前设置
+os.environ.setdefault("CRAWL_BLOCK_HOSTS", "localhost")
+
+import threading  # noqa: E402
+import time  # noqa: E402
+from contextlib import contextmanager  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+from typing import Dict, Iterator  # noqa: E402
+
+from benchmarks._local_site import PARAGRAPH  # noqa: E402
+from news_verify.tools.browser_pool import CrawlerPool  # noqa: E402
+from news_verify.tools.crawl_profiles import block_stats, crawl_run_config  # noqa: E402
+
+IMAGE_BYTES = 300_000
+FONT_BYTES = 120_000
+CSS_BYTES = 60_000
+SCRIPT_BYTES = 80_000
+
+
+def heavy_article_html(i: int, port: int) -> str:
+    body = "\n".join(
+        f"<p>{PARAGRAPH} ({i}.{n})</p><img src='/assets/img-{i}-{n}.jpg'>" for n in range(8)
+    )
+    trackers = "".join(f"<script src='http://localhost:{port}/track/t{k}.js'></script>" for k in range(3))
+    return (
+        f"<html><head><title>Heavy story {i}</title>"
+        f"<link rel='stylesheet' href='/assets/site.css'>"
+        f"<style>@font-face {{ font-family: F; src: url('/assets/font.woff2'); }} body {{ font-family: F; }}</style>"
+        f"{trackers}</head><body><article><h1>Heavy story {i}</h1>{body}</article></body></html>"
+    )
+
+
+@contextmanager
+def serve_heavy_site(delay: float) -> Iterator[Dict[str, object]]:
+    """启动本地站点；yield 的 dict 含 base（URL）与 bytes（按路径前缀累计的发送字节数）。"""
+    state: Dict[str, object] = {"bytes": {}}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            port = self.server.server_address[1]
+            if self.path.startswith("/news/"):
+                data, ctype = heavy_article_html(int(self.path.rsplit("-", 1)[-1]), port).encode(), "text/html"
+            else:
+                time.sleep(delay)
+                if self.path.startswith("/track/"):
+                    data, ctype = b"/*" + b"x" * SCRIPT_BYTES + b"*/", "application/javascript"
+                elif self.path.endswith(".css"):
+                    data, ctype = b"/*" + b"x" * CSS_BYTES + b"*/", "text/css"
+                elif self.path.endswith(".woff2"):
+                    data, ctype = b"\0" * FONT_BYTES, "font/woff2"
+                else:
+                    data, ctype = b"\0" * IMAGE_BYTES, "image/jpeg"
+            with lock:
+                counters = state["bytes"]
+                key = self.path.split("/")[1]
+                counters[key] = counters.get(key, 0) + len(data)
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["base"] = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_profile(pool: CrawlerPool, site: Dict[str, object], profile: str, pages: int) -> Dict[str, float]:
+    site["bytes"].clear()
+    config = crawl_run_config(profile, wait_until="load")
+    latencies = []
+    missing = 0
+    for i in range(pages):
+        t0 = time.perf_counter()
+        result = pool.run(pool.arun(f"{site['base']}/news/heavy-story-{i}", config))
+        latencies.append(time.perf_counter() - t0)
+        if f"({i}.7)" not in str(getattr(result, "markdown", "") or ""):
+            missing += 1
+    latencies.sort()
+    return {
+        "bytes": sum(site["bytes"].values()),
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "missing": missing,
+    }
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    pool = CrawlerPool(size=1)
+    try:
+        pool.warm()
+        with serve_heavy_site(delay) as site:
+            results = {profile: bench_profile(pool, site, profile, pages) for profile in ("full", "text")}
+    finally:
+        pool.close()
+
+    print(f"pages={pages}, resource delay={delay}s")
+    for profile, r in results.items():
+        print(
+            f"{profile:5s}: {r['bytes'] / 1e6:7.2f} MB transferred, time-to-content avg {r['avg_ms']:.0f} ms, "
+            f"p95 {r['p95_ms']:.0f} ms, pages missing body text: {int(r['missing'])}"
+        )
+    full, text = results["full"], results["text"]
+    if full["bytes"] and text["avg_ms"]:
+        print(f"text profile: {1 - text['bytes'] / full['bytes']:.0%} fewer bytes, "
+              f"{full['avg_ms'] / text['avg_ms']:.1f}x faster")
+    print(f"blocked requests: {dict(block_stats)}")
+
+
+if __name__ == "__main__":
+    main()
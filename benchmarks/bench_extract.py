@@ -0,0 +1,102 @@
+"""
+基准：本地正文抽取（news_verify.extract）的质量与耗时。
+
+用法：python -m benchmarks.bench_extract <保存的页面目录> [重复次数]
+目录中每个 <name>.md 为抓取得到的原始 markdown（也可放 <name>.html，先经 html_to_markdown 转换）；
+若存在 <name>.gold.md（例如以往运行中 LLM 清洗得到的 extracted_news.md），按词计算与之的精确率/召回率/F1。
+报告：单页耗时、可跳过 LLM 的比例、跳过页的正文 F1、pruned 对正文的召回以及交给 LLM 的输入缩减比例。
+"""
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from news_verify.extract import extract_main_content, EXTRACT_SKIP_LLM_CONFIDENCE
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[぀-ヿ㐀-鿿가-힯]", re.I)
+
+
+def _tokens(text: str) -> Counter:
+    text = re.sub(r"\]\([^)]*\)", "]", text or "")
+    return Counter(t.lower() for t in _TOKEN_RE.findall(text))
+
+
+def overlap(predicted: str, gold: str) -> Tuple[float, float, float]:
+    """按词（中文按字）的多重集合重合度，返回 (precision, recall, f1)。"""
+    p, g = _tokens(predicted), _tokens(gold)
+    common = sum((p & g).values())
+    if not common:
+        return 0.0, 0.0, 0.0
+    precision = common / sum(p.values())
+    recall = common / sum(g.values())
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def load_corpus(root: Path) -> List[Tuple[str, str, Optional[str]]]:
+    pages = []
+    for path in sorted(root.iterdir()):
+        if path.name.endswith(".gold.md") or path.suffix not in (".md", ".html"):
+            continue
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix == ".html":
+            from news_verify.tools.fetch import html_to_markdown
+
+            raw = html_to_markdown(raw)[0]
+        gold_path = path.with_name(path.stem + ".gold.md")
+        gold = gold_path.read_text(encoding="utf-8", errors="replace") if gold_path.exists() else None
+        pages.append((path.name, raw, gold))
+    return pages
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    pages = load_corpus(Path(sys.argv[1]))
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if not pages:
+        sys.exit("目录中没有 .md/.html 页面")
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for _, raw, _ in pages:
+            extract_main_content(raw)
+    per_page_ms = (time.perf_counter() - t0) / (repeat * len(pages)) * 1000
+
+    skipped = 0
+    raw_chars = llm_chars = 0
+    stats: Dict[str, List[float]] = {"f1_skipped": [], "f1_all": [], "pruned_recall": []}
+    for name, raw, gold in pages:
+        result = extract_main_content(raw)
+        skip = bool(result["text"]) and result["confidence"] >= EXTRACT_SKIP_LLM_CONFIDENCE
+        skipped += skip
+        raw_chars += len(raw)
+        llm_chars += 0 if skip else len(result["pruned"] or raw)
+        line = f"  {name[:40]:40s} conf={result['confidence']:.2f} {'local' if skip else 'llm  '}"
+        if gold is not None:
+            _, _, f1 = overlap(result["text"], gold)
+            _, pruned_recall, _ = overlap(result["pruned"], gold)
+            stats["f1_all"].append(f1)
+            stats["pruned_recall"].append(pruned_recall)
+            if skip:
+                stats["f1_skipped"].append(f1)
+            line += f" f1={f1:.3f} pruned_recall={pruned_recall:.3f}"
+        print(line)
+
+    print(f"pages={len(pages)}, repeat={repeat}, threshold={EXTRACT_SKIP_LLM_CONFIDENCE}")
+    print(f"extract latency     : {per_page_ms:.2f} ms/page")
+    print(f"LLM calls skipped   : {skipped}/{len(pages)} ({skipped / len(pages):.0%})")
+    print(f"LLM input chars     : {llm_chars}/{raw_chars} ({llm_chars / raw_chars:.0%} of raw)" if raw_chars else "")
+    if stats["f1_all"]:
+        print(f"text F1 (all gold)  : {_mean(stats['f1_all']):.3f} over {len(stats['f1_all'])} pages")
+        print(f"text F1 (skipped)   : {_mean(stats['f1_skipped']):.3f} over {len(stats['f1_skipped'])} pages")
+        print(f"pruned recall       : {_mean(stats['pruned_recall']):.3f}")
+
+
+if __name__ == "__main__":
+    main()
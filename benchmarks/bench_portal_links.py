@@ -0,0 +1,90 @@
+"""
+基准：门户链接抽取，原 BeautifulSoup 全树实现 vs 流式锚点 tokenizer（news_verify.tools.links）。
+
+用法：python -m benchmarks.bench_portal_links <保存的门户 HTML 目录> [重复次数] [门户 URL]
+目录中每个 *.html 视为一个门户首页；同时校验两种实现输出完全一致。
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from news_verify.tools.links import extract_portal_items
+
+
+def reference_extract(html: str, portal_url: str) -> List[Dict[str, str]]:
+    """原 PortalCrawlerTool 中的实现，作为正确性与速度的基准。"""
+    soup = BeautifulSoup(html, "html.parser")
+    seen: set = set()
+    items: List[Dict[str, str]] = []
+    for a in soup.find_all("a", href=True):
+        href = (a["href"] or "").strip()
+        text = a.get_text(strip=True)
+        if not text or len(text) < 3:
+            continue
+        full_url = href
+        if full_url.startswith("//"):
+            full_url = "https:" + full_url
+        elif full_url.startswith("/"):
+            full_url = urljoin(portal_url, full_url)
+        if not full_url.startswith("http"):
+            continue
+        parsed = urlparse(full_url)
+        path = (parsed.path or "").lower()
+        if full_url.rstrip("/") == portal_url.rstrip("/"):
+            continue
+        if any(skip in path for skip in ["/login", "/signup", "/tag/", "/author/", "/subscribe"]):
+            continue
+        path_segments = [s for s in path.split("/") if s]
+        is_article = (
+            "/article" in path
+            or "/news" in path
+            or "/story" in path
+            or "/202" in path
+            or "detail" in path
+            or (len(path) > 15 and ("/" in path[1:] or path.count("-") >= 2))
+            or (len(path_segments) >= 2 and len(path) > 8)
+        )
+        if not is_article:
+            continue
+        if full_url in seen:
+            continue
+        seen.add(full_url)
+        items.append({"title": text[:200], "url": full_url})
+    return items
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    corpus = sorted(Path(sys.argv[1]).glob("*.html"))
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    portal_url = sys.argv[3] if len(sys.argv) > 3 else "https://example.com/"
+    pages = [p.read_text(encoding="utf-8", errors="replace") for p in corpus]
+    total_mb = sum(len(h) for h in pages) / 1e6
+
+    mismatches = [
+        p.name for p, html in zip(corpus, pages)
+        if reference_extract(html, portal_url) != extract_portal_items(html, portal_url)
+    ]
+
+    def timed(fn) -> float:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for html in pages:
+                fn(html, portal_url)
+        return time.perf_counter() - t0
+
+    ref = timed(reference_extract)
+    fast = timed(extract_portal_items)
+    print(f"pages={len(pages)} ({total_mb:.1f} MB), repeat={repeat}")
+    print(f"BeautifulSoup  : {ref:.3f}s")
+    print(f"anchor stream  : {fast:.3f}s  ({ref / fast:.1f}x)" if fast else "anchor stream  : n/a")
+    print("identical output: " + ("yes" if not mismatches else f"NO ({', '.join(mismatches)})"))
+
+
+if __name__ == "__main__":
+    main()
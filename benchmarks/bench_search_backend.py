@@ -0,0 +1,59 @@
+"""
+基准：不同并发数下批量搜索的吞吐与尾延迟，请求发往本地搜索替身服务（可注入延迟抖动、503 与 429）。
+
+用于选择 SEARCH_CONCURRENCY：吞吐不再随并发上升、或失败 / 429 开始增多时即为合适上限。
+
+用法：python -m benchmarks.bench_search_backend [查询数] [延迟秒] [抖动秒] [503 比例] [429 比例] [语料文件]
+"""
+import sys
+import time
+
+from news_verify.bulk_search import BulkSearchExecutor
+from news_verify.structured import SearchQueryPlan
+from news_verify.tools.search import LocalSearchBackend
+from news_verify.tools.search_local import load_corpus, serve_local_search
+
+CONCURRENCY_LEVELS = (1, 2, 4, 8, 16)
+_WORDS = ("interest rates", "tariffs exports", "election vote", "emissions targets",
+          "earnings quarter", "vaccine outbreak", "oil production", "court appeal")
+
+
+def make_plan(queries: int) -> SearchQueryPlan:
+    return SearchQueryPlan.model_validate({
+        "search_queries": [
+            {"claim_id": i + 1, "claim": f"claim {i}", "queries": [f"{_WORDS[i % len(_WORDS)]} report {i}"]}
+            for i in range(queries)
+        ]
+    })
+
+
+def main() -> None:
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    jitter = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    error_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.02
+    rate_limit_rate = float(sys.argv[5]) if len(sys.argv) > 5 else 0.0
+    corpus = load_corpus(sys.argv[6]) if len(sys.argv) > 6 else None
+    plan = make_plan(queries)
+
+    print(f"queries={queries}, latency={latency}s+[0,{jitter}]s, 503={error_rate:.0%}, 429={rate_limit_rate:.0%}")
+    print(f"{'concurrency':>11} {'wall_s':>7} {'qps':>6} {'p95_ms':>7} {'errors':>6}  statuses")
+    for concurrency in CONCURRENCY_LEVELS:
+        with serve_local_search(
+            corpus=corpus, latency=latency, jitter=jitter, error_rate=error_rate,
+            rate_limit_rate=rate_limit_rate, seed=0,
+        ) as server:
+            backend = LocalSearchBackend(url=server.url)
+            executor = BulkSearchExecutor(client=backend, concurrency=concurrency, use_local_index=False)
+            snapshot = backend.snapshot()
+            t0 = time.perf_counter()
+            executor.run(plan)
+            wall = time.perf_counter() - t0
+            usage = backend.stats_since(snapshot)
+            backend.close()
+        print(f"{concurrency:>11} {wall:>7.2f} {queries / wall:>6.1f} {usage['p95_latency_ms']:>7} "
+              f"{usage['errors']:>6}  server={server.stats['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,13 @@
 """新闻发现与事实核查流程中的新闻侧智能体。"""
 from crewai import Agent
 
-from news_verify.llm import llm
-from news_verify.tools.crawl import portal_crawler_tool, article_crawler_tool
+from news_verify.llm import llm_for
+from news_verify.tools.crawl import article_crawler_tool
 from news_verify.tools.verify import serper_search_tool
 
-# SerperDevTool 用于 fact_check 流程（逐篇事实核查）
-try:
-    from crewai_tools import SerperDevTool
-    serper_tool = SerperDevTool()
-except Exception:
-    serper_tool = serper_search_tool  # 无 crewai_tools 时退化为自定义 SerperSearchTool
+# fact_check 流程（逐篇事实核查）同样用自定义 SerperSearchTool：先查本地证据索引，
+# 并遵守 serper_search_tool.excluding() 对正在核查文章的排除
+serper_tool = serper_search_tool
 
 interest_extractor_agent = Agent(
     role="User Interest Analyzer",
@@ -22,22 +19,21 @@ interest_extractor_agent = Agent(
         "你擅长从用户的自然语言描述中识别出关注的领域，比如科技、财经、体育、地区、公司名等，"
         "并将其整理为结构化的兴趣标签。"
     ),
-    llm=llm,
+    llm=llm_for("interest"),
     verbose=True,
 )
 
 news_selector_agent = Agent(
     role="News Selector",
     goal=(
-        "根据用户兴趣描述，用你的理解能力从候选新闻中选出语义上最相关的若干篇；"
+        "根据用户兴趣描述，用你的理解能力从门户候选新闻中选出语义上最相关的若干篇；"
         "不依赖关键词匹配，而是理解标题和用户兴趣的含义后再筛选。"
     ),
     backstory=(
         "你是一名资深新闻编辑，擅长通过理解标题和主题（而非简单关键词）判断新闻与读者兴趣的相关性，"
         "能从大量候选中挑出语义上最相关、最有价值的几篇。"
     ),
-    tools=[portal_crawler_tool],
-    llm=llm,
+    llm=llm_for("select"),
     verbose=True,
 )
 
@@ -46,7 +42,7 @@ article_saver_agent = Agent(
     goal="抓取并保存选中的新闻全文，以便后续事实核查。",
     backstory="你负责把所有选中的新闻页面抓取下来，并输出结构化的文章内容（标题、正文等）。",
     tools=[article_crawler_tool],
-    llm=llm,
+    llm=llm_for("collect"),
     verbose=True,
 )
 
@@ -60,7 +56,7 @@ fact_checker_agent = Agent(
         "通过多个可靠来源交叉验证，并明确给出每条结论。"
     ),
     tools=[serper_tool],
-    llm=llm,
+    llm=llm_for("fact_check"),
     verbose=True,
 )
 
@@ -68,6 +64,6 @@ report_writer_agent = Agent(
     role="Fact Check Reporter",
     goal="根据事实核查结果，撰写一份给终端用户看的中文验证报告，结构清晰、结论明确。",
     backstory="你是一名调查记者，擅长把复杂的核查过程总结为通俗易懂的报告。",
-    llm=llm,
+    llm=llm_for("report"),
     verbose=True,
 )
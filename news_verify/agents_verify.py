@@ -1,7 +1,7 @@
 """验证阶段智能体：分析新闻、生成核查计划、执行 Serper 验证。"""
 from crewai import Agent
 
-from news_verify.llm import llm
+from news_verify.llm import llm_for
 from news_verify.tools.verify import file_read_tool, serper_search_tool
 
 analyze_news_agent = Agent(
@@ -14,7 +14,7 @@ analyze_news_agent = Agent(
         "You ALWAYS output ONLY the final results (JSON or markdown). Never include thoughts or explanations."
     ),
     tools=[file_read_tool],
-    llm=llm,
+    llm=llm_for("analyze"),
     verbose=False,
 )
 
@@ -27,6 +27,6 @@ verify_claims_agent = Agent(
         "You ALWAYS output ONLY the final results (JSON and markdown). Never include thoughts or explanations."
     ),
     tools=[serper_search_tool, file_read_tool],
-    llm=llm,
+    llm=llm_for("verify"),
     verbose=False,
 )
@@ -0,0 +1,210 @@
+"""
+核查计划的批量搜索：一次读出 search_queries.json 的全部查询，在并发上限内同时执行，
+按声明汇总成证据包交给核查 Agent，而不是让 Agent 每轮 ReAct 只调一次 serper_search。
+
+- 并发数 SEARCH_CONCURRENCY（默认 6），每个查询取 SEARCH_BUNDLE_RESULTS 条结果；
+- 执行前经 QueryDeduper（tools/query_dedupe.py）合并近似重复的查询，只搜索代表查询，结果映射回每个提出它的声明；
+  同一轮运行共用一个 QueryDeduper 时，后面文章的查询直接复用前面已成功的结果（跨轮运行由搜索缓存处理），
+  复用时去掉本篇 exclude_urls 中的链接及标题与本篇属于同一报道的转载；
+- 每个查询先查本地证据索引（tools/evidence_index.py），本地证据充足且未过期时不请求 Serper；
+- 证据包中每条声明列出各查询的执行情况，以及按链接去重的结果（记录是哪些查询找到的）；
+- stats 记录查询数、合并与复用数、实际请求数、失败数、墙钟耗时与各请求耗时之和（两者之比即并发带来的加速）。
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from news_verify.structured import SearchQueryPlan, ensure_model
+from news_verify.tools.canonical import canonicalize_url, same_story
+from news_verify.tools.evidence_index import EvidenceIndex, evidence_index, EVIDENCE_INDEX_ENABLED
+from news_verify.tools.query_dedupe import QueryDeduper
+from news_verify.tools.search import SearchBackend, search_backend
+
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "6"))
+SEARCH_BUNDLE_RESULTS = int(os.getenv("SEARCH_BUNDLE_RESULTS", "5"))
+# 每条声明最多保留的去重结果数，控制证据包进入 Agent 上下文的长度
+SEARCH_BUNDLE_MAX_EVIDENCE = int(os.getenv("SEARCH_BUNDLE_MAX_EVIDENCE", "12"))
+
+
+class BulkSearchExecutor:
+    """线程安全；run() 执行一份 SearchQueryPlan 并返回证据包 dict。"""
+
+    def __init__(
+        self,
+        client: Optional[SearchBackend] = None,
+        concurrency: int = SEARCH_CONCURRENCY,
+        num_results: int = SEARCH_BUNDLE_RESULTS,
+        max_evidence: int = SEARCH_BUNDLE_MAX_EVIDENCE,
+        index: Optional[EvidenceIndex] = None,
+        use_local_index: bool = EVIDENCE_INDEX_ENABLED,
+    ):
+        self.client = client or search_backend
+        self.index = index or evidence_index
+        self.use_local_index = use_local_index
+        self.concurrency = max(1, concurrency)
+        self.num_results = num_results
+        self.max_evidence = max_evidence
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            "plans": 0, "queries": 0, "merged": 0, "reused": 0, "requests_avoided": 0,
+            "requests": 0, "cached": 0, "local": 0, "errors": 0,
+            "wall_seconds": 0.0, "request_seconds": 0.0,
+        }
+
+    def _search_one(self, query: str, exclude_urls: List[str], exclude_titles: List[str]) -> Dict[str, Any]:
+        """本地证据充足时返回本地结果（local 为 True），否则请求搜索后端。"""
+        if self.use_local_index:
+            local = self.index.lookup(query, self.num_results, exclude_urls, exclude_titles)
+            if local["sufficient"]:
+                return {
+                    "ok": True, "status": None, "results": local["results"], "error": None,
+                    "latency_ms": round(local["latency_ms"]), "cached": False, "local": True,
+                }
+        return dict(self.client.search(query, num_results=self.num_results), local=False)
+
+    def _search_all(
+        self, queries: List[str], exclude_urls: List[str], exclude_titles: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """并发执行去重后的查询，返回 查询 → 结果。"""
+        if not queries:
+            return {}
+        workers = min(self.concurrency, len(queries))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-search") as pool:
+            results = list(pool.map(lambda q: self._search_one(q, exclude_urls, exclude_titles), queries))
+        return dict(zip(queries, results))
+
+    def run(
+        self,
+        plan: SearchQueryPlan,
+        exclude_urls: Iterable[str] = (),
+        deduper: Optional[QueryDeduper] = None,
+        exclude_titles: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        执行计划；exclude_urls（如正在核查的文章）及标题与 exclude_titles 属于同一报道的转载副本不作为本地证据。
+        deduper 为本轮运行共用的 QueryDeduper，未给出时只在本计划内合并。
+        """
+        deduper = deduper or QueryDeduper()
+        exclude_urls = [u for u in exclude_urls if u]
+        exclude_titles = [t for t in exclude_titles if t]
+        excluded = {canonicalize_url(u) for u in exclude_urls}
+        planned = plan.all_queries()
+        mapping = deduper.assign([q.query for _, q in planned])
+        by_rep: Dict[str, Dict[str, Any]] = {}
+        to_run: List[str] = []
+        for rep in dict.fromkeys(mapping.values()):
+            prior = deduper.cached(rep)
+            if prior is not None:
+                # 前面文章的结果可能含本篇自身或其转载（如本地索引中已有预抓的本篇正文），按本篇的排除条件过滤
+                kept = [
+                    r for r in prior["results"]
+                    if not (r.get("link") and canonicalize_url(r["link"]) in excluded)
+                    and not (exclude_titles and same_story(r.get("title", ""), exclude_titles))
+                ]
+                by_rep[rep] = dict(prior, results=kept, reused=True)
+            else:
+                to_run.append(rep)
+        t0 = time.perf_counter()
+        fresh = self._search_all(to_run, exclude_urls, exclude_titles)
+        wall = time.perf_counter() - t0
+        for rep, res in fresh.items():
+            deduper.record(rep, res)
+        by_rep.update(fresh)
+
+        claims: List[Dict[str, Any]] = []
+        for i, entry in enumerate(plan.search_queries):
+            queries: List[Dict[str, Any]] = []
+            evidence: Dict[str, Dict[str, Any]] = {}
+            for q in entry.queries:
+                rep = mapping[q.query]
+                res = by_rep[rep]
+                queries.append({
+                    "query": q.query, "purpose": q.purpose, "ok": res["ok"], "cached": res["cached"],
+                    "local": res["local"], "error": res["error"], "result_count": len(res["results"]),
+                    "merged_into": rep if rep != q.query else None, "reused": res.get("reused", False),
+                })
+                for item in res["results"]:
+                    key = item.get("link") or item.get("title") or ""
+                    if not key:
+                        continue
+                    if key not in evidence:
+                        evidence[key] = {**item, "found_by": []}
+                    if q.query not in evidence[key]["found_by"]:
+                        evidence[key]["found_by"].append(q.query)
+            # 被多个查询同时找到的结果排在前面
+            ranked = sorted(evidence.values(), key=lambda e: -len(e["found_by"]))
+            claims.append({
+                "claim_id": entry.claim_id if entry.claim_id is not None else i + 1,
+                "claim": entry.claim,
+                "queries": queries,
+                "evidence": ranked[: self.max_evidence],
+            })
+
+        results = list(fresh.values())
+        summary = {
+            "queries": len(planned),
+            "merged": sum(1 for _, q in planned if mapping[q.query] != q.query),
+            "reused": len(by_rep) - len(fresh),
+            "requests_avoided": len(planned) - len(fresh),
+            "requests": sum(1 for r in results if not r["cached"] and not r["local"]),
+            "cached": sum(1 for r in results if r["cached"]),
+            "local": sum(1 for r in results if r["local"]),
+            "errors": sum(1 for r in results if not r["ok"]),
+            "concurrency": min(self.concurrency, len(to_run)) if to_run else 0,
+            "wall_ms": round(wall * 1000),
+            "sum_latency_ms": sum(r["latency_ms"] for r in results),
+        }
+        with self._lock:
+            self.stats["plans"] += 1
+            for k in ("queries", "merged", "reused", "requests_avoided"):
+                self.stats[k] += summary[k]
+            self.stats["requests"] += summary["requests"]
+            self.stats["cached"] += summary["cached"]
+            self.stats["local"] += summary["local"]
+            self.stats["errors"] += summary["errors"]
+            self.stats["wall_seconds"] += wall
+            self.stats["request_seconds"] += summary["sum_latency_ms"] / 1000
+        return {"claims": claims, "stats": summary}
+
+    def run_file(
+        self,
+        queries_path: str,
+        bundle_path: str,
+        exclude_urls: Iterable[str] = (),
+        deduper: Optional[QueryDeduper] = None,
+        stage: str = "analyze",
+        exclude_titles: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        读取 search_queries.json（必要时经 ensure_model 修复），执行后把证据包写到 bundle_path，返回本次 stats。
+        计划无法解析时抛 StructuredOutputError。
+        """
+        with open(queries_path, "r", encoding="utf-8") as f:
+            plan = ensure_model(f.read(), SearchQueryPlan, stage=stage)
+        bundle = self.run(plan, exclude_urls, deduper, exclude_titles)
+        with open(bundle_path, "w", encoding="utf-8") as f:
+            json.dump(bundle, f, ensure_ascii=False, indent=2)
+        return bundle["stats"]
+
+    # ---------- 统计 ----------
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, float]) -> Dict[str, Any]:
+        """相对 snapshot 的计划数、查询数、实际请求数与耗时；speedup 为各请求耗时之和 / 墙钟耗时。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        for k in ("plans", "queries", "merged", "reused", "requests_avoided", "requests", "cached", "local", "errors"):
+            delta[k] = int(delta[k])
+        wall, busy = delta.pop("wall_seconds"), delta.pop("request_seconds")
+        delta["wall_seconds"] = round(wall, 2)
+        delta["request_seconds"] = round(busy, 2)
+        delta["speedup"] = round(busy / wall, 1) if wall > 0 else 0.0
+        return delta
+
+
+bulk_search_executor = BulkSearchExecutor()
@@ -0,0 +1,154 @@
+"""
+按 token 预算切分长文本：替代按字符数截断，中日韩文本的字符数与 token 数相差很大。
+
+- count_tokens：安装了 tiktoken 时用 cl100k_base 计数，否则按“中日韩字符 1 token、其余约 4 字符 1 token”估算；
+- split_by_tokens：按段落（空行）切分并贪心合并成不超过预算的块，单段超限时依次按行、按句、按 token 硬切，
+  各块按顺序拼接即为原文，不丢内容；
+- truncate_to_tokens：需要单次输入的场景（如事实核查）按 token 预算截断。
+"""
+import importlib.util
+import os
+import re
+import threading
+from typing import Any, List, Optional, Tuple
+
+# 模型上下文窗口（token），用于推导各处的输入预算
+LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "32768"))
+# 清洗时每块的输入 token 上限；输出与输入等长量级，两者之和须小于上下文窗口
+LLM_CLEAN_CHUNK_TOKENS = int(os.getenv("LLM_CLEAN_CHUNK_TOKENS", "6000"))
+# 长文分块清洗时同时进行的 LLM 请求数
+LLM_CLEAN_CONCURRENCY = int(os.getenv("LLM_CLEAN_CONCURRENCY", "4"))
+# 单篇文章一次性交给 Agent（事实核查等）时的正文 token 上限
+MAX_CONTENT_TOKENS_FOR_LLM = int(os.getenv("MAX_CONTENT_TOKENS_FOR_LLM", str(LLM_CONTEXT_TOKENS // 2)))
+
+_CJK_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯豈-﫿＀-￯]")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?。！？；;…])\s*")
+
+_encoder: Any = None
+_encoder_lock = threading.Lock()
+_encoder_loaded = False
+
+
+def _get_encoder() -> Optional[Any]:
+    """惰性加载 tiktoken 编码器；未安装或加载失败（如离线无法下载词表）时返回 None。"""
+    global _encoder, _encoder_loaded
+    if _encoder_loaded:
+        return _encoder
+    with _encoder_lock:
+        if not _encoder_loaded:
+            if importlib.util.find_spec("tiktoken") is not None:
+                try:
+                    import tiktoken
+                    _encoder = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoder = None
+            _encoder_loaded = True
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _hard_split(text: str, max_tokens: int) -> List[str]:
+    """无自然边界可用时按 token 数硬切；切点总落在字符边界上（一个汉字可能跨多个 token）。"""
+    encoder = _get_encoder()
+    if encoder is not None:
+        data = text.encode("utf-8")
+        ends: List[int] = []
+        offset = 0
+        for token in encoder.encode(text, disallowed_special=()):
+            offset += len(encoder.decode_single_token_bytes(token))
+            ends.append(offset)
+
+        def on_char_boundary(b: int) -> bool:
+            return b >= len(data) or (data[b] & 0xC0) != 0x80
+
+        pieces = []
+        start, i = 0, 0
+        while i < len(ends):
+            # 预算内最靠后的字符边界；一个字符就超预算时向后取到下一个边界
+            j = min(i + max_tokens, len(ends))
+            while j > i + 1 and not on_char_boundary(ends[j - 1]):
+                j -= 1
+            while j < len(ends) and not on_char_boundary(ends[j - 1]):
+                j += 1
+            pieces.append(data[start:ends[j - 1]].decode("utf-8"))
+            start, i = ends[j - 1], j
+        return pieces
+    pieces: List[str] = []
+    start = 0
+    while start < len(text):
+        # 按估算规则逐字累加，保证每片不超预算
+        end, used = start, 0
+        while end < len(text):
+            cost = 1 if _CJK_RE.match(text[end]) else 0.25
+            if used + cost > max_tokens:
+                break
+            used += cost
+            end += 1
+        end = max(end, start + 1)
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+def _split_units(text: str, max_tokens: int) -> List[Tuple[str, int]]:
+    """把文本切成各自不超预算的单元（段落 → 行 → 句 → 硬切），返回 (单元, token 数)，单元保留原分隔符。"""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return [(text, tokens)]
+    for splitter in (_PARAGRAPH_RE, re.compile(r"\n"), _SENTENCE_RE):
+        parts = _split_keep(text, splitter)
+        if len(parts) > 1:
+            units: List[Tuple[str, int]] = []
+            for part in parts:
+                units.extend(_split_units(part, max_tokens))
+            return units
+    return [(p, count_tokens(p)) for p in _hard_split(text, max_tokens)]
+
+
+def _split_keep(text: str, pattern: "re.Pattern[str]") -> List[str]:
+    """按分隔符切分，分隔符并入前一段，保证 "".join(结果) == text。"""
+    parts: List[str] = []
+    start = 0
+    for m in pattern.finditer(text):
+        if m.end() <= start or m.end() >= len(text):
+            continue
+        parts.append(text[start:m.end()])
+        start = m.end()
+    parts.append(text[start:])
+    return [p for p in parts if p]
+
+
+def split_by_tokens(text: str, max_tokens: int = LLM_CLEAN_CHUNK_TOKENS) -> List[str]:
+    """按段落边界切成每块不超过 max_tokens 的若干块，"".join(块) 与原文一致；空文本返回空列表。"""
+    if not text:
+        return []
+    max_tokens = max(1, max_tokens)
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for unit, tokens in _split_units(text, max_tokens):
+        if current and used + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, used = [], 0
+        current.append(unit)
+        used += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_CONTENT_TOKENS_FOR_LLM) -> Tuple[str, bool]:
+    """保留不超过 max_tokens 的开头部分（尽量在段落边界截断），返回 (文本, 是否截断)。"""
+    if count_tokens(text) <= max_tokens:
+        return text, False
+    return split_by_tokens(text, max_tokens)[0], True
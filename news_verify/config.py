@@ -0,0 +1,11 @@
+"""跨模块共享的运行配置（不依赖爬虫、LLM 等任何子模块，可被任意层导入）。"""
+import os
+
+# 各类缓存与持久化状态（抓取缓存、LLM 缓存、搜索缓存、已见 URL、证据索引等）的根目录
+NEWS_VERIFY_CACHE_DIR = os.getenv("NEWS_VERIFY_CACHE_DIR", ".cache/news_verify")
+
+# HTTP 直取与 feed 下载使用的浏览器 User-Agent
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
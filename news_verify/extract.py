@@ -0,0 +1,185 @@
+"""
+本地正文抽取：调用 LLM 清洗前，先按文本密度与链接密度给抓取到的 markdown 分块打分，定位正文区域。
+
+- 按空行切块（标题行单独成块），每块计算可见文本长度、链接文本占比与句末标点数，初判为正文/样板/待定；
+- 待定块参考相邻块修正（夹在正文之间或紧挨正文的视为正文）；
+- 以“正文字符为正、样板字符为负”求和最大的连续区域作为正文，区域内仍剔除样板块；
+- confidence 综合区域纯度、正文集中度与正文长度；高于阈值时可直接使用抽取结果，
+  否则 pruned 只删掉确定的样板块，交给 LLM 的输入更短。
+"""
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# 置信度不低于该值时跳过 LLM 清洗，直接使用本地抽取结果；设为大于 1 的值可关闭
+EXTRACT_SKIP_LLM_CONFIDENCE = float(os.getenv("EXTRACT_SKIP_LLM_CONFIDENCE", "0.75"))
+# 正文至少这么长（加权字符数）才可能给出高置信度
+EXTRACT_MIN_BODY_CHARS = int(os.getenv("EXTRACT_MIN_BODY_CHARS", "600"))
+
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\((?:[^()\s]|\([^)]*\))*(?:\s+\"[^\"]*\")?\)")
+_BARE_URL_RE = re.compile(r"https?://\S+")
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+")
+_MARKUP_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)]|>)\s+|[*_`~|]+")
+_SENTENCE_END_RE = re.compile(r"[.!?。！？…](?:[\"'”’)）]|\s|$)")
+_CJK_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯]")
+_BOILERPLATE_RE = re.compile(
+    r"(related (?:stories|articles|news|coverage)|read more|more from|most (?:read|popular)|recommended|"
+    r"sign up|newsletter|subscribe|cookie|privacy policy|terms of (?:use|service)|all rights reserved|copyright|©|"
+    r"share this|follow us|advertisement|sponsored|skip to (?:main )?content|download the app|"
+    r"相关阅读|相关新闻|推荐阅读|热门|延伸阅读|版权所有|责任编辑|扫码|关注我们|广告|下载客户端|分享到)",
+    re.I,
+)
+
+
+def _weighted_len(text: str) -> int:
+    """可见文本长度；中日韩字符信息量大，按 3 个字符计。"""
+    return len(text) + 2 * len(_CJK_RE.findall(text))
+
+
+def _split_blocks(markdown: str) -> List[str]:
+    blocks: List[str] = []
+    for chunk in re.split(r"\n\s*\n", (markdown or "").replace("\r\n", "\n")):
+        current: List[str] = []
+        for line in chunk.split("\n"):
+            if _HEADING_RE.match(line):
+                if current:
+                    blocks.append("\n".join(current))
+                    current = []
+                blocks.append(line)
+            elif line.strip():
+                current.append(line)
+        if current:
+            blocks.append("\n".join(current))
+    return blocks
+
+
+def _block_features(block: str) -> Dict[str, Any]:
+    no_images = _IMAGE_RE.sub(" ", block)
+    link_texts = [m.group(1) for m in _LINK_RE.finditer(no_images)]
+    plain = _LINK_RE.sub(lambda m: m.group(1), no_images)
+    plain = _BARE_URL_RE.sub(" ", plain)
+    plain = "\n".join(_MARKUP_RE.sub("", line) for line in plain.split("\n"))
+    plain = re.sub(r"\s+", " ", plain).strip()
+    length = _weighted_len(plain)
+    link_len = sum(_weighted_len(re.sub(r"\s+", " ", t).strip()) for t in link_texts)
+    return {
+        "length": length,
+        "link_density": min(1.0, link_len / length) if length else (1.0 if link_texts else 0.0),
+        "sentences": len(_SENTENCE_END_RE.findall(plain)),
+        "heading": bool(_HEADING_RE.match(block)),
+        "boilerplate": bool(_BOILERPLATE_RE.search(plain)),
+        "lines": block.count("\n") + 1,
+    }
+
+
+def _classify(f: Dict[str, Any]) -> str:
+    """初判：good / bad / near（待定）/ short（短块，依上下文）/ heading / empty。"""
+    if f["length"] == 0:
+        return "empty"
+    if f["heading"]:
+        return "bad" if f["link_density"] > 0.5 or f["boilerplate"] else "heading"
+    if f["link_density"] > 0.5:
+        return "bad"
+    if f["boilerplate"] and f["length"] < 300:
+        return "bad"
+    # 多行且几乎没有句子的块通常是菜单、标签云或表单
+    if f["lines"] >= 3 and f["sentences"] <= 1 and f["length"] / f["lines"] < 40:
+        return "bad"
+    if f["length"] < 50:
+        return "short"
+    if f["link_density"] <= 0.3 and f["sentences"] >= 1 and f["length"] >= 150:
+        return "good"
+    return "near"
+
+
+def _resolve_context(labels: List[str]) -> List[str]:
+    """待定块与短块参考最近的非标题邻居：两侧都是正文的算正文，紧挨正文的待定块算正文。"""
+    resolved = list(labels)
+
+    def neighbour(i: int, step: int) -> str:
+        j = i + step
+        while 0 <= j < len(labels):
+            if labels[j] in ("good", "bad"):
+                return labels[j]
+            j += step
+        return "bad"
+
+    for i, label in enumerate(labels):
+        if label not in ("near", "short"):
+            continue
+        prev, nxt = neighbour(i, -1), neighbour(i, 1)
+        if prev == "good" and nxt == "good":
+            resolved[i] = "good"
+        elif label == "near" and "good" in (prev, nxt):
+            resolved[i] = "good"
+        else:
+            resolved[i] = "bad"
+    return resolved
+
+
+def _best_region(scores: List[int]) -> Tuple[int, int, int]:
+    """和最大的连续区间 [start, end)（Kadane）。"""
+    best, best_start, best_end = 0, 0, 0
+    total, start = 0, 0
+    for i, s in enumerate(scores):
+        if total <= 0:
+            total, start = 0, i
+        total += s
+        if total > best:
+            best, best_start, best_end = total, start, i + 1
+    return best_start, best_end, best
+
+
+def extract_main_content(markdown: str) -> Dict[str, Any]:
+    """
+    从抓取的 markdown 中抽取正文；返回 text（正文 markdown）、confidence（0~1）、
+    pruned（仅删除确定样板块后的 markdown，供 LLM 使用）与 stats（各类块与字符数）。
+    """
+    blocks = _split_blocks(markdown)
+    features = [_block_features(b) for b in blocks]
+    initial = [_classify(f) for f in features]
+    labels = _resolve_context(initial)
+    lengths = [f["length"] for f in features]
+
+    scores = [
+        lengths[i] if label == "good" else -lengths[i] if label == "bad" else 0
+        for i, label in enumerate(labels)
+    ]
+    start, end, _ = _best_region(scores)
+    # 正文前紧挨着的标题与短导语（署名、日期）一并保留
+    lead = set()
+    while start > 0 and (labels[start - 1] in ("heading", "empty") or initial[start - 1] == "short"):
+        start -= 1
+        if initial[start] == "short":
+            lead.add(start)
+
+    body = [
+        blocks[i] for i in range(start, end)
+        if labels[i] == "good" or i in lead
+        or (labels[i] == "heading" and any(l == "good" for l in labels[i + 1:end]))
+    ]
+    good_in = sum(lengths[i] for i in range(start, end) if labels[i] == "good")
+    bad_in = sum(lengths[i] for i in range(start, end) if labels[i] == "bad")
+    good_all = sum(n for n, label in zip(lengths, labels) if label == "good")
+    total = sum(lengths)
+
+    purity = good_in / (good_in + bad_in) if good_in else 0.0
+    concentration = good_in / good_all if good_all else 0.0
+    size = min(1.0, good_in / EXTRACT_MIN_BODY_CHARS) if EXTRACT_MIN_BODY_CHARS > 0 else 1.0
+    good_blocks = sum(1 for i in range(start, end) if labels[i] == "good")
+    confidence = purity * concentration * size * (1.0 if good_blocks >= 3 else 0.6)
+
+    pruned = [b for i, (b, label) in enumerate(zip(blocks, labels)) if label not in ("bad", "empty") or i in lead]
+    return {
+        "text": "\n\n".join(body),
+        "confidence": round(confidence, 3),
+        "pruned": "\n\n".join(pruned),
+        "stats": {
+            "blocks": len(blocks),
+            "body_blocks": len(body),
+            "body_chars": good_in,
+            "total_chars": total,
+            "boilerplate_chars": sum(n for n, label in zip(lengths, labels) if label == "bad"),
+        },
+    }
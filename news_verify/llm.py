@@ -1,24 +1,190 @@
-"""LLM 配置：ModelScope/OpenAI 兼容，供所有 Agent 与流程使用。"""
+"""LLM 配置：ModelScope/OpenAI 兼容，供所有 Agent 与流程使用；各阶段按 routing.py 的路由表选模型。"""
 import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+
+from news_verify.chunking import count_tokens
+from news_verify.llm_cache import llm_cache
+from news_verify.rate_limit import estimate_request_tokens, llm_rate_limiter
+from news_verify.routing import model_for, stage_usage
 
 load_dotenv()
 
 MODELSCOPE_API_KEY = os.getenv("MODELSCOPE_API_KEY")
 MODELSCOPE_BASE_URL = os.getenv("MODELSCOPE_BASE_URL", "https://api-inference.modelscope.cn/v1")
-MODELSCOPE_MODEL = os.getenv("MODELSCOPE_MODEL", "Qwen/Qwen3-30B-A3B-Instruct-2507")
 
 if not MODELSCOPE_API_KEY:
     raise RuntimeError("MODELSCOPE_API_KEY is not set. Please add it to your .env file.")
 
-llm = LLM(
-    model=f"openai/{MODELSCOPE_MODEL}",
-    api_key=MODELSCOPE_API_KEY,
-    base_url=MODELSCOPE_BASE_URL,
-    temperature=0.5,
-)
 
-# 单篇文章传给 LLM 的正文最大字符数，避免超出模型上下文
+class CachedLLM(BaseLLM):
+    """
+    包装 CrewAI 的 LLM：不带工具的调用先查 LLM 响应缓存（llm_cache.py），命中时不发请求；
+    实际请求经进程级限流器（rate_limit.py）发出，与 llm_gateway 共享 RPM/TPM 配额；单次 HTTP 请求的调用 429 时退避重试，
+    会执行工具的调用（available_functions）只限流不重试，由 kickoff_with_retry 在 Crew 层兜底。
+    stage 为路由阶段名（routing.py），只用于按阶段统计。
+    作为完整初始化的 BaseLLM 持有自己的 model / temperature / stop；只有 call/acall 与能力查询转发给被包装的 LLM，
+    每次调用前把 stop（Agent 会追加 ReAct 的停止词）同步给它，因此每个阶段包装独占一个底层 LLM。
+    """
+
+    def __init__(self, inner: BaseLLM, stage: str = "default"):
+        super().__init__(
+            model=inner.model,
+            temperature=getattr(inner, "temperature", None),
+            stop=list(getattr(inner, "stop", None) or []),
+        )
+        self._inner = inner
+        self._stage = stage
+
+    def _sync_inner(self) -> BaseLLM:
+        self._inner.stop = list(self.stop or [])
+        return self._inner
+
+    def _cache_key(self, messages: Union[str, List[Dict[str, Any]]]) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        return llm_cache.make_key(
+            self.model,
+            messages,
+            temperature=self.temperature,
+            max_tokens=getattr(self._inner, "max_tokens", None),
+            stop=self.stop or None,
+        )
+
+    def _rate_limited(self, send: Any, messages: Union[str, List[Dict[str, Any]]]) -> Tuple[Any, int, Any]:
+        """
+        返回 (计时的 send, 预估 token, 实际用量函数)，供限流器使用。
+        CrewAI 的 LLM 不逐次返回 usage，实际用量按 预估提示 token + 输出 token 计，同时计入 stage_usage。
+        """
+        prompt_tokens = estimate_request_tokens(messages, 0)
+        reserved = estimate_request_tokens(messages, getattr(self._inner, "max_tokens", None))
+        started = [0.0]
+
+        def timed() -> Any:
+            started[0] = time.perf_counter()  # 耗时不含限流等待
+            return send()
+
+        def used(result: Any) -> Optional[int]:
+            completion_tokens = count_tokens(result) if isinstance(result, str) else 0
+            stage_usage.record(
+                self._stage, self.model, time.perf_counter() - started[0], prompt_tokens, completion_tokens
+            )
+            return prompt_tokens + completion_tokens if isinstance(result, str) else None
+        return timed, reserved, used
+
+    @staticmethod
+    def _single_request(kwargs: Dict[str, Any]) -> bool:
+        # 带 available_functions 时底层 LLM 会在同一次 call 中执行工具，重试会重复执行；
+        # 否则一次 call 就是一次 HTTP 请求，可以安全重试
+        return not kwargs.get("available_functions")
+
+    def _limited_call(self, messages: Union[str, List[Dict[str, Any]]], tools: Any, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return llm_rate_limiter.call(*self._rate_limited(
+                lambda: self._sync_inner().call(messages, tools, *args, **kwargs), messages
+            ), retry=self._single_request(kwargs))
+        except Exception:
+            stage_usage.record(self._stage, self.model, error=True)
+            raise
+
+    async def _limited_acall(
+        self, messages: Union[str, List[Dict[str, Any]]], tools: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        try:
+            return await llm_rate_limiter.acall(*self._rate_limited(
+                lambda: self._sync_inner().acall(messages, tools, *args, **kwargs), messages
+            ), retry=self._single_request(kwargs))
+        except Exception:
+            stage_usage.record(self._stage, self.model, error=True)
+            raise
+
+    @staticmethod
+    def _cacheable(tools: Optional[List[Any]], kwargs: Dict[str, Any]) -> bool:
+        # 带工具（函数调用会执行工具、可能有副作用）或结构化输出的调用不缓存
+        if not llm_cache.enabled or tools:
+            return False
+        return not kwargs.get("available_functions") and not kwargs.get("response_model")
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, Any]]],
+        tools: Optional[List[Any]] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if not self._cacheable(tools, kwargs):
+            return self._limited_call(messages, tools, *args, **kwargs)
+        key = self._cache_key(messages)
+        hit = llm_cache.get(key)
+        if hit is not None:
+            stage_usage.record(self._stage, self.model, cached=True)
+            return hit["text"]
+        result = self._limited_call(messages, tools, *args, **kwargs)
+        if isinstance(result, str) and result.strip():
+            llm_cache.put(key, self.model, {"text": result})
+        return result
+
+    async def acall(
+        self,
+        messages: Union[str, List[Dict[str, Any]]],
+        tools: Optional[List[Any]] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if not self._cacheable(tools, kwargs):
+            return await self._limited_acall(messages, tools, *args, **kwargs)
+        key = self._cache_key(messages)
+        hit = llm_cache.get(key)
+        if hit is not None:
+            stage_usage.record(self._stage, self.model, cached=True)
+            return hit["text"]
+        result = await self._limited_acall(messages, tools, *args, **kwargs)
+        if isinstance(result, str) and result.strip():
+            llm_cache.put(key, self.model, {"text": result})
+        return result
+
+    def supports_function_calling(self) -> bool:
+        return self._inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self._inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self._inner.get_context_window_size()
+
+    def get_token_usage_summary(self) -> Any:
+        # token 统计由底层 LLM 在实际请求时累计
+        return self._inner.get_token_usage_summary()
+
+
+_stage_llms: Dict[str, CachedLLM] = {}
+_llm_lock = threading.Lock()
+
+
+def _base_llm(model: str) -> BaseLLM:
+    """新建一个底层 CrewAI LLM（每个阶段一个，stop 由阶段包装同步）。"""
+    return LLM(
+        model=f"openai/{model}",
+        api_key=MODELSCOPE_API_KEY,
+        base_url=MODELSCOPE_BASE_URL,
+        temperature=0.5,
+    )
+
+
+def llm_for(stage: str) -> CachedLLM:
+    """阶段对应的 LLM（按路由表选模型，用量按该阶段统计）。"""
+    with _llm_lock:
+        if stage not in _stage_llms:
+            _stage_llms[stage] = CachedLLM(_base_llm(model_for(stage)), stage=stage)
+        return _stage_llms[stage]
+
+
+llm = llm_for("default")
+
+# 旧的按字符截断上限，仅为兼容保留；流程已改用 chunking.py 的 token 预算（MAX_CONTENT_TOKENS_FOR_LLM）
 MAX_CONTENT_CHARS_FOR_LLM = 20000
@@ -0,0 +1,152 @@
+"""
+LLM 响应持久化缓存（SQLite）：相同模型、消息与采样参数的调用直接复用上次结果，不再消耗 token。
+
+- 键为 (模型, messages, temperature, max_tokens, 其余参数) 规范化 JSON 的 SHA-256；
+- 条目超过 LLM_CACHE_TTL 视为过期；总大小超过 LLM_CACHE_MAX_MB 时按最近访问时间淘汰；
+- LLM_CACHE=0 关闭；stats 记录命中/未命中/写入/淘汰与命中节省的 token。
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") not in ("0", "false", "off")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+
+class LLMCache:
+    """线程安全的 LLM 响应缓存；值为 dict（至少含 text），按 JSON 存储。"""
+
+    def __init__(
+        self,
+        path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "llm_cache.sqlite3"),
+        ttl: int = LLM_CACHE_TTL,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        enabled: bool = LLM_CACHE_ENABLED,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts_since_evict = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+            "saved_prompt_tokens": 0, "saved_completion_tokens": 0,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: Any,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **params: Any,
+    ) -> str:
+        """缓存键：模型、消息、temperature、max_tokens 与其余影响输出的参数（如 response_format）。"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "params": {k: v for k, v in params.items() if v is not None},
+        }
+        blob = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """返回缓存的响应 dict；未启用、不存在或已过期时返回 None。"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            row = conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                self.stats["misses"] += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            value = json.loads(row[0])
+            self.stats["hits"] += 1
+            self.stats["saved_prompt_tokens"] += int(value.get("prompt_tokens") or 0)
+            self.stats["saved_completion_tokens"] += int(value.get("completion_tokens") or 0)
+            return value
+
+    def put(self, key: str, model: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, blob, len(blob.encode("utf-8")), now, now),
+            )
+            conn.commit()
+            self.stats["stores"] += 1
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= 20:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """删除过期条目；总大小仍超限时按最近访问时间从旧到新删除。"""
+        self._puts_since_evict = 0
+        conn = self._db()
+        cur = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        self.stats["evictions"] += max(0, cur.rowcount)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        conn.commit()
+
+    def evict(self) -> None:
+        with self._lock:
+            self._evict_locked()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, int]) -> Dict[str, Any]:
+        """相对 snapshot 的命中情况与节省的 token，附命中率。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        lookups = delta["hits"] + delta["misses"]
+        delta["hit_rate"] = round(delta["hits"] / lookups, 3) if lookups else 0.0
+        return delta
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,276 @@
+"""
+进程级 LLM 网关：包内所有直接的 chat completion 调用都经过这里。
+
+- 配置（ModelScope/OpenAI 兼容的 key、base_url、模型）只在导入时读取一次；
+- 一个同步 OpenAI 客户端、每个事件循环一个异步客户端，共享显式配置的 httpx 连接池
+  （keep-alive、HTTP/2（安装了 h2 时）、连接/读/写/取连接超时）；
+- 每次调用记录模型、耗时与 token 用量，stats 汇总调用数、失败数、总耗时与 token，供单次运行做增量统计；
+- 相同请求先查 LLM 响应缓存（llm_cache.py），命中时不发请求，计入 stats["cached"]；
+- 未显式指定模型时按阶段路由（routing.py）选模型，用量同时计入 stage_usage（按阶段 / 按模型）；
+- 实际请求经进程级限流器（rate_limit.py）发出，429 与瞬时错误由限流器退避重试，SDK 自身不再重试。
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+from news_verify.llm_cache import llm_cache
+from news_verify.rate_limit import estimate_request_tokens, llm_rate_limiter
+from news_verify.routing import ROUTES, model_for, stage_usage
+
+load_dotenv()
+
+MODELSCOPE_API_KEY = os.getenv("MODELSCOPE_API_KEY")
+MODELSCOPE_BASE_URL = os.getenv("MODELSCOPE_BASE_URL", "https://api-inference.modelscope.cn/v1")
+MODELSCOPE_MODEL = os.getenv("MODELSCOPE_MODEL", "Qwen/Qwen3-30B-A3B-Instruct-2507")
+
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "1") not in ("0", "false", "off")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+# 长文本清洗输出可达上万 token，读超时要给足
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "300"))
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 需要 h2 包（httpx[http2]），未安装时退回 HTTP/1.1 keep-alive。"""
+    return LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+class LLMGateway:
+    """线程安全的 LLM 调用入口；chat()/achat() 返回 text、model、latency_ms 与 token 用量。"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = MODELSCOPE_API_KEY,
+        base_url: str = MODELSCOPE_BASE_URL,
+        model: str = MODELSCOPE_MODEL,
+        history: int = 500,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self._lock = threading.Lock()
+        self._client: Optional[OpenAI] = None
+        self._async_clients: "weakref.WeakKeyDictionary[Any, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+        self.calls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.stats: Dict[str, float] = {
+            "calls": 0, "cached": 0, "errors": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    # ---------- 客户端 ----------
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_CONNECT_TIMEOUT)
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+
+    @property
+    def client(self) -> OpenAI:
+        """共享的同步客户端（首次使用时创建）。"""
+        with self._lock:
+            if self._client is None:
+                http_client = httpx.Client(http2=_http2_enabled(), limits=self._limits(), timeout=self._timeout())
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=http_client,
+                    timeout=self._timeout(),
+                    max_retries=0,
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """当前事件循环的异步客户端；httpx 异步连接池不能跨事件循环复用，因此按循环各建一个。"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                http_client = httpx.AsyncClient(
+                    http2=_http2_enabled(), limits=self._limits(), timeout=self._timeout()
+                )
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=http_client,
+                    timeout=self._timeout(),
+                    max_retries=0,
+                )
+                self._async_clients[loop] = client
+            return client
+
+    # ---------- 调用 ----------
+    def _record(self, model: str, stage: str, seconds: float, usage: Any, error: Optional[str]) -> Dict[str, Any]:
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+        record = {
+            "model": model,
+            "stage": stage,
+            "latency_ms": round(seconds * 1000),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "error": error,
+            "at": time.time(),
+        }
+        with self._lock:
+            self.calls.append(record)
+            self.stats["calls"] += 1
+            self.stats["errors"] += 1 if error else 0
+            self.stats["seconds"] += seconds
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+        stage_usage.record(stage, model, seconds, prompt_tokens, completion_tokens, error=bool(error))
+        return record
+
+    @staticmethod
+    def _result(resp: Any, record: Dict[str, Any]) -> Dict[str, Any]:
+        choice = resp.choices[0] if getattr(resp, "choices", None) else None
+        text = (choice.message.content or "") if choice is not None else ""
+        return dict(record, text=text, finish_reason=getattr(choice, "finish_reason", None), cached=False)
+
+    @staticmethod
+    def _used_tokens(resp: Any) -> Optional[int]:
+        usage = getattr(resp, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        return int(total) if total else None
+
+    def _model_for(self, model: Optional[str], stage: str) -> str:
+        """显式模型优先；其次是路由表中该阶段的模型；未登记的阶段用网关默认模型。"""
+        return model or (model_for(stage) if stage in ROUTES else self.model)
+
+    def _cache_lookup(self, model: str, stage: str, messages: Any, params: Dict[str, Any]) -> Tuple[str, Any]:
+        """返回 (缓存键, 命中的结果或 None)；缓存关闭时键为空串。"""
+        if not llm_cache.enabled:
+            return "", None
+        key = llm_cache.make_key(model, messages, **params)
+        hit = llm_cache.get(key)
+        if hit is None:
+            return key, None
+        with self._lock:
+            self.stats["cached"] += 1
+        stage_usage.record(stage, model, cached=True)
+        return key, dict(hit, model=model, stage=stage, latency_ms=0, error=None, at=time.time(), cached=True)
+
+    @staticmethod
+    def _cache_store(key: str, model: str, result: Dict[str, Any]) -> None:
+        if key and result["text"].strip():
+            llm_cache.put(key, model, {
+                "text": result["text"],
+                "finish_reason": result["finish_reason"],
+                "prompt_tokens": result["prompt_tokens"],
+                "completion_tokens": result["completion_tokens"],
+            })
+
+    def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        stage: str = "direct",
+        use_cache: bool = True,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        同步 chat completion；model 为空时按 stage 路由，params 原样传给 API（temperature、max_tokens 等）。
+        use_cache 为 True 时先查响应缓存（结果含 cached 标记）。限流器重试耗尽或遇到其它错误时记录后抛出原异常。
+        """
+        model = self._model_for(model, stage)
+        key, hit = self._cache_lookup(model, stage, messages, params) if use_cache else ("", None)
+        if hit is not None:
+            return hit
+        t0 = time.perf_counter()
+
+        def send() -> Any:
+            nonlocal t0
+            t0 = time.perf_counter()  # 耗时不含限流等待
+            return self.client.chat.completions.create(model=model, messages=messages, **params)
+
+        try:
+            resp = llm_rate_limiter.call(
+                send, estimate_request_tokens(messages, params.get("max_tokens")), self._used_tokens
+            )
+        except Exception as e:
+            self._record(model, stage, time.perf_counter() - t0, None, f"{type(e).__name__}: {e}")
+            raise
+        record = self._record(model, stage, time.perf_counter() - t0, getattr(resp, "usage", None), None)
+        result = self._result(resp, record)
+        self._cache_store(key, model, result)
+        return result
+
+    async def achat(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        stage: str = "direct",
+        use_cache: bool = True,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """chat() 的异步版本。"""
+        model = self._model_for(model, stage)
+        key, hit = (
+            await asyncio.to_thread(self._cache_lookup, model, stage, messages, params) if use_cache else ("", None)
+        )
+        if hit is not None:
+            return hit
+        t0 = time.perf_counter()
+
+        async def send() -> Any:
+            nonlocal t0
+            t0 = time.perf_counter()
+            return await self.async_client.chat.completions.create(model=model, messages=messages, **params)
+
+        try:
+            resp = await llm_rate_limiter.acall(
+                send, estimate_request_tokens(messages, params.get("max_tokens")), self._used_tokens
+            )
+        except Exception as e:
+            self._record(model, stage, time.perf_counter() - t0, None, f"{type(e).__name__}: {e}")
+            raise
+        record = self._record(model, stage, time.perf_counter() - t0, getattr(resp, "usage", None), None)
+        result = self._result(resp, record)
+        await asyncio.to_thread(self._cache_store, key, model, result)
+        return result
+
+    # ---------- 统计 ----------
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, float]) -> Dict[str, Any]:
+        """相对 snapshot 的调用数、失败数、平均耗时与 token 用量。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        calls = int(delta["calls"])
+        delta["calls"] = calls
+        delta["cached"] = int(delta["cached"])
+        delta["errors"] = int(delta["errors"])
+        delta["avg_latency_ms"] = round(delta.pop("seconds") / calls * 1000) if calls else 0
+        delta["prompt_tokens"] = int(delta["prompt_tokens"])
+        delta["completion_tokens"] = int(delta["completion_tokens"])
+        return delta
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+llm_gateway = LLMGateway()
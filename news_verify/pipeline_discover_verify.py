@@ -2,17 +2,38 @@
 多智能体流程：发现新闻 → 逐篇验证（计划 + Serper）→ 汇总报告。
 on_event 可选，用于 Web UI 流式展示。
 """
-import os
 import json
-import re
+import time
 import datetime as dt
 from pathlib import Path
-from typing import List, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Optional, Callable, Tuple
 
 from crewai import Crew, Process
 
-from news_verify.llm import llm, MAX_CONTENT_CHARS_FOR_LLM
-from news_verify.utils import safe_slug, kickoff_with_retry, crew_output_string, extract_json_array
+from news_verify.llm import llm
+from news_verify.llm_gateway import llm_gateway
+from news_verify.llm_cache import llm_cache
+from news_verify.rate_limit import llm_rate_limiter
+from news_verify.routing import stage_usage
+from news_verify.chunking import (
+    LLM_CLEAN_CHUNK_TOKENS,
+    LLM_CLEAN_CONCURRENCY,
+    MAX_CONTENT_TOKENS_FOR_LLM,
+    count_tokens,
+    split_by_tokens,
+    truncate_to_tokens,
+)
+from news_verify.extract import extract_main_content, EXTRACT_SKIP_LLM_CONFIDENCE
+from news_verify.bulk_search import bulk_search_executor
+from news_verify.structured import (
+    InterestResult,
+    NewsSelection,
+    StructuredOutputError,
+    ensure_model,
+    structured_output,
+)
+from news_verify.utils import safe_slug, kickoff_with_retry, crew_output_string
 from news_verify.agents_news import (
     interest_extractor_agent,
     news_selector_agent,
@@ -27,43 +48,212 @@ from news_verify.tasks_verify import (
     make_compile_verification_plan_task,
     make_verify_claims_task,
 )
-from news_verify.tools.crawl import portal_crawler_tool, article_crawler_tool
+from news_verify.tools.crawl import (
+    article_crawler_tool,
+    portal_candidates,
+    CrawlPlan,
+    incremental_portal,
+    is_usable_article,
+)
+from news_verify.tools.canonical import collapse_duplicates
+from news_verify.tools.crawl_cache import crawl_cache
+from news_verify.tools.fetch import tiered_fetcher
+from news_verify.tools.domain_health import domain_health
+from news_verify.tools.search import search_backend
+from news_verify.tools.search_cache import search_cache
+from news_verify.tools.evidence_index import evidence_index
+from news_verify.tools.query_dedupe import QueryDeduper
+from news_verify.tools.seen_store import IncrementalRun
+from news_verify.tools.verify import serper_search_tool
+
+
+_CLEAN_SYSTEM_PROMPT = (
+    "You are a news editor. Your task: given raw scraped webpage content, output ONLY the main news article body. "
+    "Remove: ads, 'related news', 'other stories', navigation, footers, cookie banners, sidebars, author bios, comments. "
+    "Output clean markdown (title, paragraphs, no extra sections). No preamble or explanation."
+)
+
+
+def _clean_chunk(chunk: str, part: int, parts: int, title: str, url: str) -> str:
+    """清洗一块原文；失败或输出为空（单块时）时原样返回该块。"""
+    if parts > 1:
+        system = _CLEAN_SYSTEM_PROMPT + (
+            f" The input is part {part} of {parts} of one page, split at paragraph boundaries: "
+            "keep the article text in this part in its original order, do not summarize or repeat the title, "
+            "and output nothing if the part contains no article text."
+        )
+    else:
+        system = _CLEAN_SYSTEM_PROMPT
+    user = f"Title: {title}\nURL: {url}\n\nRaw content:\n{chunk}"
+    try:
+        result = llm_gateway.chat(
+            [{"role": "system", "content": system}, {"role": "user", "content": user}],
+            stage="clean",
+            temperature=0.3,
+            # 清洗输出不长于输入，按输入 token 数留余量
+            max_tokens=count_tokens(chunk) + 512,
+        )
+    except Exception:
+        return chunk.strip()
+    cleaned = result["text"].strip()
+    if cleaned or (parts > 1 and result.get("finish_reason") == "stop"):
+        return cleaned
+    return chunk.strip()
 
 
-def _clean_article_with_llm(raw_content: str, title: str, url: str) -> str:
-    """用 LLM 清洗抓取原文：仅保留正文，去掉广告、导航等。"""
+def _clean_article_with_llm(raw_content: str, title: str, url: str) -> Tuple[str, int]:
+    """
+    用 LLM 清洗抓取原文：仅保留正文，去掉广告、导航等。
+    长文按 token 预算在段落边界分块、并发清洗后按原顺序拼接；返回 (清洗结果, 块数)。
+    """
     raw_content = (raw_content or "").strip()
     if not raw_content:
-        return ""
+        return "", 0
+    if not llm_gateway.available:
+        return raw_content, 0
+
+    chunks = split_by_tokens(raw_content, LLM_CLEAN_CHUNK_TOKENS)
+    if len(chunks) == 1:
+        return _clean_chunk(chunks[0], 1, 1, title, url), 1
+    with ThreadPoolExecutor(max_workers=max(1, min(LLM_CLEAN_CONCURRENCY, len(chunks)))) as executor:
+        cleaned = list(executor.map(
+            lambda pair: _clean_chunk(pair[1], pair[0], len(chunks), title, url),
+            enumerate(chunks, start=1),
+        ))
+    return "\n\n".join(part for part in cleaned if part), len(chunks)
 
-    from openai import OpenAI
 
-    api_key = os.getenv("MODELSCOPE_API_KEY")
-    base_url = os.getenv("MODELSCOPE_BASE_URL", "https://api-inference.modelscope.cn/v1")
-    model = os.getenv("MODELSCOPE_MODEL", "Qwen/Qwen3-30B-A3B-Instruct-2507")
-    if not api_key:
-        return raw_content
+def _article_from_crawl(item: dict, url: str, entry: dict) -> dict:
+    """把筛选条目与抓取结果合成文章：失败时正文为错误说明，LLM 用正文按 token 预算截断。"""
+    content_full = entry.get("markdown", "") or entry.get("content", "") or ""
+    if entry.get("error"):
+        content_full = f"[抓取失败: {entry['error']}]"
+    title = item.get("title", "") or entry.get("title", "") or url
+    content_for_llm, truncated = truncate_to_tokens(content_full, MAX_CONTENT_TOKENS_FOR_LLM)
+    if truncated:
+        content_for_llm += "\n\n[正文已截断]"
+    return {
+        "title": title,
+        "url": url,
+        "content": content_for_llm,
+        "_content_full": content_full,
+    }
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
-    system = (
-        "You are a news editor. Your task: given raw scraped webpage content, output ONLY the main news article body. "
-        "Remove: ads, 'related news', 'other stories', navigation, footers, cookie banners, sidebars, author bios, comments. "
-        "Output clean markdown (title, paragraphs, no extra sections). No preamble or explanation."
+
+def _verify_article(
+    idx: int,
+    article: dict,
+    run_dir: Path,
+    emit: Callable[..., None],
+    query_deduper: Optional[QueryDeduper] = None,
+) -> str:
+    """单篇：清洗正文 → 识别声明并生成核查计划 → 并发执行搜索查询 → 根据证据包验证；返回验证报告路径。"""
+    slug = safe_slug(article.get("title") or f"article_{idx}")
+    emit(f"article_{idx}_clean", "start", f"清洗正文：{article.get('title', '')[:40]}…", None)
+    article_dir = run_dir / f"article_{idx:02d}_{slug}"
+    article_dir.mkdir(parents=True, exist_ok=True)
+
+    extracted_path = article_dir / "extracted_news.md"
+    raw_body = article.get("_content_full", article.get("content", ""))
+    # 先做本地正文抽取：置信度高时直接采用，否则只把去掉样板块后的文本交给 LLM 清洗
+    extraction = extract_main_content(raw_body)
+    if extraction["text"] and extraction["confidence"] >= EXTRACT_SKIP_LLM_CONFIDENCE:
+        emit("log", "info", f"本地抽取正文（置信度 {extraction['confidence']}），跳过 LLM 清洗", None)
+        cleaned_body = extraction["text"]
+        clean_method = "local"
+        llm_chunks = 0
+    else:
+        emit("log", "info", "调用 LLM 清洗正文", None)
+        cleaned_body, llm_chunks = _clean_article_with_llm(
+            extraction["pruned"] or raw_body,
+            article.get("title", ""),
+            article.get("url", ""),
+        )
+        clean_method = "llm"
+    with open(extracted_path, "w", encoding="utf-8") as f:
+        f.write(f"# {article['title']}\n\n")
+        f.write(f"- Source: {article['url']}\n\n---\n\n")
+        f.write(cleaned_body)
+    rel = str(extracted_path).replace("\\", "/")
+    emit(f"article_{idx}_clean", "done", "正文已清洗" if clean_method == "llm" else "正文已本地抽取", {
+        "files": [{"path": rel, "label": "extracted_news.md"}],
+        "method": clean_method,
+        "confidence": extraction["confidence"],
+        "input_chars": len(raw_body or ""),
+        "llm_input_chars": len(extraction["pruned"] or raw_body or "") if clean_method == "llm" else 0,
+        "llm_chunks": llm_chunks,
+    })
+
+    emit("log", "info", "调用 LLM 识别声明与生成核查计划", None)
+    emit(f"article_{idx}_analyze", "start", "识别关键声明并生成核查计划", None)
+    claims_path = article_dir / "identified_claims.json"
+    queries_path = article_dir / "search_queries.json"
+    plan_path = article_dir / "verification_plan.md"
+    report_path = article_dir / "verification_report.md"
+
+    analyze_t1 = make_identify_claims_task()
+    analyze_t1.output_file = str(claims_path)
+    analyze_t2 = make_create_search_queries_task()
+    analyze_t2.output_file = str(queries_path)
+    analyze_t3 = make_compile_verification_plan_task()
+    analyze_t3.output_file = str(plan_path)
+
+    analyze_crew = Crew(
+        agents=[analyze_news_agent],
+        tasks=[analyze_t1, analyze_t2, analyze_t3],
+        process=Process.sequential,
+        verbose=True,
+        llm=llm,
     )
-    user = f"Title: {title}\nURL: {url}\n\nRaw content:\n{raw_content}"
+    kickoff_with_retry(analyze_crew, {
+        "extracted_news_path": str(extracted_path),
+        "identified_claims_path": str(claims_path),
+        "search_queries_path": str(queries_path),
+    })
+    rels = [str(p).replace("\\", "/") for p in (claims_path, queries_path, plan_path)]
+    emit(f"article_{idx}_analyze", "done", "核查计划已生成", {"files": [{"path": rels[0], "label": "identified_claims.json"}, {"path": rels[1], "label": "search_queries.json"}, {"path": rels[2], "label": "verification_plan.md"}]})
+
+    # 一次并发执行计划中的全部查询，核查 Agent 直接读证据包，不再逐轮调用 serper_search
+    emit(f"article_{idx}_search", "start", "并发执行核查计划中的搜索查询", None)
+    bundle_path = article_dir / "evidence_bundle.json"
     try:
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            temperature=0.3,
-            max_tokens=21000,
+        search_stats = bulk_search_executor.run_file(
+            str(queries_path), str(bundle_path), [article.get("url", "")], query_deduper,
+            exclude_titles=[article.get("title", "")],
         )
-        cleaned = (resp.choices[0].message.content or "").strip()
-        if cleaned:
-            return cleaned
-    except Exception:
-        pass
-    return raw_content
+    except (OSError, StructuredOutputError) as e:
+        emit(f"article_{idx}_search", "error", f"搜索查询无法执行，改由核查 Agent 自行搜索：{e}", None)
+        with open(bundle_path, "w", encoding="utf-8") as f:
+            json.dump({"claims": [], "error": str(e)}, f, ensure_ascii=False)
+    else:
+        rel_bundle = str(bundle_path).replace("\\", "/")
+        emit(f"article_{idx}_search", "done", (
+            f"计划 {search_stats['queries']} 个查询，合并与复用后少发 {search_stats['requests_avoided']} 个请求，证据按声明汇总"
+        ), {
+            "files": [{"path": rel_bundle, "label": "evidence_bundle.json"}],
+            **search_stats,
+        })
+
+    verify_task = make_verify_claims_task()
+    verify_task.output_file = str(report_path)
+    verify_crew = Crew(
+        agents=[verify_claims_agent],
+        tasks=[verify_task],
+        process=Process.sequential,
+        verbose=True,
+        llm=llm,
+    )
+    emit("log", "info", "调用 LLM 根据证据包验证声明", None)
+    emit(f"article_{idx}_verify", "start", "根据证据验证声明", None)
+    with serper_search_tool.excluding([article.get("url", "")], [article.get("title", "")]):
+        kickoff_with_retry(verify_crew, {
+            "verification_plan_path": str(plan_path),
+            "evidence_bundle_path": str(bundle_path),
+        })
+    rel_report = str(report_path).replace("\\", "/")
+    emit(f"article_{idx}_verify", "done", "该篇验证完成", {"files": [{"path": rel_report, "label": "verification_report.md"}]})
+
+    return str(report_path)
 
 
 def run_discover_and_verify(
@@ -73,11 +263,28 @@ def run_discover_and_verify(
     max_articles: int = 3,
     reports_dir: str = "reports",
     on_event: Optional[Callable[[str, str, str, Any], None]] = None,
+    incremental: bool = False,
 ) -> str:
     """
     多智能体流程：寻找新闻 → 逐篇验证真假 → 汇总报告。
     on_event(step_id, status, message, detail) 可选，用于 UI 流式展示。
+    incremental=True 时门户爬虫只返回该门户尚未核查过的报道（持续监控用），每篇核查完成后才记为已见。
     """
+    incremental_run = IncrementalRun(portal_url) if incremental else None
+    with incremental_portal(incremental_run):
+        return _discover_and_verify(
+            portal_url, user_interest_desc, max_articles, reports_dir, on_event, incremental_run
+        )
+
+
+def _discover_and_verify(
+    portal_url: str,
+    user_interest_desc: str,
+    max_articles: int,
+    reports_dir: str,
+    on_event: Optional[Callable[[str, str, str, Any], None]],
+    incremental_run: Optional[IncrementalRun],
+) -> str:
     def emit(step_id: str, status: str, message: str, detail: Any = None) -> None:
         if on_event:
             try:
@@ -85,6 +292,21 @@ def run_discover_and_verify(
             except Exception:
                 pass
 
+    run_started = time.perf_counter()
+    cache_snapshot = crawl_cache.snapshot()
+    fetch_snapshot = tiered_fetcher.snapshot()
+    health_snapshot = domain_health.snapshot()
+    llm_snapshot = llm_gateway.snapshot()
+    llm_cache_snapshot = llm_cache.snapshot()
+    rate_limit_snapshot = llm_rate_limiter.snapshot()
+    stage_usage_snapshot = stage_usage.snapshot()
+    structured_snapshot = structured_output.snapshot()
+    search_snapshot = search_backend.snapshot()
+    search_cache_snapshot = search_cache.snapshot()
+    bulk_search_snapshot = bulk_search_executor.snapshot()
+    evidence_snapshot = evidence_index.snapshot()
+    # 本轮所有文章的搜索查询共用一个去重器，近似重复的查询只搜索一次
+    query_deduper = QueryDeduper()
     reports_base = Path(reports_dir)
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = reports_base / f"discover_verify_{ts}"
@@ -102,13 +324,28 @@ def run_discover_and_verify(
         llm=llm,
     )
     interest_result = kickoff_with_retry(interest_crew, {"user_interest_desc": user_interest_desc})
-    interest_json = str(interest_result).strip()
-    json_match = re.search(r'\{[^}]*"interests"[^}]*\}', interest_json)
-    if json_match:
-        interest_json = json_match.group(0)
+    try:
+        interest_json = ensure_model(interest_result, InterestResult, stage="interest").model_dump_json()
+    except StructuredOutputError as e:
+        # 兴趣标签只作筛选参考，校验失败时沿用原始输出
+        emit("log", "info", f"兴趣标签未通过校验，使用原始输出：{e}", None)
+        interest_json = crew_output_string(interest_result)
     emit("interest_extract", "done", "兴趣标签已生成", interest_json)
 
     emit("log", "info", "调用门户爬虫获取候选链接", None)
+    # 流程直接抓取门户，筛选 Agent 不再自己调用爬虫工具，可按 NewsSelection 直接输出结构化结果
+    candidates = portal_candidates(portal_url)
+    if not candidates and "/" in portal_url.rstrip("/").replace("https://", "").replace("http://", ""):
+        from urllib.parse import urlparse
+        parsed = urlparse(portal_url)
+        fallback_url = f"{parsed.scheme or 'https'}://{parsed.netloc}/"
+        if fallback_url != portal_url.rstrip("/") + "/":
+            candidates = portal_candidates(fallback_url)
+    if not candidates and incremental_run is not None:
+        return "增量模式：该门户自上轮运行以来没有新出现的报道。"
+    if not candidates:
+        return "未获取到任何候选新闻（门户抓取返回空）。可尝试换用门户首页 URL，如 https://www.reuters.com/ 或 https://news.yahoo.com/"
+
     emit("news_select", "start", "调用 LLM 筛选相关新闻", None)
     news_select_crew = Crew(
         agents=[news_selector_agent],
@@ -120,147 +357,69 @@ def run_discover_and_verify(
         news_select_crew,
         {
             "portal_url": portal_url,
+            "candidates_json": json.dumps(candidates, ensure_ascii=False),
             "interest_json": interest_json,
             "user_interest_desc": user_interest_desc,
         },
     )
-    selected_news_json = crew_output_string(selected_news_result)
-    selected_news_json = extract_json_array(selected_news_json, fix_unescaped_newlines=True)
+    try:
+        selection = ensure_model(selected_news_result, NewsSelection, stage="select")
+        selected_list = [x.model_dump(exclude_none=True) for x in selection.items]
+    except StructuredOutputError as e:
+        # 筛选结果无法校验时不中止流程，按空结果处理，下面回退到门户候选
+        emit("log", "info", f"筛选结果未通过校验，改用门户候选：{e}", None)
+        selected_list = []
+    selected_news_json = json.dumps(selected_list, ensure_ascii=False)
     emit("news_select", "done", "已筛选候选新闻", {"tool_output": selected_news_json[:8000]})
 
-    try:
-        selected_list = json.loads(selected_news_json)
-    except json.JSONDecodeError:
-        emit("news_select", "error", "筛选结果非 JSON", selected_news_json)
-        return f"新闻筛选结果无法解析为 JSON：\n\n{selected_news_json}"
+    # 同一报道的 URL 变体或标题近似项只保留一条，避免重复抓取、清洗与验证
+    deduped = collapse_duplicates([x for x in selected_list if isinstance(x, dict)])
+    if len(deduped) < len(selected_list):
+        merged = {x["url"]: x["aliases"] for x in deduped if x.get("aliases")}
+        emit("log", "info", f"合并重复候选 {len(selected_list) - len(deduped)} 条", None)
+        emit("dedupe", "info", "重复候选已合并", merged)
+    selected_list = deduped or candidates[: max_articles + 2]
 
-    if not selected_list:
-        raw_portal = portal_crawler_tool._run(portal_url)
-        try:
-            portal_data = json.loads(raw_portal)
-            candidates = portal_data.get("items", [])
-            selected_list = candidates[: max_articles + 2]
-        except Exception:
-            selected_list = []
-        if not selected_list and "/" in portal_url.rstrip("/").replace("https://", "").replace("http://", ""):
-            from urllib.parse import urlparse
-            parsed = urlparse(portal_url)
-            fallback_url = f"{parsed.scheme or 'https'}://{parsed.netloc}/"
-            if fallback_url != portal_url.rstrip("/") + "/":
-                raw_portal = portal_crawler_tool._run(fallback_url)
-                try:
-                    portal_data = json.loads(raw_portal)
-                    candidates = portal_data.get("items", [])
-                    selected_list = candidates[: max_articles + 2]
-                except Exception:
-                    pass
-        if not selected_list:
-            return "未获取到任何候选新闻（门户抓取返回空）。可尝试换用门户首页 URL，如 https://www.reuters.com/ 或 https://news.yahoo.com/"
-
-    selected_list = selected_list[:max_articles]
+    # 只抓排名前 max_articles 的候选；某篇抓取失败、正文为空或遇到付费墙时才补抓下一个
+    items_by_url = {item["url"]: item for item in selected_list if item.get("url")}
+    plan = CrawlPlan(list(items_by_url), budget=max_articles)
     emit("log", "info", "调用文章爬虫抓取正文", None)
-    emit("article_crawl", "start", f"抓取 {len(selected_list)} 篇文章正文", None)
-    raw_crawl = article_crawler_tool._run(selected_news_json)
-    try:
-        crawl_by_url = json.loads(raw_crawl)
-    except json.JSONDecodeError:
-        return f"抓取结果无法解析：\n\n{raw_crawl}"
+    emit("article_crawl", "start", f"抓取 {min(max_articles, len(items_by_url))} 篇文章正文（抓到一篇验证一篇）", None)
 
+    # ---------- 阶段 2：边抓取边逐篇验证 ----------
     articles = []
-    for item in selected_list:
-        url = item.get("url", "")
-        title = item.get("title", "") or ""
-        if not url:
+    verification_report_paths: List[str] = []
+    crawl_started = time.perf_counter()
+    for url, entry in article_crawler_tool.stream_budget(plan):
+        if not is_usable_article(entry):
+            reason = entry.get("error") or "正文为空或疑似付费墙"
+            emit("log", "info", f"抓取结果不可用，改抓下一个候选：{url}（{str(reason)[:80]}）", None)
             continue
-        entry = crawl_by_url.get(url) or {}
-        content_full = entry.get("markdown", "") or entry.get("content", "") or ""
-        if entry.get("error"):
-            content_full = f"[抓取失败: {entry['error']}]"
-        title = title or entry.get("title", "") or url
-        content_for_llm = content_full[:MAX_CONTENT_CHARS_FOR_LLM]
-        if len(content_full) > MAX_CONTENT_CHARS_FOR_LLM:
-            content_for_llm += "\n\n[正文已截断]"
-        articles.append({
-            "title": title,
-            "url": url,
-            "content": content_for_llm,
-            "_content_full": content_full,
-        })
+        article = _article_from_crawl(items_by_url.get(url) or {}, url, entry)
+        articles.append(article)
+        idx = len(articles)
+        emit(f"article_{idx}_crawl", "done", f"已抓取 {idx}/{plan.budget}：{article['title'][:40]}", {"url": url})
+        verification_report_paths.append(_verify_article(idx, article, run_dir, emit, query_deduper))
+        if incremental_run is not None:
+            incremental_run.commit(url)
+        if idx == 1:
+            now = time.perf_counter()
+            emit("metrics", "info", "首篇验证完成", {
+                "time_to_first_verified_s": round(now - run_started, 1),
+                "since_crawl_start_s": round(now - crawl_started, 1),
+            })
+    emit("crawl_budget", "info", "抓取预算统计", plan.report())
 
     if not articles:
         emit("article_crawl", "error", "未抓取到正文", None)
         return "未成功抓取到任何文章正文，请检查门户或网络。"
-    emit("article_crawl", "done", f"已抓取 {len(articles)} 篇", None)
-
-    # ---------- 阶段 2：逐篇验证 ----------
-    verification_report_paths: List[str] = []
-
-    for idx, article in enumerate(articles, start=1):
-        slug = safe_slug(article.get("title") or f"article_{idx}")
-        emit("log", "info", "调用 LLM 清洗正文", None)
-        emit(f"article_{idx}_clean", "start", f"清洗正文：{article.get('title', '')[:40]}…", None)
-        article_dir = run_dir / f"article_{idx:02d}_{slug}"
-        article_dir.mkdir(parents=True, exist_ok=True)
-
-        extracted_path = article_dir / "extracted_news.md"
-        raw_body = article.get("_content_full", article.get("content", ""))
-        cleaned_body = _clean_article_with_llm(
-            raw_body,
-            article.get("title", ""),
-            article.get("url", ""),
-        )
-        with open(extracted_path, "w", encoding="utf-8") as f:
-            f.write(f"# {article['title']}\n\n")
-            f.write(f"- Source: {article['url']}\n\n---\n\n")
-            f.write(cleaned_body)
-        rel = str(extracted_path).replace("\\", "/")
-        emit(f"article_{idx}_clean", "done", "正文已清洗", {"files": [{"path": rel, "label": "extracted_news.md"}]})
-
-        emit("log", "info", "调用 LLM 识别声明与生成核查计划", None)
-        emit(f"article_{idx}_analyze", "start", "识别关键声明并生成核查计划", None)
-        claims_path = article_dir / "identified_claims.json"
-        queries_path = article_dir / "search_queries.json"
-        plan_path = article_dir / "verification_plan.md"
-        report_path = article_dir / "verification_report.md"
-
-        analyze_t1 = make_identify_claims_task()
-        analyze_t1.output_file = str(claims_path)
-        analyze_t2 = make_create_search_queries_task()
-        analyze_t2.output_file = str(queries_path)
-        analyze_t3 = make_compile_verification_plan_task()
-        analyze_t3.output_file = str(plan_path)
-
-        analyze_crew = Crew(
-            agents=[analyze_news_agent],
-            tasks=[analyze_t1, analyze_t2, analyze_t3],
-            process=Process.sequential,
-            verbose=True,
-            llm=llm,
-        )
-        kickoff_with_retry(analyze_crew, {
-            "extracted_news_path": str(extracted_path),
-            "identified_claims_path": str(claims_path),
-            "search_queries_path": str(queries_path),
-        })
-        rels = [str(p).replace("\\", "/") for p in (claims_path, queries_path, plan_path)]
-        emit(f"article_{idx}_analyze", "done", "核查计划已生成", {"files": [{"path": rels[0], "label": "identified_claims.json"}, {"path": rels[1], "label": "search_queries.json"}, {"path": rels[2], "label": "verification_plan.md"}]})
-
-        verify_task = make_verify_claims_task()
-        verify_task.output_file = str(report_path)
-        verify_crew = Crew(
-            agents=[verify_claims_agent],
-            tasks=[verify_task],
-            process=Process.sequential,
-            verbose=True,
-            llm=llm,
-        )
-        emit("log", "info", "调用 Serper API 搜索验证声明", None)
-        emit(f"article_{idx}_verify", "start", "执行搜索验证声明", None)
-        kickoff_with_retry(verify_crew, {"verification_plan_path": str(plan_path)})
-        rel_report = str(report_path).replace("\\", "/")
-        emit(f"article_{idx}_verify", "done", "该篇验证完成", {"files": [{"path": rel_report, "label": "verification_report.md"}]})
-
-        verification_report_paths.append(str(report_path))
+    emit("article_crawl", "done", f"已抓取并验证 {len(articles)} 篇", None)
+    emit("crawl_cache", "info", "抓取缓存统计", crawl_cache.stats_since(cache_snapshot))
+    emit("fetch_tiers", "info", "分级抓取统计（HTTP / 浏览器）", tiered_fetcher.stats_since(fetch_snapshot))
+    emit("domain_health", "info", "站点超时与隔离统计", domain_health.stats_since(health_snapshot))
+    emit("llm_usage", "info", "直接 LLM 调用统计（耗时与 token）", llm_gateway.stats_since(llm_snapshot))
+    emit("llm_cache", "info", "LLM 响应缓存统计", llm_cache.stats_since(llm_cache_snapshot))
+    emit("llm_rate_limit", "info", "LLM 限流统计（请求、429、等待）", llm_rate_limiter.stats_since(rate_limit_snapshot))
 
     # ---------- 阶段 3：汇总报告 ----------
     emit("log", "info", "调用 LLM 汇总报告", None)
@@ -297,6 +456,13 @@ def run_discover_and_verify(
         f"> 各篇验证详情目录：`{run_dir}`\n\n"
     )
     rel_summary = str(summary_path).replace("\\", "/")
+    emit("llm_routing", "info", "按阶段 / 按模型的 LLM 用量", stage_usage.stats_since(stage_usage_snapshot))
+    emit("structured_output", "info", "结构化输出校验统计", structured_output.stats_since(structured_snapshot))
+    emit("search_usage", "info", "搜索后端请求统计（耗时与状态码）", search_backend.stats_since(search_snapshot))
+    emit("search_cache", "info", "搜索缓存统计（节省的调用与延迟）", search_cache.stats_since(search_cache_snapshot))
+    emit("bulk_search", "info", "批量搜索统计（查询数、墙钟耗时与并发加速）", bulk_search_executor.stats_since(bulk_search_snapshot))
+    emit("evidence_index", "info", "本地证据索引统计（大小、查询耗时、本地充足率）", evidence_index.stats_since(evidence_snapshot))
+    emit("query_dedupe", "info", "近似重复查询合并统计（避免的搜索请求）", query_deduper.report())
     emit("summary", "done", "报告已生成", {"files": [{"path": rel_summary, "label": "summary_report.md"}]})
     emit("complete", "done", "流程结束", {"run_dir": str(run_dir), "summary_path": str(summary_path), "files": [{"path": rel_summary, "label": "summary_report.md"}]})
     return header + summary_md
@@ -3,14 +3,21 @@
 """
 import os
 import json
-import re
 import datetime as dt
 from typing import Any
 
 from crewai import Crew
 
-from news_verify.llm import llm, MAX_CONTENT_CHARS_FOR_LLM
-from news_verify.utils import safe_slug, crew_output_string, extract_json_array
+from news_verify.llm import llm
+from news_verify.chunking import MAX_CONTENT_TOKENS_FOR_LLM, truncate_to_tokens
+from news_verify.utils import safe_slug, crew_output_string
+from news_verify.structured import (
+    FactCheckResult,
+    InterestResult,
+    NewsSelection,
+    StructuredOutputError,
+    ensure_model,
+)
 from news_verify.agents_news import (
     interest_extractor_agent,
     news_selector_agent,
@@ -25,7 +32,9 @@ from news_verify.tasks_news import (
     fact_check_task,
     report_task,
 )
-from news_verify.tools.crawl import portal_crawler_tool, article_crawler_tool
+from news_verify.tools.crawl import article_crawler_tool, portal_candidates
+from news_verify.tools.canonical import collapse_duplicates
+from news_verify.tools.verify import serper_search_tool
 
 
 def _ensure_dir(path: str) -> str:
@@ -73,12 +82,15 @@ def run_news_fact_check(
     interest_result = interest_crew.kickoff(
         inputs={"user_interest_desc": user_interest_desc}
     )
-    interest_json = str(interest_result).strip()
-    json_match = re.search(r'\{[^}]*"interests"[^}]*\}', interest_json)
-    if json_match:
-        interest_json = json_match.group(0)
-
-    # 2. 选新闻
+    try:
+        interest_json = ensure_model(interest_result, InterestResult, stage="interest").model_dump_json()
+    except StructuredOutputError:
+        interest_json = crew_output_string(interest_result)
+
+    # 2. 选新闻：流程先抓取门户，候选交给不带工具的筛选 Agent
+    candidates = portal_candidates(portal_url)
+    if not candidates:
+        return "未获取到任何候选新闻（门户抓取或筛选结果为空），请换一个门户 URL 或兴趣再试。"
     news_select_crew = Crew(
         agents=[news_selector_agent],
         tasks=[news_select_task],
@@ -88,30 +100,24 @@ def run_news_fact_check(
     selected_news_result = news_select_crew.kickoff(
         inputs={
             "portal_url": portal_url,
+            "candidates_json": json.dumps(candidates, ensure_ascii=False),
             "interest_json": interest_json,
             "user_interest_desc": user_interest_desc,
         }
     )
-    selected_news_json = crew_output_string(selected_news_result)
-    selected_news_json = extract_json_array(selected_news_json, fix_unescaped_newlines=True)
-
     try:
-        selected_list = json.loads(selected_news_json)
-    except json.JSONDecodeError:
-        return f"新闻筛选结果无法解析为 JSON：\n\n{selected_news_json}"
+        selection = ensure_model(selected_news_result, NewsSelection, stage="select")
+        selected_list = [x.model_dump(exclude_none=True) for x in selection.items]
+    except StructuredOutputError:
+        # 无法校验时按空结果处理，下面回退到门户候选
+        selected_list = []
 
-    if not selected_list:
-        raw_portal = portal_crawler_tool._run(portal_url)
-        try:
-            portal_data = json.loads(raw_portal)
-            candidates = portal_data.get("items", [])
-            selected_list = candidates[:5]
-        except Exception:
-            selected_list = []
-        if not selected_list:
-            return "未获取到任何候选新闻（门户抓取或筛选结果为空），请换一个门户 URL 或兴趣再试。"
+    # 同一报道的 URL 变体或标题近似项只保留一条，避免重复抓取、清洗与验证
+    deduped = collapse_duplicates([x for x in selected_list if isinstance(x, dict)])
+    selected_list = deduped or candidates[:5]
 
     # 3. 抓取正文
+    selected_news_json = json.dumps(selected_list, ensure_ascii=False)
     raw_crawl = article_crawler_tool._run(selected_news_json)
     try:
         crawl_by_url = json.loads(raw_crawl)
@@ -129,8 +135,8 @@ def run_news_fact_check(
         if entry.get("error"):
             content_full = f"[抓取失败: {entry['error']}]"
         title = title or entry.get("title", "") or url
-        content_for_llm = content_full[:MAX_CONTENT_CHARS_FOR_LLM]
-        if len(content_full) > MAX_CONTENT_CHARS_FOR_LLM:
+        content_for_llm, truncated = truncate_to_tokens(content_full, MAX_CONTENT_TOKENS_FOR_LLM)
+        if truncated:
             content_for_llm += "\n\n[正文已截断，仅用于事实核查]"
         articles.append({
             "title": title,
@@ -175,21 +181,21 @@ def run_news_fact_check(
 
     for idx, article in enumerate(saved_articles, start=1):
         article_json = json.dumps(article, ensure_ascii=False)
-        result = fact_check_crew.kickoff(inputs={"article_json": article_json})
-        result_str = str(result).strip()
-
-        json_obj_match = re.search(r'\{.*\}', result_str, re.DOTALL)
-        if json_obj_match:
-            result_str = json_obj_match.group(0)
-
+        # 正在核查的文章已写入本地证据索引，它本身及其它站点的转载副本都不能作为它自己的证据
+        with serper_search_tool.excluding([article.get("url", "")], [article.get("title", "")]):
+            result = fact_check_crew.kickoff(inputs={"article_json": article_json})
         try:
-            parsed = json.loads(result_str)
-        except json.JSONDecodeError:
+            checked = ensure_model(crew_output_string(result), FactCheckResult, stage="fact_check")
+            parsed = checked.model_dump()
+            parsed["title"] = parsed["title"] or article.get("title", "")
+            parsed["url"] = parsed["url"] or article.get("url", "")
+        except StructuredOutputError as e:
             parsed = {
                 "title": article.get("title", ""),
                 "url": article.get("url", ""),
-                "error": "fact_check_output_not_json",
-                "raw": result_str,
+                "error": "fact_check_output_invalid",
+                "detail": str(e),
+                "raw": e.raw,
             }
 
         slug = safe_slug(article.get("title") or f"article_{idx}")
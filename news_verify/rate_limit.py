@@ -0,0 +1,310 @@
+"""
+进程级 LLM 限流器：所有 LLM 请求（llm_gateway 直接调用与 CrewAI 的 CachedLLM）共享一份配额。
+
+- 每分钟请求数（RPM）与每分钟 token 数（TPM）两个令牌桶；请求前按估算 token 预扣，完成后按实际用量多退少补，
+  失败（429、超时等）时全部退回；
+- 并发上限按 AIMD 自适应：连续成功一轮（当前上限次）后加 1，遇到 429 减半，其它失败不计入成功次数；
+- 429 时若响应带 Retry-After（或 retry-after-ms）则全局暂停到该时刻，否则按指数退避加随机抖动；
+  暂停对所有线程与事件循环生效，多个 Web 运行同时进行时不会各自撞限；
+- call() / acall() 包装一次请求：限流等待、429 与瞬时错误（超时、连接错误、5xx）按退避重试；
+  retry=False 时只限流不重试，用于一次调用内会执行工具的场景。
+"""
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from news_verify.chunking import count_tokens
+
+LLM_RPM = float(os.getenv("LLM_RPM", "60"))
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# 没有 Retry-After 时的退避：base × 2^重试次数，上限 max，取 [0, 该值] 内随机（full jitter）
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "2"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60"))
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "5"))
+LLM_TRANSIENT_RETRIES = int(os.getenv("LLM_TRANSIENT_RETRIES", "2"))
+# 未指定 max_tokens 时按该输出长度预扣 TPM
+LLM_DEFAULT_COMPLETION_TOKENS = int(os.getenv("LLM_DEFAULT_COMPLETION_TOKENS", "1024"))
+
+
+def estimate_request_tokens(messages: Any, max_tokens: Optional[int] = None) -> int:
+    """预估一次请求的 token：消息文本的 token 数 + 最大输出。"""
+    if isinstance(messages, str):
+        prompt = count_tokens(messages)
+    else:
+        prompt = sum(count_tokens(str(m.get("content") or "")) + 4 for m in messages or [] if isinstance(m, dict))
+    return prompt + (LLM_DEFAULT_COMPLETION_TOKENS if max_tokens is None else max_tokens)
+
+
+class TokenBucket:
+    """按秒匀速补充的令牌桶；rate_per_minute <= 0 表示不限。调用方负责加锁。"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = max(0.0, rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """取走 amount 还需等待的秒数；单次请求超过桶容量时按容量计，避免永远等不到。"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        """退回（amount 为负时补扣）预扣与实际用量的差额；允许透支，透支部分随时间补回。"""
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + amount)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    return _status_code(exc) == 429 or "RateLimit" in type(exc).__name__ or "429" in str(exc)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    code = _status_code(exc)
+    if code is not None:
+        return code >= 500
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """从异常携带的响应头读取 Retry-After（秒或 HTTP 日期）/ retry-after-ms；没有时返回 None。"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms:
+            return max(0.0, float(ms) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class LLMRateLimiter:
+    """线程安全；同一实例可同时服务多个线程与事件循环。"""
+
+    def __init__(
+        self,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+    ):
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self._in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self.stats: Dict[str, float] = {
+            "requests": 0, "rate_limited": 0, "retries": 0, "waited_seconds": 0.0, "decreases": 0, "increases": 0,
+        }
+
+    # ---------- 许可 ----------
+    def _try_acquire_locked(self, tokens: float) -> float:
+        """能发出请求时占用并发名额、扣减两个桶并返回 0，否则返回建议等待秒数。"""
+        now = time.monotonic()
+        wait = max(0.0, self._paused_until - now)
+        if self._in_flight >= self.limit:
+            wait = max(wait, 0.05)
+        wait = max(wait, self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        self._in_flight += 1
+        self._requests.take(1)
+        self._tokens.take(tokens)
+        self.stats["requests"] += 1
+        return 0.0
+
+    def acquire(self, tokens: float = 0) -> None:
+        """阻塞直到可以发出一次预计消耗 tokens 的请求。"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire_locked(tokens)
+                if wait <= 0:
+                    break
+                # 名额释放时会被唤醒；桶与暂停按计算出的时间等待
+                self._cond.wait(timeout=min(wait, 1.0))
+            self.stats["waited_seconds"] += time.monotonic() - started
+
+    async def aacquire(self, tokens: float = 0) -> None:
+        """acquire() 的异步版本，等待时让出事件循环。"""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                wait = self._try_acquire_locked(tokens)
+                if wait <= 0:
+                    self.stats["waited_seconds"] += time.monotonic() - started
+                    return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(
+        self,
+        reserved_tokens: float = 0,
+        used_tokens: Optional[float] = None,
+        rate_limited: bool = False,
+        ok: bool = True,
+    ) -> None:
+        """
+        归还并发名额；按实际 token 用量校正 TPM 桶，并调整并发上限：429 时减半，
+        只有成功的请求（ok）才计入加 1 所需的连续成功次数，其它失败不影响上限。
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if used_tokens is not None:
+                self._tokens.give_back(reserved_tokens - used_tokens)
+            if rate_limited:
+                # 同一波并发请求先后收到 429 时只减半一次
+                self._successes = 0
+                now = time.monotonic()
+                if self.limit > 1 and now - self._last_decrease >= 1.0:
+                    self.limit = max(1, self.limit // 2)
+                    self._last_decrease = now
+                    self.stats["decreases"] += 1
+            elif ok:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+                    self.stats["increases"] += 1
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """
+        计算第 attempt 次重试前的等待秒数（Retry-After 优先，否则指数退避加抖动）。
+        若为 429，同时把全局暂停延后到该时刻，让其它线程的请求也一起等待。
+        """
+        retry_after = retry_after_seconds(exc) if exc is not None else None
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, 1)
+        else:
+            delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+        with self._cond:
+            self.stats["retries"] += 1
+            if exc is not None and is_rate_limit_error(exc):
+                self.stats["rate_limited"] += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    # ---------- 包装调用 ----------
+    def _should_retry(self, exc: BaseException, attempt: int) -> bool:
+        if is_rate_limit_error(exc):
+            return attempt < LLM_RATE_LIMIT_RETRIES
+        return is_transient_error(exc) and attempt < LLM_TRANSIENT_RETRIES
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        tokens: float = 0,
+        used_tokens: Optional[Callable[[Any], Optional[float]]] = None,
+        retry: bool = True,
+    ) -> Any:
+        """
+        在限流下执行 fn()：tokens 为预计 token 数（提示 + 最大输出），used_tokens(结果) 返回实际用量（可为 None）。
+        429 与瞬时错误按退避重试，其余异常直接抛出；fn 不只是一次 HTTP 请求（如会执行工具）时传 retry=False，
+        只做限流、失败直接抛出，避免重试时重复执行工具。
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                limited = is_rate_limit_error(e)
+                # 失败的请求（429 等）不计 token 用量，退回全部预扣，避免重试风暴中反复预扣耗尽 TPM 桶
+                self.release(tokens, 0, rate_limited=limited, ok=False)
+                if not retry or not self._should_retry(e, attempt):
+                    raise
+                delay = self.backoff(attempt, e)
+                if not limited:
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            self.release(tokens, used_tokens(result) if used_tokens else None)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        tokens: float = 0,
+        used_tokens: Optional[Callable[[Any], Optional[float]]] = None,
+        retry: bool = True,
+    ) -> Any:
+        """call() 的异步版本；fn 每次调用返回一个新的 awaitable。"""
+        attempt = 0
+        while True:
+            await self.aacquire(tokens)
+            try:
+                result = await fn()
+            except Exception as e:
+                limited = is_rate_limit_error(e)
+                # 失败的请求（429 等）不计 token 用量，退回全部预扣，避免重试风暴中反复预扣耗尽 TPM 桶
+                self.release(tokens, 0, rate_limited=limited, ok=False)
+                if not retry or not self._should_retry(e, attempt):
+                    raise
+                delay = self.backoff(attempt, e)
+                if not limited:
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.release(tokens, used_tokens(result) if used_tokens else None)
+            return result
+
+    # ---------- 统计 ----------
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, float]) -> Dict[str, Any]:
+        """相对 snapshot 的请求数、429 次数、重试次数与累计等待秒数，附当前并发上限。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        for k in ("requests", "rate_limited", "retries", "decreases", "increases"):
+            delta[k] = int(delta[k])
+        delta["waited_seconds"] = round(delta["waited_seconds"], 1)
+        with self._lock:
+            delta["concurrency_limit"] = self.limit
+        return delta
+
+
+llm_rate_limiter = LLMRateLimiter()
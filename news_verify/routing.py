@@ -0,0 +1,137 @@
+"""
+按阶段选择模型：轻量阶段（兴趣提取、正文清洗）可走更小更快的模型，重推理阶段（声明分析、核查）走大模型。
+
+- 默认表：LIGHT_STAGES 用 LLM_LIGHT_MODEL（未设置时与 default 相同），其余阶段用 default（MODELSCOPE_MODEL）；
+- LLM_ROUTES_FILE 指向 JSON 文件（{"阶段": "模型", ...}，可含 "default"）覆盖默认表；
+- LLM_ROUTES 环境变量（"interest=模型A,verify=模型B"）优先级最高；
+- stage_usage 按阶段、按模型汇总调用数、耗时与 token，供每轮运行调优路由。
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MODELSCOPE_MODEL = os.getenv("MODELSCOPE_MODEL", "Qwen/Qwen3-30B-A3B-Instruct-2507")
+LLM_LIGHT_MODEL = os.getenv("LLM_LIGHT_MODEL", "")
+LLM_ROUTES_FILE = os.getenv("LLM_ROUTES_FILE", "")
+LLM_ROUTES = os.getenv("LLM_ROUTES", "")
+
+# 流程中的阶段名；CrewAI Agent 与直接调用（llm_gateway 的 stage 参数）共用
+STAGES = ("interest", "select", "collect", "clean", "analyze", "verify", "fact_check", "report")
+LIGHT_STAGES = ("interest", "clean")
+
+
+def _parse_routes(spec: str) -> Dict[str, str]:
+    routes: Dict[str, str] = {}
+    for part in spec.split(","):
+        stage, sep, model = part.partition("=")
+        if sep and stage.strip() and model.strip():
+            routes[stage.strip()] = model.strip()
+    return routes
+
+
+def _load_routes_file(path: str) -> Dict[str, str]:
+    if not path:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): str(v) for k, v in data.items() if isinstance(v, str) and v.strip()}
+
+
+def build_routes(
+    default_model: str = MODELSCOPE_MODEL,
+    light_model: str = LLM_LIGHT_MODEL,
+    routes_file: str = LLM_ROUTES_FILE,
+    routes_spec: str = LLM_ROUTES,
+) -> Dict[str, str]:
+    """阶段 → 模型表（含 "default"）：默认表 < 路由文件 < LLM_ROUTES；light_model 为空时轻量阶段也用 default。"""
+    overrides = _load_routes_file(routes_file)
+    overrides.update(_parse_routes(routes_spec))
+    default_model = overrides.pop("default", default_model)
+    light_model = light_model or default_model
+    routes = {"default": default_model}
+    routes.update({stage: light_model if stage in LIGHT_STAGES else default_model for stage in STAGES})
+    routes.update(overrides)
+    return routes
+
+
+ROUTES = build_routes()
+
+
+def model_for(stage: Optional[str]) -> str:
+    """阶段对应的模型名（不带 provider 前缀）；未知阶段用 default。"""
+    return ROUTES.get(stage or "default") or ROUTES["default"]
+
+
+class StageUsage:
+    """线程安全的按阶段 / 按模型用量统计。"""
+
+    _FIELDS = ("calls", "cached", "errors", "seconds", "prompt_tokens", "completion_tokens")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_stage: Dict[str, Dict[str, float]] = {}
+        self.by_model: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        seconds: float = 0.0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached: bool = False,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            for table, key in ((self.by_stage, stage or "default"), (self.by_model, model)):
+                row = table.setdefault(key, {f: 0 for f in self._FIELDS})
+                row["calls"] += 1
+                row["cached"] += 1 if cached else 0
+                row["errors"] += 1 if error else 0
+                row["seconds"] += seconds
+                row["prompt_tokens"] += prompt_tokens
+                row["completion_tokens"] += completion_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            return {
+                "by_stage": {k: dict(v) for k, v in self.by_stage.items()},
+                "by_model": {k: dict(v) for k, v in self.by_model.items()},
+            }
+
+    def stats_since(self, snapshot: Dict[str, Dict[str, Dict[str, float]]]) -> Dict[str, Any]:
+        """相对 snapshot 各阶段、各模型的调用数、平均耗时（不含缓存命中）与 token，附当前路由表。"""
+        now = self.snapshot()
+        out: Dict[str, Any] = {"routes": dict(ROUTES)}
+        for table in ("by_stage", "by_model"):
+            rows: Dict[str, Dict[str, Any]] = {}
+            for key, row in now[table].items():
+                before = snapshot.get(table, {}).get(key, {})
+                delta = {f: row[f] - before.get(f, 0) for f in self._FIELDS}
+                if not delta["calls"]:
+                    continue
+                requests = delta["calls"] - delta["cached"]
+                rows[key] = {
+                    "calls": int(delta["calls"]),
+                    "cached": int(delta["cached"]),
+                    "errors": int(delta["errors"]),
+                    "avg_latency_ms": round(delta["seconds"] / requests * 1000) if requests else 0,
+                    "total_seconds": round(delta["seconds"], 1),
+                    "prompt_tokens": int(delta["prompt_tokens"]),
+                    "completion_tokens": int(delta["completion_tokens"]),
+                }
+            out[table] = rows
+        return out
+
+
+stage_usage = StageUsage()
@@ -0,0 +1,339 @@
+"""
+结构化输出：兴趣提取、新闻筛选、声明识别、搜索查询与事实核查的结果用 Pydantic 模型校验，替代正则提取 JSON。
+
+- 任务提示里附上模型的 JSON Schema（schema_prompt），Agent 的首个回答即按 schema 输出；
+- 不带工具的阶段（兴趣提取、新闻筛选）在 Task 上设 output_pydantic，CrewAI 按模型请求结构化输出，
+  ensure_model 直接采用 CrewOutput.pydantic，不再解析文本；带工具的 ReAct 阶段仍解析文本并按需修复；
+- parse_model 去掉代码块围栏后用 json.JSONDecoder.raw_decode 从第一个 { / [ 解析，不再贪婪匹配 \\[.*\\]；
+- 校验失败时 ensure_model 只把上次输出与校验错误交给 LLM（经 llm_gateway，请求 json_schema 响应格式，
+  服务端不支持时退回 json_object），不重跑整个 Crew；重试 STRUCTURED_MAX_REPAIRS 次后抛 StructuredOutputError。
+"""
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+
+from news_verify.llm_gateway import llm_gateway
+
+STRUCTURED_MAX_REPAIRS = int(os.getenv("STRUCTURED_MAX_REPAIRS", "2"))
+
+M = TypeVar("M", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+class StructuredOutputError(ValueError):
+    """输出无法解析或校验，修复重试也失败。raw 为最后一次输出。"""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+# ---------- 模型 ----------
+class InterestResult(BaseModel):
+    interests: List[str] = Field(min_length=1)
+
+    @field_validator("interests")
+    @classmethod
+    def _strip_tags(cls, value: List[str]) -> List[str]:
+        tags = [t.strip() for t in value if t and t.strip()]
+        if not tags:
+            raise ValueError("interests must contain at least one non-empty tag")
+        return tags
+
+
+class SelectedNews(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: str = ""
+    url: str = Field(min_length=1)
+    published: Optional[str] = None
+
+    @field_validator("title")
+    @classmethod
+    def _collapse_whitespace(cls, value: str) -> str:
+        # LLM 偶尔在标题里输出真实换行
+        return " ".join(value.split())
+
+
+class NewsSelection(BaseModel):
+    """筛选结果；Agent 直接输出数组时由 parse_model 包装成 {"items": [...]}。空数组合法，由流程回退到门户候选。"""
+
+    items: List[SelectedNews] = Field(default_factory=list)
+
+
+class Claim(BaseModel):
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    statement: str = Field(
+        min_length=1, validation_alias=AliasChoices("statement", "claim", "exact_statement", "text")
+    )
+    reason: str = Field(
+        "", validation_alias=AliasChoices("reason", "why_it_needs_verification", "why_verify", "rationale")
+    )
+    priority: Literal["High", "Medium", "Low"] = Field("Medium", validation_alias=AliasChoices("priority", "priority_level"))
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, value: Any) -> Any:
+        return value.strip().capitalize() if isinstance(value, str) else value
+
+
+class IdentifiedClaims(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    news_summary: str = ""
+    critical_claims: List[Claim] = Field(min_length=1)
+
+
+_QUERY_KEYS = ("query", "query_string", "exact_query", "search_query", "q")
+
+
+class PlannedQuery(BaseModel):
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    query: str = Field(min_length=1, validation_alias=AliasChoices(*_QUERY_KEYS))
+    purpose: str = Field(
+        "", validation_alias=AliasChoices("purpose", "what_it_aims_to_find", "aim", "goal", "intent")
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_string(cls, value: Any) -> Any:
+        return {"query": value} if isinstance(value, str) else value
+
+    @field_validator("query")
+    @classmethod
+    def _collapse_whitespace(cls, value: str) -> str:
+        return " ".join(value.split())
+
+
+class ClaimQueries(BaseModel):
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    claim_id: Optional[Union[int, str]] = Field(None, validation_alias=AliasChoices("claim_id", "id", "claim_index"))
+    claim: str = Field("", validation_alias=AliasChoices("claim", "statement", "claim_statement", "claim_text"))
+    queries: List[PlannedQuery] = Field(min_length=1, validation_alias=AliasChoices("queries", "search_queries"))
+
+
+class SearchQueryPlan(BaseModel):
+    """
+    每条声明的搜索查询。Agent 也常输出扁平数组（每项一个查询并带 claim 字段），
+    校验前按 claim_id / claim 归并成每条声明一项。
+    """
+
+    search_queries: List[ClaimQueries] = Field(min_length=1)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _group_flat_queries(cls, value: Any) -> Any:
+        items = value.get("search_queries") if isinstance(value, dict) else None
+        if not isinstance(items, list):
+            return value
+        grouped: Dict[str, Dict[str, Any]] = {}
+        out: List[Any] = []
+        for item in items:
+            if not isinstance(item, dict) or "queries" in item or "search_queries" in item:
+                out.append(item)
+                continue
+            query = next((item[k] for k in _QUERY_KEYS if item.get(k)), None)
+            if query is None:
+                out.append(item)
+                continue
+            claim = item.get("claim") or item.get("statement") or ""
+            claim_id = item.get("claim_id", item.get("id"))
+            key = f"{claim_id}|{claim}"
+            if key not in grouped:
+                grouped[key] = {"claim_id": claim_id, "claim": claim, "queries": []}
+                out.append(grouped[key])
+            grouped[key]["queries"].append({**item, "query": query})
+        return {**value, "search_queries": out}
+
+    def all_queries(self) -> List[Tuple[int, PlannedQuery]]:
+        """(声明下标, 查询) 列表，按计划顺序。"""
+        return [(i, q) for i, entry in enumerate(self.search_queries) for q in entry.queries]
+
+
+class Evidence(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    source: str = ""
+    url: str = ""
+    note: str = ""
+
+
+class FactCheck(BaseModel):
+    claim: str = Field(min_length=1)
+    verdict: Literal["TRUE", "PARTIALLY_TRUE", "FALSE", "UNCERTAIN"]
+    evidence: List[Evidence] = Field(default_factory=list)
+
+    @field_validator("verdict", mode="before")
+    @classmethod
+    def _normalize_verdict(cls, value: Any) -> Any:
+        return re.sub(r"[\s-]+", "_", value.strip().upper()) if isinstance(value, str) else value
+
+
+class FactCheckResult(BaseModel):
+    title: str = ""
+    url: str = ""
+    checks: List[FactCheck] = Field(min_length=1)
+
+
+# ---------- 解析与校验 ----------
+def schema_prompt(model: Type[BaseModel]) -> str:
+    """附在任务 expected_output 中的 JSON Schema（紧凑单行）；CrewAI 只替换 {变量名}，schema 中的大括号无需转义。"""
+    return json.dumps(model.model_json_schema(), ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_json(text: str) -> Any:
+    """取代码块内或第一个 { / [ 起的 JSON 值；后面跟着的说明文字忽略。"""
+    text = (text or "").strip()
+    fence = _FENCE_RE.search(text)
+    if fence:
+        text = fence.group(1).strip()
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("no JSON object or array found in output")
+    # strict=False 接受字符串值内的真实换行（LLM 常在标题里输出换行）
+    value, _ = json.JSONDecoder(strict=False).raw_decode(text, min(starts))
+    return value
+
+
+def _single_list_field(model: Type[BaseModel]) -> Optional[str]:
+    fields = list(model.model_fields.items())
+    if len(fields) == 1 and getattr(fields[0][1].annotation, "__origin__", None) in (list, List):
+        return fields[0][0]
+    return None
+
+
+def parse_model(text: str, model: Type[M]) -> Tuple[Optional[M], str]:
+    """解析并校验，返回 (模型实例, "") 或 (None, 错误说明)。"""
+    try:
+        data = _decode_json(text)
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+    list_field = _single_list_field(model)
+    if list_field and isinstance(data, list):
+        data = {list_field: data}
+    try:
+        return model.model_validate(data), ""
+    except ValidationError as e:
+        return None, str(e)
+
+
+class StructuredOutput:
+    """带修复重试的结构化解析；stats 记录首次通过、修复成功与最终失败次数。"""
+
+    def __init__(self, max_repairs: int = STRUCTURED_MAX_REPAIRS):
+        self.max_repairs = max_repairs
+        self._lock = threading.Lock()
+        self._json_schema_supported = True
+        self.stats: Dict[str, int] = {"native": 0, "parsed": 0, "repaired": 0, "repair_calls": 0, "failed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _response_format(self, model: Type[BaseModel]) -> Dict[str, Any]:
+        if self._json_schema_supported:
+            return {
+                "type": "json_schema",
+                "json_schema": {"name": model.__name__, "schema": model.model_json_schema()},
+            }
+        return {"type": "json_object"}
+
+    def _repair(self, raw: str, error: str, model: Type[BaseModel], stage: str) -> str:
+        """只发送上次输出与校验错误，请求按 schema 输出修正后的 JSON。"""
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "You fix JSON so that it validates against a JSON Schema. Keep the original content; only "
+                    "fix structure, field names and values named in the error. Output ONLY the JSON object.\n"
+                    f"Schema: {json.dumps(model.model_json_schema(), ensure_ascii=False)}"
+                ),
+            },
+            {"role": "user", "content": f"Validation error:\n{error}\n\nPrevious output:\n{raw}"},
+        ]
+        self._count("repair_calls")
+        try:
+            result = llm_gateway.chat(
+                messages, stage=stage, temperature=0, response_format=self._response_format(model)
+            )
+        except Exception as e:
+            if not self._json_schema_supported or getattr(e, "status_code", None) != 400:
+                raise
+            # 服务端不支持 json_schema 时退回 JSON mode，本进程后续都用 JSON mode
+            with self._lock:
+                self._json_schema_supported = False
+            result = llm_gateway.chat(
+                messages, stage=stage, temperature=0, response_format=self._response_format(model)
+            )
+        return result["text"]
+
+    def ensure(self, text: str, model: Type[M], stage: str = "default") -> M:
+        """
+        把 Agent 输出解析为 model；失败时最多修复 max_repairs 次（每次一个轻量 LLM 请求）。
+        LLM 不可用或修复仍失败时抛 StructuredOutputError。
+        """
+        obj, error = parse_model(text, model)
+        if obj is not None:
+            self._count("parsed")
+            return obj
+        raw = text
+        for _ in range(self.max_repairs if llm_gateway.available else 0):
+            try:
+                raw = self._repair(raw, error, model, stage)
+            except Exception as e:
+                error = f"{error}\n(repair request failed: {type(e).__name__}: {e})"
+                break
+            obj, error = parse_model(raw, model)
+            if obj is not None:
+                self._count("repaired")
+                return obj
+        self._count("failed")
+        raise StructuredOutputError(f"{model.__name__} validation failed: {error}", raw=raw)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, int]) -> Dict[str, int]:
+        now = self.snapshot()
+        return {k: now[k] - snapshot.get(k, 0) for k in now}
+
+
+structured_output = StructuredOutput()
+
+
+def ensure_model(text: Union[str, Any], model: Type[M], stage: str = "default") -> M:
+    """
+    structured_output.ensure 的便捷入口；text 可以是 CrewOutput 等对象：任务设了 output_pydantic 且结果已是
+    model 实例时直接返回（计入 stats["native"]），否则取其原始文本解析。
+    """
+    if isinstance(text, str):
+        return structured_output.ensure(text, model, stage)
+    native = getattr(text, "pydantic", None)
+    if isinstance(native, model):
+        structured_output._count("native")
+        return native
+    raw = getattr(text, "raw", None)
+    return structured_output.ensure(raw if isinstance(raw, str) else str(text), model, stage)
+
+
+def normalizing_guardrail(model: Type[BaseModel], stage: str) -> Any:
+    """
+    CrewAI Task 的 guardrail：输出校验（必要时修复）后替换为规范 JSON，后续任务与 output_file 读到的即是规范结果。
+    仍失败时原样放行而不是让 Crew 重跑该任务，由调用方决定如何处理。
+    """
+    def guardrail(task_output: Any) -> Tuple[bool, Any]:
+        raw = getattr(task_output, "raw", None) or str(task_output)
+        try:
+            return True, ensure_model(raw, model, stage).model_dump_json(indent=2)
+        except StructuredOutputError:
+            return True, raw
+    return guardrail
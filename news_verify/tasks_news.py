@@ -8,8 +8,9 @@ from news_verify.agents_news import (
     fact_checker_agent,
     report_writer_agent,
 )
-from news_verify.tools.crawl import portal_crawler_tool, article_crawler_tool
+from news_verify.tools.crawl import article_crawler_tool
 from news_verify.agents_news import serper_tool
+from news_verify.structured import FactCheckResult, InterestResult, NewsSelection, schema_prompt
 
 interest_task = Task(
     description="""
@@ -23,30 +24,41 @@ interest_task = Task(
         2. 提取 3-10 个兴趣标签（领域、主题、人物、公司、国家/地区等）
         3. 输出唯一一个 JSON：{{"interests": ["标签1", "标签2", ...]}}
     """,
-    expected_output="仅一个 JSON 字符串 {\"interests\": [...]}，标签必须来自用户兴趣描述。",
+    expected_output=(
+        "仅一个 JSON 字符串 {\"interests\": [...]}，标签必须来自用户兴趣描述。"
+        f"JSON Schema：{schema_prompt(InterestResult)}"
+    ),
     agent=interest_extractor_agent,
+    # 不带工具的阶段：CrewAI 按模型请求结构化输出，pydantic 结果直接交给 ensure_model
+    output_pydantic=InterestResult,
 )
 
 news_select_task = Task(
     description="""
         你会得到：
         1. 门户网站主页 URL: {portal_url}
-        2. 用户兴趣标签（仅供参考）: {interest_json}
-        3. **用户亲口描述的兴趣**：{user_interest_desc}
+        2. 从该门户抓取到的候选新闻列表（每条有 title、url，来自 RSS/sitemap 的还有 published 发布时间）：
+           {candidates_json}
+        3. 用户兴趣标签（仅供参考）: {interest_json}
+        4. **用户亲口描述的兴趣**：{user_interest_desc}
 
         步骤：
-        1. 使用 Portal Crawler 工具抓取该门户主页，获得候选新闻列表（每条有 title、url）。
-        2. **用你的理解能力筛选，不要用关键词匹配**：
+        1. **用你的理解能力筛选，不要用关键词匹配**：
            - 阅读每条新闻的标题，理解其主题、涉及的人物/事件/领域；
            - 结合用户描述的兴趣（例如「俄乌」= 俄罗斯与乌克兰局势、战争、外交等），选出语义上最相关的 3-10 条；
            - 不要求标题里出现用户说的字眼，只要主题相关即可（如用户关心俄乌，选国际冲突、北约、东欧局势等也可）。
-        3. **禁止返回空数组**：若没有明显相关报道，也从候选中按「与用户兴趣最接近」选出至少 3 条。
+        2. 相关程度相近时，优先选择 published 较新的报道（没有 published 的不必排除）。
+        3. **禁止返回空列表**：若没有明显相关报道，也从候选中按「与用户兴趣最接近」选出至少 3 条。
+        4. 只能从上面的候选列表中选择，title、url 保持原样。
 
-        输出：仅一个 JSON 数组，每项含 title、url，不要加解释。
+        输出：仅一个 JSON 对象 {{"items": [...]}}，每项含 title、url（候选有 published 时一并保留），不要加解释。
     """,
-    expected_output="一个非空的 JSON 数组字符串，形如 [{\"title\": \"...\", \"url\": \"...\"}, ...]，至少 1 条。",
+    expected_output=(
+        "一个 JSON 对象字符串 {\"items\": [{\"title\": \"...\", \"url\": \"...\"}, ...]}，items 至少 1 条。"
+        f"JSON Schema：{schema_prompt(NewsSelection)}"
+    ),
     agent=news_selector_agent,
-    tools=[portal_crawler_tool],
+    output_pydantic=NewsSelection,
 )
 
 article_collect_task = Task(
@@ -103,7 +115,10 @@ fact_check_task = Task(
             ]
           }}
     """,
-    expected_output="一个 JSON 对象字符串，包含 title/url 和 checks 数组。",
+    expected_output=(
+        "一个 JSON 对象字符串，包含 title/url 和 checks 数组。"
+        f"JSON Schema：{schema_prompt(FactCheckResult)}"
+    ),
     agent=fact_checker_agent,
     tools=[serper_tool],
 )
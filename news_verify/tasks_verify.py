@@ -2,6 +2,7 @@
 from crewai import Task
 
 from news_verify.agents_verify import analyze_news_agent, verify_claims_agent
+from news_verify.structured import IdentifiedClaims, SearchQueryPlan, normalizing_guardrail, schema_prompt
 
 
 def make_identify_claims_task():
@@ -16,12 +17,16 @@ def make_identify_claims_task():
     4. Prioritize claims based on: importance to the overall story, verifiability, potential impact if false
     5. Select the top 5-8 most critical claims for verification
 
-    For each claim, provide: Exact statement, Why it needs verification, Priority level (High/Medium/Low)
+    For each claim, provide: statement (exact statement), reason (why it needs verification), priority (High/Medium/Low)
 
     IMPORTANT: Your final answer MUST be ONLY the JSON object. Do NOT include any thoughts, explanations, or additional text.
     """,
-        expected_output="Output ONLY a JSON object with news_summary and critical_claims array. Save to the specified file.",
+        expected_output=(
+            "Output ONLY a JSON object with news_summary and critical_claims array. Save to the specified file. "
+            f"JSON Schema: {schema_prompt(IdentifiedClaims)}"
+        ),
         agent=analyze_news_agent,
+        guardrail=normalizing_guardrail(IdentifiedClaims, stage="analyze"),
     )
 
 
@@ -34,12 +39,17 @@ def make_create_search_queries_task():
     1. Use the File Reader tool to read the claims from the file path: {identified_claims_path}
     2. For each claim, design 2-3 specific search queries that can find official sources, independent news, expert opinions, or contradictory evidence.
 
-    For each search query provide: Exact query string, What the query aims to find, Expected result type.
+    Group the queries by claim: one entry per claim with claim_id, claim and its queries.
+    For each search query provide: query (exact query string), purpose (what the query aims to find), expected result type.
 
     IMPORTANT: Your final answer MUST be ONLY the JSON object. Do NOT include any thoughts, explanations, or additional text.
     """,
-        expected_output="Output ONLY a JSON object with search_queries array. Save to the specified file.",
+        expected_output=(
+            "Output ONLY a JSON object with search_queries array. Save to the specified file. "
+            f"JSON Schema: {schema_prompt(SearchQueryPlan)}"
+        ),
         agent=analyze_news_agent,
+        guardrail=normalizing_guardrail(SearchQueryPlan, stage="analyze"),
     )
 
 
@@ -65,12 +75,14 @@ def make_compile_verification_plan_task():
 def make_verify_claims_task():
     return Task(
         description="""
-    Read the verification plan from {verification_plan_path} and execute web searches using Serper API to verify the claims.
+    Read the verification plan from {verification_plan_path} and the evidence bundle from {evidence_bundle_path} to verify the claims.
 
     Your task:
     1. Use the File Reader tool to read the verification_plan.md file from {verification_plan_path}
-    2. Extract the JSON verification plan from the file content
-    3. For each critical claim, execute the search queries using the serper_search tool
+    2. Use the File Reader tool to read the evidence bundle from {evidence_bundle_path}: every planned search query
+       has already been executed, and the results are grouped per claim (evidence, with the queries that found each result)
+    3. Evaluate each claim from its bundled evidence; use the serper_search tool only for a claim whose evidence
+       is missing, failed or clearly insufficient, and do not repeat queries already in the bundle
     4. Analyze the search results and evaluate the evidence to determine if each claim is:
        CONFIRMED, CONTRADICTED, AMBIGUOUS, or UNVERIFIED
     5. Document your findings with specific sources and evidence
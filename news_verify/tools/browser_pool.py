@@ -0,0 +1,206 @@
+"""
+进程级共享浏览器池（Crawl4AI）。
+
+- 独立的事件循环线程常驻，工具的同步 _run 通过 run() 把协程提交过去执行；
+- 固定数量的槽位，每个槽位持有一个预热的 AsyncWebCrawler，按需启动、复用；
+- 每个浏览器安装资源拦截钩子，按 run config 的配置档（tools/crawl_profiles.py）屏蔽图片、字体、广告等请求；
+- 单个浏览器抓满 CRAWLER_MAX_PAGES 页或 arun 抛异常（浏览器崩溃等）后回收重建；
+- 进程退出时（atexit）统一关闭所有浏览器。
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from crawl4ai import AsyncWebCrawler
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+
+from news_verify.tools.crawl_profiles import install_resource_blocking
+
+# 池中常驻浏览器数量；单个浏览器抓取多少页后回收重建
+CRAWLER_POOL_SIZE = int(os.getenv("CRAWLER_POOL_SIZE", "4"))
+CRAWLER_MAX_PAGES = int(os.getenv("CRAWLER_MAX_PAGES", "50"))
+
+
+class _Slot:
+    """池中的一个槽位：持有一个浏览器及其已抓取页数。"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.pages = 0
+
+
+class CrawlerPool:
+    """固定大小的 AsyncWebCrawler 池，所有浏览器运行在同一个后台事件循环中。"""
+
+    def __init__(
+        self,
+        size: int = CRAWLER_POOL_SIZE,
+        max_pages: int = CRAWLER_MAX_PAGES,
+        browser_config_factory: Callable[[], BrowserConfig] = BrowserConfig,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._browser_config_factory = browser_config_factory
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: list = []
+        self._closed = False
+        self.stats: Dict[str, int] = {"leases": 0, "pages": 0, "starts": 0, "recycles": 0, "crashes": 0}
+
+    # ---------- 事件循环线程 ----------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("crawler pool is closed")
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def runner() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=runner, name="crawler-pool-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            asyncio.run_coroutine_threadsafe(self._init_slots(), loop).result()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    async def _init_slots(self) -> None:
+        # 后进先出：顺序抓取时总复用最近用过的热浏览器，其余槽位仅在并发时才启动
+        self._idle = asyncio.LifoQueue()
+        self._slots = [_Slot(i) for i in range(self.size)]
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+    def submit(self, coro: Awaitable[Any]) -> "concurrent.futures.Future[Any]":
+        """把协程提交到池的事件循环，立即返回 Future（可 cancel）。"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("CrawlerPool must not be driven from its own loop thread")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """在池的事件循环中执行协程并同步等待结果（供工具的同步 _run 调用）。"""
+        return self.submit(coro).result(timeout)
+
+    # ---------- 槽位管理 ----------
+    async def _start(self, slot: _Slot) -> None:
+        crawler = AsyncWebCrawler(config=self._browser_config_factory())
+        crawler.crawler_strategy.set_hook("on_page_context_created", install_resource_blocking)
+        await crawler.start()
+        slot.crawler = crawler
+        slot.pages = 0
+        self.stats["starts"] += 1
+
+    async def _retire(self, slot: _Slot) -> None:
+        crawler, slot.crawler = slot.crawler, None
+        slot.pages = 0
+        if crawler is None:
+            return
+        self.stats["recycles"] += 1
+        try:
+            await crawler.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def _lease_slot(self) -> AsyncIterator[_Slot]:
+        slot = await self._idle.get()
+        self.stats["leases"] += 1
+        try:
+            if slot.crawler is None:
+                await self._start(slot)
+            yield slot
+        except BaseException:
+            self.stats["crashes"] += 1
+            await self._retire(slot)
+            raise
+        finally:
+            if slot.crawler is not None and slot.pages >= self.max_pages:
+                await self._retire(slot)
+            self._idle.put_nowait(slot)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncWebCrawler]:
+        """租用一个预热浏览器；须在池的事件循环中使用。异常时回收该浏览器。"""
+        async with self._lease_slot() as slot:
+            yield slot.crawler
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None) -> Any:
+        """租用浏览器抓取单页，计入该浏览器的页数。"""
+        async with self._lease_slot() as slot:
+            result = await slot.crawler.arun(url=url, config=config)
+            slot.pages += 1
+            self.stats["pages"] += 1
+            return result
+
+    async def _warm(self) -> None:
+        leased = [await self._idle.get() for _ in range(self.size)]
+        try:
+            await asyncio.gather(*(self._start(s) for s in leased if s.crawler is None))
+        finally:
+            for slot in leased:
+                self._idle.put_nowait(slot)
+
+    def warm(self) -> None:
+        """预先启动全部浏览器，避免首个请求承担冷启动开销。"""
+        self.run(self._warm())
+
+    # ---------- 关闭 ----------
+    async def _close_all(self) -> None:
+        for slot in self._slots:
+            await self._retire(slot)
+
+    def close(self) -> None:
+        """关闭所有浏览器并停止事件循环线程；可重复调用。"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(30)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+
+
+_pool: Optional[CrawlerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crawler_pool() -> CrawlerPool:
+    """返回进程级共享浏览器池（首次调用时创建）。"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrawlerPool()
+        return _pool
+
+
+def shutdown_crawler_pool() -> None:
+    """关闭共享浏览器池；进程退出时自动调用。"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_crawler_pool)
@@ -0,0 +1,118 @@
+"""
+URL 规范化与重复报道合并：门户爬虫、文章爬虫与两个流程共用。
+
+- canonicalize_url：统一 http/https、大小写、www/移动子域、AMP 变体、跟踪参数（utm_*、ref 等）、末尾斜杠与 fragment；
+- collapse_duplicates：按规范化 URL 合并，再按锚点文本近似（词集 Jaccard）合并，
+  保留首次出现的条目，被合并的原始 URL 记入其 aliases 字段；
+- same_story：同样的标题判定，用于从证据中排除正在核查文章的转载副本。
+"""
+import re
+from typing import Any, Dict, Iterable, List, Set
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# 跟踪/来源类 query 参数（小写比较），不影响页面内容
+_TRACKING_PARAMS = frozenset({
+    "ref", "ref_src", "ref_url", "referrer", "src", "source", "cmpid", "cmp", "ocid", "fbclid", "gclid",
+    "dclid", "msclkid", "yclid", "mc_cid", "mc_eid", "taid", "smid", "sr_share", "guccounter",
+    "guce_referrer", "guce_referrer_sig", "soc_src", "soc_trk", "ito", "at_medium", "at_campaign",
+    "share", "utm", "_ga", "igshid", "outputtype", "amp",
+})
+_TRACKING_PREFIXES = ("utm_", "at_", "mkt_", "pk_", "hsa_")
+# 移动版/AMP 子域，与主站同一篇报道
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.", "www-m.")
+_AMP_PATH_RE = re.compile(r"(/amp(?=/|$)|\.amp(?=$|\.html?$)|/amp\.html?$)", re.I)
+
+TITLE_SIMILARITY_THRESHOLD = 0.85
+_WORD_RE = re.compile(r"[0-9a-z]+|[\u4e00-\u9fff]", re.I)
+
+
+def canonicalize_url(url: str) -> str:
+    """返回用于去重/缓存键的规范化 URL；不保证可直接访问。"""
+    parsed = urlparse((url or "").strip())
+    if not parsed.netloc:
+        return (url or "").strip()
+    host = (parsed.hostname or "").lower().rstrip(".")
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    port = parsed.port
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = _AMP_PATH_RE.sub("", parsed.path or "")
+    path = re.sub(r"/{2,}", "/", path).rstrip("/") or "/"
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    return urlunparse(("https", host, path, "", urlencode(sorted(query)), ""))
+
+
+def _title_tokens(title: str) -> Set[str]:
+    return set(_WORD_RE.findall((title or "").lower()))
+
+
+def title_similarity(a: str, b: str) -> float:
+    """两个标题的词集 Jaccard 相似度（中文按单字切分）。"""
+    ta, tb = _title_tokens(a), _title_tokens(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def same_story(
+    title: str,
+    others: Iterable[str],
+    title_threshold: float = TITLE_SIMILARITY_THRESHOLD,
+    min_title_tokens: int = 4,
+) -> bool:
+    """title 是否与 others 中某个标题属于同一报道（与 collapse_duplicates 相同的标题 Jaccard 判定）。"""
+    tokens = _title_tokens(title)
+    if len(tokens) < min_title_tokens:
+        return False
+    for other in others:
+        other_tokens = _title_tokens(other)
+        if len(other_tokens) >= min_title_tokens and (
+            len(tokens & other_tokens) / len(tokens | other_tokens) >= title_threshold
+        ):
+            return True
+    return False
+
+
+def collapse_duplicates(
+    items: List[Dict[str, Any]],
+    title_threshold: float = TITLE_SIMILARITY_THRESHOLD,
+    min_title_tokens: int = 4,
+) -> List[Dict[str, Any]]:
+    """合并同一报道的多个候选 [{title, url, ...}]；保持原顺序，被合并项的 url 记入 aliases。"""
+    kept: List[Dict[str, Any]] = []
+    by_canonical: Dict[str, Dict[str, Any]] = {}
+    kept_tokens: List[Set[str]] = []
+    for item in items:
+        url = item.get("url", "")
+        if not url:
+            kept.append(item)
+            kept_tokens.append(set())
+            continue
+        key = canonicalize_url(url)
+        target = by_canonical.get(key)
+        tokens = _title_tokens(item.get("title", ""))
+        if target is None and len(tokens) >= min_title_tokens:
+            for other, other_tokens in zip(kept, kept_tokens):
+                if len(other_tokens) >= min_title_tokens and (
+                    len(tokens & other_tokens) / len(tokens | other_tokens) >= title_threshold
+                ):
+                    target = other
+                    break
+        if target is not None:
+            aliases = target.setdefault("aliases", [])
+            for alias in [url] + list(item.get("aliases", [])):
+                if alias != target.get("url") and alias not in aliases:
+                    aliases.append(alias)
+            by_canonical.setdefault(key, target)
+            continue
+        merged = dict(item)
+        by_canonical[key] = merged
+        kept.append(merged)
+        kept_tokens.append(tokens)
+    return kept
@@ -0,0 +1,15 @@
+"""tools 子模块共用的小工具：搜索运算符识别（search_cache、query_dedupe）与耗时分位数（search、evidence_index、domain_health）。"""
+import math
+import re
+from typing import List
+
+# 含引号或搜索运算符（site:、-词、OR 等）的查询，词序与符号有意义
+SEARCH_OPERATOR_RE = re.compile(r"[\"“”]|(?:^|\s)-\S|\b(?:site|intitle|inurl|filetype|before|after):|\b(?:OR|AND)\b")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩分位数（q 取 0～1）；空列表返回 0。"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
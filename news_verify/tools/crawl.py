@@ -1,81 +1,123 @@
-"""门户与文章爬虫工具（Crawl4AI）。"""
+"""门户与文章爬虫工具：门户优先读 RSS/sitemap；页面 HTTP 直取优先，必要时升级到 Crawl4AI 共享浏览器池。"""
 import asyncio
 import json
-from typing import List, Dict, Any
-from urllib.parse import urljoin, urlparse
+import os
+import queue
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Iterator, Tuple
+from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
 from crewai.tools import BaseTool
-from crawl4ai import AsyncWebCrawler
-from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_configs import CrawlerRunConfig
+
+from news_verify.tools.crawl_cache import crawl_cache, CRAWL_CACHE_ENABLED
+from news_verify.tools.browser_pool import get_crawler_pool
+from news_verify.tools.fetch import tiered_fetcher, looks_blocked
+from news_verify.tools.links import extract_portal_items
+from news_verify.tools.feeds import feed_discovery, PORTAL_USE_FEEDS
+from news_verify.tools.canonical import canonicalize_url, collapse_duplicates
+from news_verify.tools.seen_store import IncrementalRun
+from news_verify.tools.evidence_index import evidence_index, EVIDENCE_INDEX_ENABLED
+from news_verify.tools.crawl_profiles import crawl_run_config, CRAWL_PROFILE_ARTICLE, CRAWL_PROFILE_PORTAL
+
+# 文章并发抓取：全局并发上限与单个站点（host）并发上限，保持对单个新闻站的礼貌访问
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "4"))
+CRAWL_PER_HOST = int(os.getenv("CRAWL_PER_HOST", "2"))
+# 抓取结果正文少于该字符数视为不可用（按预算抓取时会补抓下一个候选）
+CRAWL_MIN_ARTICLE_CHARS = int(os.getenv("CRAWL_MIN_ARTICLE_CHARS", "300"))
+# 浏览器抓文章时，页面可见文本达到该字符数即取内容，不等整页加载完成；0 表示关闭
+CRAWL_EARLY_ABORT_CHARS = int(os.getenv("CRAWL_EARLY_ABORT_CHARS", "1500"))
+
+# 当前运行的增量状态（None 为普通运行）。门户爬虫是模块级单例，Web 端多个运行在各自线程中并发，
+# 状态放在 ContextVar 里按运行隔离；CrewAI 在调用 kickoff 的线程内执行工具，因此能读到。
+_incremental_run: ContextVar[Optional[IncrementalRun]] = ContextVar("incremental_run", default=None)
+
+
+@contextmanager
+def incremental_portal(run: Optional[IncrementalRun]) -> Iterator[Optional[IncrementalRun]]:
+    """在当前运行内启用增量模式：门户爬虫只返回 run 判定为新的报道；run 为 None 时为普通运行。"""
+    token = _incremental_run.set(run)
+    try:
+        yield run
+    finally:
+        _incremental_run.reset(token)
+
+
+def _plain_metadata(meta: Any) -> Dict[str, Any]:
+    """只保留可 JSON 序列化的标量元数据（description、author、published 等）。"""
+    if not isinstance(meta, dict):
+        return {}
+    return {str(k): v for k, v in meta.items() if v is None or isinstance(v, (str, int, float, bool))}
+
+
+def is_usable_article(entry: Dict[str, Any], min_chars: int = CRAWL_MIN_ARTICLE_CHARS) -> bool:
+    """抓取结果是否可用于验证：无错误、正文足够长且不是付费墙/同意页。"""
+    if not entry or entry.get("error"):
+        return False
+    md = (entry.get("markdown") or "").strip()
+    if len(md) < min_chars:
+        return False
+    # 长正文里偶尔出现的“订阅”字样不算付费墙，只检查较短的正文
+    return not (len(md) < 3 * min_chars and looks_blocked(md))
 
 
 class PortalCrawlerTool(BaseTool):
     name: str = "Portal Crawler"
     description: str = (
         "Given a news portal homepage URL, crawl it and extract candidate news links "
-        "with their titles and short snippets. Always return a JSON list of items."
+        "with their titles and short snippets. Items found via the portal's RSS/sitemap also carry "
+        "a 'published' UTC timestamp (newest first). Always return a JSON list of items."
     )
+    use_cache: bool = CRAWL_CACHE_ENABLED
+    # 是否先尝试 RSS/Atom/新闻 sitemap（tools/feeds.py）
+    use_feeds: bool = PORTAL_USE_FEEDS
+    # 浏览器抓取的资源配置档：full 不拦截，text 屏蔽图片/字体/样式表与广告追踪请求
+    resource_profile: str = CRAWL_PROFILE_PORTAL
 
     def _run(self, portal_url: str) -> str:
         async def crawl() -> Dict[str, Any]:
-            browser_config = BrowserConfig()
-            run_config = CrawlerRunConfig(
-                page_timeout=90_000,
-                wait_until="commit",
-            )
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                result = await crawler.arun(url=portal_url, config=run_config)
-                html = result.html or ""
-                soup = BeautifulSoup(html, "html.parser")
-
-                seen: set = set()
-                items: List[Dict[str, str]] = []
-
-                for a in soup.find_all("a", href=True):
-                    href = (a["href"] or "").strip()
-                    text = a.get_text(strip=True)
-                    if not text or len(text) < 3:
-                        continue
-                    full_url = href
-                    if full_url.startswith("//"):
-                        full_url = "https:" + full_url
-                    elif full_url.startswith("/"):
-                        full_url = urljoin(portal_url, full_url)
-                    if not full_url.startswith("http"):
-                        continue
-                    parsed = urlparse(full_url)
-                    path = (parsed.path or "").lower()
-                    if full_url.rstrip("/") == portal_url.rstrip("/"):
-                        continue
-                    if any(skip in path for skip in ["/login", "/signup", "/tag/", "/author/", "/subscribe"]):
-                        continue
-                    path_segments = [s for s in path.split("/") if s]
-                    is_article = (
-                        "/article" in path
-                        or "/news" in path
-                        or "/story" in path
-                        or "/202" in path
-                        or "detail" in path
-                        or (len(path) > 15 and ("/" in path[1:] or path.count("-") >= 2))
-                        or (len(path_segments) >= 2 and len(path) > 8)
-                    )
-                    if not is_article:
-                        continue
-                    if full_url in seen:
-                        continue
-                    seen.add(full_url)
-                    items.append({"title": text[:200], "url": full_url})
-
-                return {"portal_url": portal_url, "items": items}
-
-        data = asyncio.run(crawl())
+            if self.use_cache:
+                cached = await asyncio.to_thread(crawl_cache.get, portal_url, "portal")
+                if cached is not None:
+                    return dict(cached, portal_url=portal_url)
+            # 优先用门户的 RSS/Atom/新闻 sitemap，没有可用 feed 时才抓首页 HTML
+            feed = await asyncio.to_thread(feed_discovery.fetch_items, portal_url) if self.use_feeds else None
+            if feed is not None:
+                items, response_headers = feed["items"], None
+                source: Dict[str, Any] = {"source": "feed", "feeds": feed["feeds"]}
+            else:
+                run_config = crawl_run_config(self.resource_profile)
+                page = await tiered_fetcher.fetch(portal_url, "portal", run_config)
+                # 大页面解析放到线程里，避免阻塞浏览器池的事件循环
+                items = await asyncio.to_thread(extract_portal_items, page["html"], portal_url)
+                response_headers = page["response_headers"]
+                source = {"source": "html"}
+            # 同一报道的跟踪参数/AMP/移动版等变体及标题近似的链接合并为一条，别名记入 aliases
+            items = collapse_duplicates(items)
+            data = dict({"portal_url": portal_url, "items": items}, **source)
+            if self.use_cache and items:
+                await asyncio.to_thread(crawl_cache.put, portal_url, "portal", data, response_headers)
+            return data
+
+        data = get_crawler_pool().run(crawl())
+        # 增量运行（incremental_portal）中只返回该门户上轮运行以来新出现的报道
+        run = _incremental_run.get()
+        if run is not None:
+            data = run.only_new(data)
         return json.dumps(data, ensure_ascii=False, indent=2)
 
 
 class ArticleCrawlerTool(BaseTool):
     name: str = "Article Crawler"
     description: str = "Given a list of article URLs, crawl each page and return full text content. Input/Output are JSON."
+    max_concurrency: int = CRAWL_CONCURRENCY
+    per_host_limit: int = CRAWL_PER_HOST
+    use_cache: bool = CRAWL_CACHE_ENABLED
+    # 文章只需要正文与标题，默认用 text 配置档
+    resource_profile: str = CRAWL_PROFILE_ARTICLE
+    # 可用正文写入本地证据索引（tools/evidence_index.py），供后续核查先查本地
+    index_evidence: bool = EVIDENCE_INDEX_ENABLED
 
     def _run(self, articles_json: str) -> str:
         try:
@@ -84,33 +126,177 @@ class ArticleCrawlerTool(BaseTool):
             return json.dumps({"error": "Invalid JSON input for articles"}, ensure_ascii=False)
 
         async def crawl_many(urls: List[str]) -> Dict[str, Any]:
-            browser_config = BrowserConfig()
-            run_config = CrawlerRunConfig(
-                page_timeout=90_000,
-                wait_until="commit",
-            )
-            results: Dict[str, Any] = {}
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                for url in urls:
-                    try:
-                        r = await crawler.arun(url=url, config=run_config)
-                        if r is None:
-                            results[url] = {"url": url, "error": "crawler returned None"}
-                            continue
-                        md = getattr(r, "markdown", None) or ""
-                        meta = getattr(r, "metadata", None)
-                        title = ""
-                        if isinstance(meta, dict):
-                            title = meta.get("title", "") or ""
-                        results[url] = {"url": url, "markdown": md, "title": title}
-                    except BaseException as e:
-                        results[url] = {"url": url, "error": str(e)}
+            results = {u: None for u in urls}
+            async for url, entry in self.astream(urls):
+                results[url] = entry
             return results
 
         urls = [a["url"] for a in articles if "url" in a]
-        data = asyncio.run(crawl_many(urls))
+        data = get_crawler_pool().run(crawl_many(urls))
         return json.dumps(data, ensure_ascii=False, indent=2)
 
+    async def _crawl_one(self, url: str, run_config: CrawlerRunConfig) -> Dict[str, Any]:
+        entry = await self._fetch_one(url, run_config)
+        if self.index_evidence and is_usable_article(entry):
+            # 同一 URL 内容不变时索引内不重复写入，缓存命中的文章也走这里
+            await asyncio.to_thread(evidence_index.add_article, url, entry.get("title") or "", entry["markdown"])
+        return entry
+
+    async def _fetch_one(self, url: str, run_config: CrawlerRunConfig) -> Dict[str, Any]:
+        if self.use_cache:
+            cached = await asyncio.to_thread(crawl_cache.get, url, "article")
+            if cached is not None:
+                return dict(cached, url=url)
+        try:
+            page = await tiered_fetcher.fetch(url, "article", run_config)
+            md = page["markdown"]
+            entry = {"url": url, "markdown": md, "title": page["title"], "metadata": _plain_metadata(page["metadata"])}
+        except BaseException as e:
+            return {"url": url, "error": str(e)}
+        if self.use_cache and md.strip():
+            await asyncio.to_thread(crawl_cache.put, url, "article", entry, page["response_headers"])
+        return entry
+
+    def _limited_crawler(self) -> Callable[[str], Awaitable[Dict[str, Any]]]:
+        """返回受全局与单站点并发上限约束的单页抓取函数（每次流式抓取一组新的信号量）。"""
+        # page_timeout 由 TieredFetcher 按站点延迟历史覆盖
+        run_config = crawl_run_config(self.resource_profile, early_abort_chars=CRAWL_EARLY_ABORT_CHARS)
+        global_sem = asyncio.Semaphore(max(1, self.max_concurrency))
+        host_sems: Dict[str, asyncio.Semaphore] = {}
+
+        async def fetch(url: str) -> Dict[str, Any]:
+            host = urlparse(url).netloc.lower()
+            host_sem = host_sems.setdefault(host, asyncio.Semaphore(max(1, self.per_host_limit)))
+            # 先占站点名额再占全局名额，避免排队等某个站点时占住全局并发
+            async with host_sem:
+                async with global_sem:
+                    return await self._crawl_one(url, run_config)
+
+        return fetch
+
+    async def astream(self, urls: List[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        并发抓取 urls，每篇抓完立即 yield (原始 url, 条目)，顺序为完成顺序；须在浏览器池事件循环中迭代。
+        规范化后相同的 URL 只抓一次，但会为每个原始 URL 各 yield 一次。
+        """
+        fetch = self._limited_crawler()
+
+        async def fetch_group(key: str, url: str) -> Tuple[str, Dict[str, Any]]:
+            return key, await fetch(url)
+
+        groups: Dict[str, List[str]] = {}
+        for u in dict.fromkeys(urls):
+            groups.setdefault(canonicalize_url(u), []).append(u)
+        tasks = [asyncio.ensure_future(fetch_group(key, group[0])) for key, group in groups.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, entry = await next_done
+                for u in groups[key]:
+                    yield u, (entry if entry.get("url") == u else dict(entry, url=u))
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    async def astream_budget(self, plan: "CrawlPlan") -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        按预算抓取：先并发抓排名前 plan.budget 的候选，某篇失败/正文为空/遇到付费墙时才补抓下一个候选。
+        每个完成的抓取（含不可用的）都会 yield，是否可用由 is_usable_article 判断；统计记录在 plan 上。
+        """
+        fetch = self._limited_crawler()
+        remaining = iter(plan.candidates)
+        pending: Dict[asyncio.Future, str] = {}
+
+        def launch_next() -> bool:
+            for url in remaining:
+                plan.attempted += 1
+                pending[asyncio.ensure_future(fetch(url))] = url
+                return True
+            return False
+
+        for _ in range(plan.budget):
+            if not launch_next():
+                break
+        try:
+            while pending:
+                done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = pending.pop(task)
+                    entry = task.result()
+                    if is_usable_article(entry):
+                        plan.usable += 1
+                    elif launch_next():
+                        plan.replacements += 1
+                    yield url, entry
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _iterate(self, agen: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """把浏览器池中的异步生成器桥接为同步迭代器，生产端在后台持续运行。"""
+        out: "queue.Queue[Any]" = queue.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async for item in agen:
+                    out.put(item)
+            except BaseException as e:
+                out.put(e)
+            finally:
+                out.put(done)
+
+        future = get_crawler_pool().submit(pump())
+        try:
+            while True:
+                item = out.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def stream(self, articles: List[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """同步流式接口：在浏览器池中并发抓取，主线程按完成顺序逐篇拿到 (url, 条目)。"""
+        urls = [a["url"] for a in articles if isinstance(a, dict) and a.get("url")]
+        return self._iterate(self.astream(urls))
+
+    def stream_budget(self, plan: "CrawlPlan") -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """astream_budget 的同步版本。"""
+        return self._iterate(self.astream_budget(plan))
+
+
+class CrawlPlan:
+    """抓取预算：候选按排名排列，只抓 budget 篇，不可用时依次补位；记录实际抓取与节省的次数。"""
+
+    def __init__(self, candidates: List[str], budget: int):
+        self.candidates = list(dict.fromkeys(u for u in candidates if u))
+        self.budget = max(0, budget)
+        self.attempted = 0
+        self.usable = 0
+        self.replacements = 0
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "budget": self.budget,
+            "candidates": len(self.candidates),
+            "attempted": self.attempted,
+            "usable": self.usable,
+            "replacements": self.replacements,
+            # 相比抓取全部候选节省的抓取次数
+            "saved_crawls": len(self.candidates) - self.attempted,
+        }
+
 
 portal_crawler_tool = PortalCrawlerTool()
 article_crawler_tool = ArticleCrawlerTool()
+
+
+def portal_candidates(portal_url: str) -> List[Dict[str, Any]]:
+    """流程直接抓取门户时使用：返回 portal_crawler_tool 输出中的候选条目，结果无法解析时返回空列表。"""
+    try:
+        items = json.loads(portal_crawler_tool._run(portal_url)).get("items", [])
+    except (ValueError, AttributeError):
+        return []
+    return [x for x in items if isinstance(x, dict) and x.get("url")]
@@ -0,0 +1,174 @@
+"""
+抓取结果磁盘缓存：按规范化 URL（tools/canonical.py）的哈希寻址，分类型 TTL，ETag/Last-Modified 条件重验证，按大小做 LRU 淘汰。
+
+- 门户（portal）TTL 短，文章（article）TTL 长；
+- 过期条目若带 ETag/Last-Modified，先发条件 GET，304 则续期复用；
+- 每个条目一个 JSON 文件，文件 mtime 记录最近访问时间；写入时维护总字节数，超限时才扫描目录，
+  按最久未访问淘汰到上限的 90%，留出余量避免每次写入都扫描。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+from news_verify.tools.canonical import canonicalize_url
+
+CRAWL_CACHE_TTL = {
+    "portal": int(os.getenv("CRAWL_CACHE_TTL_PORTAL", "600")),
+    "article": int(os.getenv("CRAWL_CACHE_TTL_ARTICLE", str(7 * 24 * 3600))),
+}
+CRAWL_CACHE_MAX_BYTES = int(float(os.getenv("CRAWL_CACHE_MAX_MB", "200")) * 1024 * 1024)
+CRAWL_CACHE_ENABLED = os.getenv("CRAWL_CACHE", "1") not in ("0", "false", "off")
+
+
+class CrawlCache:
+    """线程安全的磁盘抓取缓存；stats 记录命中/未命中/重验证/写入/淘汰次数。"""
+
+    def __init__(
+        self,
+        root: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "crawl"),
+        ttl: Optional[Dict[str, int]] = None,
+        max_bytes: int = CRAWL_CACHE_MAX_BYTES,
+        revalidate_timeout: float = 10.0,
+    ):
+        self.root = Path(root)
+        self.ttl = dict(CRAWL_CACHE_TTL, **(ttl or {}))
+        self.max_bytes = max_bytes
+        self.revalidate_timeout = revalidate_timeout
+        self._lock = threading.Lock()
+        # 缓存目录总字节数（首次写入时扫描一次，之后按写入增量维护）
+        self._total: Optional[int] = None
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    def _path(self, url: str, kind: str) -> Path:
+        digest = hashlib.sha256(f"{kind}:{canonicalize_url(url)}".encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _revalidate(self, url: str, entry: Dict[str, Any]) -> bool:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False
+        try:
+            resp = requests.get(url, headers=headers, timeout=self.revalidate_timeout, allow_redirects=True)
+            resp.close()
+        except requests.RequestException:
+            return False
+        return resp.status_code == 304
+
+    def get(self, url: str, kind: str) -> Optional[Dict[str, Any]]:
+        """返回缓存的抓取结果（dict）；不存在或过期且重验证失败时返回 None。"""
+        path = self._path(url, kind)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        age = time.time() - float(entry.get("stored_at", 0))
+        if age > self.ttl.get(kind, 0):
+            if not self._revalidate(url, entry):
+                self._count("misses")
+                return None
+            entry["stored_at"] = time.time()
+            self._write(path, entry)
+            self._count("revalidated")
+        else:
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+        self._count("hits")
+        return entry.get("data")
+
+    def put(self, url: str, kind: str, data: Dict[str, Any], response_headers: Optional[Dict[str, Any]] = None) -> None:
+        """写入抓取结果；response_headers 中的 ETag/Last-Modified 用于过期后的条件重验证。"""
+        headers = {str(k).lower(): v for k, v in (response_headers or {}).items()}
+        entry = {
+            "url": url,
+            "kind": kind,
+            "stored_at": time.time(),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "data": data,
+        }
+        path = self._path(url, kind)
+        old_size = self._size(path)
+        self._write(path, entry)
+        self._count("stores")
+        self._evict(self._size(path) - old_size)
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _scan_locked(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        for p in self.root.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        return files
+
+    def _evict(self, added: int) -> None:
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._scan_locked())
+            else:
+                self._total += added
+            if self._total <= self.max_bytes:
+                return
+            # 超限时重新扫描（其它进程也可能写入），按最久未访问淘汰到上限的 90%
+            files = self._scan_locked()
+            total = sum(size for _, size, _ in files)
+            target = int(self.max_bytes * 0.9)
+            for _, size, p in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evictions"] += 1
+            self._total = total
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, int]) -> Dict[str, Any]:
+        """相对 snapshot 的增量统计（单次流程的命中情况），附命中率。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        lookups = delta["hits"] + delta["misses"]
+        delta["hit_rate"] = round(delta["hits"] / lookups, 3) if lookups else 0.0
+        return delta
+
+
+crawl_cache = CrawlCache()
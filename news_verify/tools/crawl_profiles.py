@@ -0,0 +1,96 @@
+"""
+浏览器抓取配置档（profile）：按请求拦截规则屏蔽不需要的资源。
+
+- full：不做拦截，页面按原样加载（门户首页默认）；
+- text：只保留文档、脚本与 XHR/fetch，拦截图片、媒体、字体、样式表等资源类型，
+  以及已知广告/统计/追踪域名的所有请求（文章页默认，只需要 markdown 与标题）。
+
+拦截通过 Crawl4AI 的 on_page_context_created 钩子在每个新页面上注册 page.route 实现，
+钩子由浏览器池为每个浏览器安装；run config 的 shared_data["resource_profile"] 决定该页是否拦截。
+"""
+import os
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from crawl4ai.async_configs import CrawlerRunConfig
+
+CRAWL_PROFILE_ARTICLE = os.getenv("CRAWL_PROFILE_ARTICLE", "text")
+CRAWL_PROFILE_PORTAL = os.getenv("CRAWL_PROFILE_PORTAL", "full")
+
+# text 配置档拦截的 Playwright 资源类型
+BLOCKED_RESOURCE_TYPES = frozenset({
+    "image", "media", "font", "stylesheet", "texttrack", "manifest", "ping", "other",
+})
+# 已知广告/统计/追踪域名（后缀匹配）；可用 CRAWL_BLOCK_HOSTS（逗号分隔）追加
+BLOCKED_HOSTS = frozenset({
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "googletagservices.com",
+    "googletagmanager.com", "google-analytics.com", "adservice.google.com", "amazon-adsystem.com",
+    "facebook.net", "connect.facebook.net", "scorecardresearch.com", "quantserve.com", "quantcount.com",
+    "taboola.com", "outbrain.com", "criteo.com", "criteo.net", "adnxs.com", "rubiconproject.com",
+    "pubmatic.com", "openx.net", "casalemedia.com", "moatads.com", "doubleverify.com",
+    "adsafeprotected.com", "chartbeat.com", "chartbeat.net", "hotjar.com", "segment.io", "segment.com",
+    "nr-data.net", "optimizely.com", "krxd.net", "bluekai.com", "demdex.net", "omtrdc.net",
+    "everesttech.net", "permutive.com", "permutive.app", "teads.tv", "sharethrough.com", "bidswitch.net",
+    "yieldmo.com", "indexww.com", "3lift.com", "adsrvr.org", "smartadserver.com", "parsely.com",
+    "cdn.cookielaw.org", "onetrust.com", "trustarc.com", "zemanta.com", "hm.baidu.com", "cnzz.com",
+    "tanx.com", "mmstat.com", "pos.baidu.com",
+} | {h.strip().lower() for h in os.getenv("CRAWL_BLOCK_HOSTS", "").split(",") if h.strip()})
+
+# 被拦截的请求计数，键为 "type:<资源类型>" 或 "host"
+block_stats: Dict[str, int] = {}
+
+
+def host_is_blocked(host: str) -> bool:
+    """host 是否属于（或是其子域）已知广告/追踪域名。"""
+    host = (host or "").lower().rstrip(".")
+    while host:
+        if host in BLOCKED_HOSTS:
+            return True
+        _, _, host = host.partition(".")
+    return False
+
+
+def crawl_run_config(
+    profile: str = "full",
+    page_timeout: int = 90_000,
+    early_abort_chars: int = 0,
+    **kwargs: Any,
+) -> CrawlerRunConfig:
+    """
+    按配置档构造 CrawlerRunConfig；profile 记录在 shared_data 中供拦截钩子读取。
+    early_abort_chars > 0 时，页面可见文本达到该长度即开始取内容，不等整页加载完成。
+    """
+    kwargs.setdefault("wait_until", "commit")
+    if early_abort_chars > 0:
+        kwargs.setdefault(
+            "wait_for",
+            "js:() => document.readyState === 'complete' || "
+            f"((document.body && document.body.innerText) || '').length >= {int(early_abort_chars)}",
+        )
+    return CrawlerRunConfig(page_timeout=page_timeout, shared_data={"resource_profile": profile}, **kwargs)
+
+
+def _profile_of(config: Optional[CrawlerRunConfig]) -> str:
+    shared = getattr(config, "shared_data", None)
+    return shared.get("resource_profile", "full") if isinstance(shared, dict) else "full"
+
+
+async def _route_text_only(route: Any) -> None:
+    request = route.request
+    reason = None
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        reason = f"type:{request.resource_type}"
+    elif host_is_blocked(urlparse(request.url).hostname or ""):
+        reason = "host"
+    if reason is None:
+        await route.continue_()
+        return
+    block_stats[reason] = block_stats.get(reason, 0) + 1
+    await route.abort()
+
+
+async def install_resource_blocking(page: Any, context: Any = None, config: Any = None, **kwargs: Any) -> Any:
+    """on_page_context_created 钩子：text 配置档的页面注册拦截规则。"""
+    if _profile_of(config) == "text":
+        await page.route("**/*", _route_text_only)
+    return page
@@ -0,0 +1,156 @@
+"""
+按站点（host）的抓取健康度：滚动延迟历史推导超时，连续失败的站点临时隔离。
+
+- 每个 (抓取级别, host) 保留最近 DOMAIN_LATENCY_WINDOW 次成功耗时，超时取 p95 × 系数 + 余量，限制在上下限之间；
+  样本不足时用默认超时（比原先固定的 90 秒短）；
+- 同一 host 连续失败 DOMAIN_QUARANTINE_FAILURES 次后隔离，隔离时长随再次失败翻倍，
+  隔离期间直接跳过，不再消耗完整超时；成功一次即清零；
+- 状态落盘（JSON），跨运行保留。
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+from news_verify.tools.common import percentile
+
+DOMAIN_LATENCY_WINDOW = int(os.getenv("DOMAIN_LATENCY_WINDOW", "20"))
+DOMAIN_MIN_SAMPLES = int(os.getenv("DOMAIN_MIN_SAMPLES", "3"))
+# 各级别默认/最小/最大超时（秒）
+DOMAIN_TIMEOUTS = {
+    "http": (float(os.getenv("HTTP_TIMEOUT_DEFAULT", "15")), 3.0, 20.0),
+    "browser": (float(os.getenv("BROWSER_TIMEOUT_DEFAULT", "45")), 10.0, 90.0),
+}
+DOMAIN_QUARANTINE_FAILURES = int(os.getenv("DOMAIN_QUARANTINE_FAILURES", "3"))
+DOMAIN_QUARANTINE_SECONDS = float(os.getenv("DOMAIN_QUARANTINE_SECONDS", "1800"))
+DOMAIN_QUARANTINE_MAX_SECONDS = float(os.getenv("DOMAIN_QUARANTINE_MAX_SECONDS", str(24 * 3600)))
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class DomainHealth:
+    """线程安全；latency_key 为 "<级别>:<host>"，失败计数与隔离按 host。"""
+
+    def __init__(
+        self,
+        state_path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "domain_health.json"),
+        window: int = DOMAIN_LATENCY_WINDOW,
+    ):
+        self.state_path = Path(state_path)
+        self.window = max(1, window)
+        self._lock = threading.Lock()
+        self._latency: Dict[str, List[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._quarantined: Dict[str, float] = {}
+        self.stats: Dict[str, int] = {"timeouts": 0, "failures": 0, "quarantine_skips": 0, "quarantines": 0}
+        self._load_state()
+
+    # ---------- 持久化 ----------
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._latency = {k: [float(x) for x in v][-self.window:] for k, v in data.get("latency", {}).items()}
+            self._failures = {k: int(v) for k, v in data.get("failures", {}).items()}
+            self._quarantined = {k: float(v) for k, v in data.get("quarantined", {}).items()}
+        except (OSError, ValueError, AttributeError, TypeError):
+            pass
+
+    def _save_locked(self) -> None:
+        now = time.time()
+        self._quarantined = {k: v for k, v in self._quarantined.items() if v > now}
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"latency": self._latency, "failures": self._failures, "quarantined": self._quarantined}, f)
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass
+
+    # ---------- 超时 ----------
+    def timeout_for(self, url: str, tier: str) -> float:
+        """该站点在该级别的超时（秒）：样本足够时取 p95 × 2 + 2 秒，否则用默认值。"""
+        default, low, high = DOMAIN_TIMEOUTS[tier]
+        with self._lock:
+            samples = self._latency.get(f"{tier}:{_host(url)}", [])
+            if len(samples) < DOMAIN_MIN_SAMPLES:
+                return default
+            return min(high, max(low, percentile(samples, 0.95) * 2 + 2))
+
+    # ---------- 隔离 ----------
+    def quarantined_until(self, url: str) -> Optional[float]:
+        """站点处于隔离期时返回隔离结束时间（时间戳），否则 None。"""
+        host = _host(url)
+        with self._lock:
+            until = self._quarantined.get(host)
+            if until is None:
+                return None
+            if until <= time.time():
+                del self._quarantined[host]
+                return None
+            self.stats["quarantine_skips"] += 1
+            return until
+
+    def record(self, url: str, tier: str, seconds: float, ok: bool, timed_out: bool = False) -> None:
+        """记录一次抓取结果：成功则加入延迟样本并清零失败计数，失败累计到阈值后隔离。"""
+        host = _host(url)
+        if not host:
+            return
+        with self._lock:
+            if ok:
+                samples = self._latency.setdefault(f"{tier}:{host}", [])
+                samples.append(round(seconds, 3))
+                del samples[:-self.window]
+                changed = self._failures.pop(host, None) is not None
+                # 成功样本每积累若干次落盘一次，失败与隔离变化立即落盘
+                if changed or len(samples) % 5 == 0:
+                    self._save_locked()
+                return
+            self.stats["failures"] += 1
+            if timed_out:
+                self.stats["timeouts"] += 1
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= DOMAIN_QUARANTINE_FAILURES:
+                extra = failures - DOMAIN_QUARANTINE_FAILURES
+                duration = min(DOMAIN_QUARANTINE_MAX_SECONDS, DOMAIN_QUARANTINE_SECONDS * (2 ** extra))
+                self._quarantined[host] = time.time() + duration
+                self.stats["quarantines"] += 1
+            self._save_locked()
+
+    # ---------- 统计 ----------
+    def latency_summary(self, hosts: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """各 (级别, host) 的样本数与 p50/p95（毫秒）。"""
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._latency.items() if hosts is None or k.split(":", 1)[1] in hosts]
+        return {
+            k: {
+                "samples": len(v),
+                "p50_ms": round(percentile(v, 0.5) * 1000),
+                "p95_ms": round(percentile(v, 0.95) * 1000),
+            }
+            for k, v in items
+        }
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, int]) -> Dict[str, Any]:
+        """相对 snapshot 的超时/失败/隔离跳过次数，附当前处于隔离期的站点。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        t = time.time()
+        with self._lock:
+            delta["quarantined_hosts"] = sorted(h for h, until in self._quarantined.items() if until > t)
+        return delta
+
+
+domain_health = DomainHealth()
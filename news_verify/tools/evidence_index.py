@@ -0,0 +1,247 @@
+"""
+本地全文证据索引（SQLite FTS5，BM25 排序）：保存历次运行的搜索结果摘要与抓取到的文章正文，
+后续运行中相关声明先查本地，证据不足或过期时才请求 Serper。
+
+- 写入：搜索后端（Serper）每次成功搜索的结果（title/link/snippet）、ArticleCrawlerTool 抓到的可用正文，按规范化 URL 增量插入；
+  同一 URL 内容不变时不重复写入，内容变化时替换；
+- 查询：查询词以 OR 组合交给 FTS5，按 bm25() 排序；只保留 EVIDENCE_MAX_AGE 内写入、且覆盖查询中至少
+  EVIDENCE_MIN_COVERAGE 比例实词的文档；满足条件的不同 URL 达到 EVIDENCE_MIN_HITS 条才算本地证据充足；
+  正在核查的文章（按 URL）及其转载副本（标题与其属于同一报道）不计入；
+- EVIDENCE_INDEX=0 关闭；超过 EVIDENCE_INDEX_MAX_MB 时删除最早写入的文档；
+- stats 记录写入、查询次数、本地命中（充足）与查询耗时，size() 返回文档数与库文件大小。
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from news_verify.tools.canonical import canonicalize_url, same_story
+from news_verify.tools.common import percentile
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+
+EVIDENCE_INDEX_ENABLED = os.getenv("EVIDENCE_INDEX", "1") not in ("0", "false", "off")
+EVIDENCE_MAX_AGE = int(os.getenv("EVIDENCE_MAX_AGE", str(48 * 3600)))
+EVIDENCE_MIN_HITS = int(os.getenv("EVIDENCE_MIN_HITS", "3"))
+EVIDENCE_MIN_COVERAGE = float(os.getenv("EVIDENCE_MIN_COVERAGE", "0.6"))
+EVIDENCE_INDEX_MAX_BYTES = int(float(os.getenv("EVIDENCE_INDEX_MAX_MB", "200")) * 1024 * 1024)
+# 文章正文只索引前若干字符，导语与主体已足够检索
+EVIDENCE_MAX_DOC_CHARS = int(os.getenv("EVIDENCE_MAX_DOC_CHARS", "20000"))
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_OPERATOR_RE = re.compile(r"\b(?:site|intitle|inurl|filetype|before|after):\S*", re.IGNORECASE)
+# 只用于计算覆盖率的英文虚词；BM25 本身会压低高频词的权重
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were will with "
+    "after before over under about said says".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    text = _OPERATOR_RE.sub(" ", unicodedata.normalize("NFKC", text or "").lower())
+    return list(dict.fromkeys(w for w in _WORD_RE.findall(text) if len(w) > 1 or not w.isascii()))
+
+
+class EvidenceIndex:
+    """线程安全；所有方法在索引关闭或 FTS5 不可用时安全返回（空结果 / 不写入）。"""
+
+    def __init__(
+        self,
+        path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "evidence_index.sqlite3"),
+        max_age: int = EVIDENCE_MAX_AGE,
+        min_hits: int = EVIDENCE_MIN_HITS,
+        min_coverage: float = EVIDENCE_MIN_COVERAGE,
+        max_bytes: int = EVIDENCE_INDEX_MAX_BYTES,
+        enabled: bool = EVIDENCE_INDEX_ENABLED,
+        history: int = 1000,
+    ):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.min_coverage = min_coverage
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_evict = 0
+        self.lookups: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.stats: Dict[str, float] = {
+            "added": 0, "updated": 0, "evictions": 0, "lookups": 0, "sufficient": 0, "lookup_seconds": 0.0,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, link TEXT NOT NULL, source TEXT NOT NULL, "
+                "digest TEXT NOT NULL, size INTEGER NOT NULL, indexed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS docs_indexed_at ON docs (indexed_at)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"
+            )
+            self._conn = conn
+        return self._conn
+
+    # ---------- 写入 ----------
+    def _upsert_locked(self, link: str, title: str, body: str, source: str) -> None:
+        url = canonicalize_url(link)
+        body = (body or "")[:EVIDENCE_MAX_DOC_CHARS]
+        digest = hashlib.sha256(f"{title}\n{body}".encode("utf-8")).hexdigest()
+        now = time.time()
+        conn = self._db()
+        row = conn.execute("SELECT id, digest, source FROM docs WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            # 内容不变时保留首次写入时间；搜索摘要不覆盖已有的文章正文
+            if row[1] == digest or (row[2] == "article" and source == "search"):
+                return
+            conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (row[0],))
+            conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+            self.stats["updated"] += 1
+        else:
+            self.stats["added"] += 1
+        cur = conn.execute(
+            "INSERT INTO docs (url, link, source, digest, size, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, link, source, digest, len(title.encode("utf-8")) + len(body.encode("utf-8")), now),
+        )
+        conn.execute("INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)", (cur.lastrowid, title, body))
+        self._writes_since_evict += 1
+
+    def _add(self, docs: Iterable[Dict[str, str]], source: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                for doc in docs:
+                    if doc.get("link") and (doc.get("title") or doc.get("body")):
+                        self._upsert_locked(doc["link"], doc.get("title") or "", doc.get("body") or "", source)
+                self._db().commit()
+                if self._writes_since_evict >= 200:
+                    self._evict_locked()
+            except sqlite3.Error:
+                # FTS5 不可用或库损坏时只是失去本地证据，不影响搜索与抓取
+                self.enabled = False
+
+    def add_search_results(self, results: List[Dict[str, str]]) -> None:
+        """写入一次搜索的结果（title / link / snippet）。"""
+        self._add(
+            ({"link": r.get("link", ""), "title": r.get("title", ""), "body": r.get("snippet", "")} for r in results),
+            "search",
+        )
+
+    def add_article(self, url: str, title: str, text: str) -> None:
+        """写入一篇抓取到的文章正文。"""
+        self._add([{"link": url, "title": title, "body": text}], "article")
+
+    def _evict_locked(self) -> None:
+        """总大小超过上限时按写入时间从旧到新删除。"""
+        self._writes_since_evict = 0
+        conn = self._db()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM docs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for doc_id, size in conn.execute("SELECT id, size FROM docs ORDER BY indexed_at").fetchall():
+            conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+            conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+            self.stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.commit()
+
+    # ---------- 查询 ----------
+    def lookup(
+        self, query: str, limit: int = 10, exclude_urls: Iterable[str] = (), exclude_titles: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        BM25 检索本地证据。返回 sufficient（是否足以跳过 Web 搜索）、results（title / link / snippet / indexed_at，
+        与 Serper 结果同形）与 latency_ms。exclude_urls 中的文档不计入（如正在核查的文章本身），
+        标题与 exclude_titles 属于同一报道的文档（其它站点的转载副本）也不计入。
+        """
+        terms = _terms(query)
+        if not self.enabled or not terms:
+            return {"sufficient": False, "results": [], "latency_ms": 0}
+        key_terms = [t for t in terms if t not in _STOPWORDS] or terms
+        match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        excluded = {canonicalize_url(u) for u in exclude_urls if u}
+        excluded_titles = [t for t in exclude_titles if t]
+        t0 = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            try:
+                rows = self._db().execute(
+                    "SELECT d.url, d.link, docs_fts.title, docs_fts.body, "
+                    "snippet(docs_fts, 1, '', '', ' … ', 48), d.indexed_at "
+                    "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+                    "WHERE docs_fts MATCH ? AND d.indexed_at >= ? ORDER BY bm25(docs_fts) LIMIT ?",
+                    (match, time.time() - self.max_age, limit * 4),
+                ).fetchall()
+            except sqlite3.Error:
+                rows = []
+            for url, link, title, body, snippet, indexed_at in rows:
+                if url in excluded or (excluded_titles and same_story(title, excluded_titles)):
+                    continue
+                words = set(_terms(f"{title} {body}"))
+                coverage = sum(1 for t in key_terms if t in words) / len(key_terms)
+                if coverage < self.min_coverage:
+                    continue
+                results.append({"title": title, "link": link, "snippet": snippet, "indexed_at": round(indexed_at)})
+                if len(results) >= limit:
+                    break
+            seconds = time.perf_counter() - t0
+            sufficient = len(results) >= min(self.min_hits, limit)
+            self.stats["lookups"] += 1
+            self.stats["sufficient"] += 1 if sufficient else 0
+            self.stats["lookup_seconds"] += seconds
+            self.lookups.append({"latency_ms": seconds * 1000, "at": time.time()})
+        return {"sufficient": sufficient, "results": results, "latency_ms": round(seconds * 1000, 1)}
+
+    # ---------- 统计 ----------
+    def size(self) -> Dict[str, Any]:
+        """文档数（按来源）与库文件大小。"""
+        if not self.enabled:
+            return {"documents": 0, "by_source": {}, "bytes": 0}
+        with self._lock:
+            try:
+                by_source = dict(self._db().execute("SELECT source, COUNT(*) FROM docs GROUP BY source").fetchall())
+            except sqlite3.Error:
+                by_source = {}
+        files = [self.path, Path(f"{self.path}-wal")]
+        return {
+            "documents": sum(by_source.values()),
+            "by_source": by_source,
+            "bytes": sum(p.stat().st_size for p in files if p.exists()),
+        }
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            snap = dict(self.stats)
+        snap["at"] = time.time()
+        return snap
+
+    def stats_since(self, snapshot: Dict[str, float]) -> Dict[str, Any]:
+        """相对 snapshot 的写入与查询次数、本地充足率、平均 / p95 查询耗时，附当前索引大小。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {
+            k: int(now[k] - snapshot.get(k, 0)) for k in ("added", "updated", "evictions", "lookups", "sufficient")
+        }
+        seconds = now["lookup_seconds"] - snapshot.get("lookup_seconds", 0.0)
+        since = snapshot.get("at", 0.0)
+        with self._lock:
+            latencies = [r["latency_ms"] for r in self.lookups if r["at"] >= since]
+        delta["sufficient_rate"] = round(delta["sufficient"] / delta["lookups"], 3) if delta["lookups"] else 0.0
+        delta["avg_lookup_ms"] = round(seconds / delta["lookups"] * 1000, 1) if delta["lookups"] else 0.0
+        delta["p95_lookup_ms"] = round(percentile(latencies, 0.95), 1)
+        delta["index"] = self.size()
+        return delta
+
+
+evidence_index = EvidenceIndex()
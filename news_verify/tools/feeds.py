@@ -0,0 +1,376 @@
+"""
+门户候选新闻的 RSS/Atom/新闻站点地图发现：有 feed 时不必渲染首页。
+
+- 发现顺序：缓存的 feed 地址 → 首页 <link rel="alternate"> → robots.txt 中的新闻 sitemap → 常见路径探测；
+  后两级是全站范围，只对站点根门户使用；栏目门户（如 /hub/technology）没有栏目 feed 时回退到页面 HTML，
+  不会悄悄换成全站新闻；
+- feed 地址按门户缓存（落盘），没有 feed 的门户也记一个较短的否定缓存，避免每轮重复探测；
+- 解析用 ElementTree.iterparse 边下载边解析，处理完的元素立即清理，条目够数即停止读取；
+- 支持 RSS 2.0 / RSS 1.0、Atom、Google 新闻 sitemap、普通 sitemap 与 sitemap 索引，
+  条目带 published（ISO 8601，UTC），按发布时间从新到旧排列。
+"""
+import datetime as dt
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR, USER_AGENT
+from news_verify.tools.canonical import canonicalize_url
+from news_verify.tools.domain_health import domain_health
+
+PORTAL_USE_FEEDS = os.getenv("PORTAL_USE_FEEDS", "1") not in ("0", "false", "off")
+# feed 至少提供这么多条目才采用，否则回退到首页 HTML
+FEED_MIN_ITEMS = int(os.getenv("FEED_MIN_ITEMS", "5"))
+FEED_MAX_ITEMS = int(os.getenv("FEED_MAX_ITEMS", "300"))
+# 普通 sitemap（非新闻 sitemap）只取最近这么多天内更新的页面
+FEED_SITEMAP_MAX_AGE_DAYS = float(os.getenv("FEED_SITEMAP_MAX_AGE_DAYS", "3"))
+FEED_LOCATION_TTL = int(os.getenv("FEED_LOCATION_TTL", str(7 * 24 * 3600)))
+FEED_NEGATIVE_TTL = int(os.getenv("FEED_NEGATIVE_TTL", str(24 * 3600)))
+
+_COMMON_FEED_PATHS = (
+    "/news-sitemap.xml", "/sitemap_news.xml", "/sitemaps/news.xml", "/news_sitemap.xml",
+    "/feed", "/rss", "/rss.xml", "/feed.xml", "/index.xml", "/atom.xml",
+)
+_ALTERNATE_RE = re.compile(r"<link\b[^>]*>", re.I)
+_ATTR_RE = re.compile(r"""([a-z-]+)\s*=\s*("([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/rdf+xml")
+_SKIP_FEED_RE = re.compile(r"comment|/podcast|/video", re.I)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def parse_timestamp(text: Optional[str]) -> Optional[float]:
+    """解析 RFC 822（RSS）或 ISO 8601（Atom/sitemap）时间，返回 UTC 时间戳；无法解析时返回 None。"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        parsed = None
+    if parsed is None:
+        iso = text.replace("Z", "+00:00").replace(" ", "T", 1)
+        iso = re.sub(r"([+-]\d{2})(\d{2})$", r"\1:\2", iso)
+        try:
+            parsed = dt.datetime.fromisoformat(iso)
+        except ValueError:
+            try:
+                parsed = dt.datetime.strptime(text[:10], "%Y-%m-%d")
+            except ValueError:
+                return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(ts: float) -> str:
+    return dt.datetime.fromtimestamp(ts, dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _title_from_url(url: str) -> str:
+    """普通 sitemap 没有标题时，用 URL 最后一段 slug 拼出标题。"""
+    slug = [s for s in urlparse(url).path.split("/") if s]
+    if not slug:
+        return ""
+    words = re.sub(r"\.[a-z]{2,5}$", "", unquote(slug[-1]), flags=re.I)
+    words = re.sub(r"[-_]+", " ", words).strip()
+    return words if len(re.findall(r"[a-z]{2,}", words, re.I)) >= 3 else ""
+
+
+def _iter_feed_entries(stream: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    流式解析 feed，逐条产出 (类型, 字段)：类型为 item（RSS/Atom/sitemap 条目）或 sitemap（索引中的子 sitemap）。
+    字段含 url、title、published（原始时间字符串）与 news（是否来自新闻 sitemap）。
+    """
+    fields: Dict[str, Any] = {}
+    depth_tags: List[str] = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        name = _local(elem.tag)
+        if event == "start":
+            depth_tags.append(name)
+            if name in ("item", "entry", "url", "sitemap"):
+                fields = {}
+            continue
+        depth_tags.pop()
+        text = (elem.text or "").strip()
+        parent = depth_tags[-1] if depth_tags else ""
+        if name in ("item", "entry", "url", "sitemap"):
+            kind = "sitemap" if name == "sitemap" else "item"
+            if fields.get("url") or fields.get("guid_url"):
+                yield kind, fields
+            fields = {}
+            elem.clear()
+        elif name == "link":
+            # Atom 用 <link href rel="alternate">，RSS 用 <link>文本</link>
+            href = elem.get("href")
+            if href and elem.get("rel", "alternate") == "alternate":
+                fields.setdefault("url", href.strip())
+            elif text and parent in ("item",):
+                fields.setdefault("url", text)
+        elif name == "loc" and parent in ("url", "sitemap"):
+            fields["url"] = text
+        elif name == "guid" and text.startswith("http") and elem.get("isPermaLink", "true") != "false":
+            fields.setdefault("guid_url", text)
+        elif name == "title" and parent in ("item", "entry", "news"):
+            fields["title"] = re.sub(r"\s+", " ", "".join(elem.itertext())).strip()
+            if parent == "news":
+                fields["news"] = True
+        elif name in ("pubdate", "published", "updated", "date", "publication_date", "lastmod", "issued"):
+            # 优先首次发布时间：published / pubDate / publication_date 覆盖 updated / lastmod
+            if name in ("pubdate", "published", "publication_date", "date", "issued") or "published" not in fields:
+                if text:
+                    fields["published"] = text
+            if name == "publication_date":
+                fields["news"] = True
+
+
+class FeedDiscovery:
+    """线程安全；fetch_items(portal_url) 返回 feed 条目，门户没有可用 feed 时返回 None。"""
+
+    def __init__(
+        self,
+        state_path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "feed_locations.json"),
+        min_items: int = FEED_MIN_ITEMS,
+        max_items: int = FEED_MAX_ITEMS,
+        connect_timeout: float = 5.0,
+    ):
+        self.state_path = Path(state_path)
+        self.min_items = min_items
+        self.max_items = max_items
+        self.connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/rss+xml,application/atom+xml,application/xml;q=0.9,text/xml;q=0.9,*/*;q=0.5",
+        })
+        self._locations: Dict[str, Dict[str, Any]] = self._load_state()
+        self.stats: Dict[str, int] = {"feed_hits": 0, "html_fallbacks": 0, "discoveries": 0, "cached_locations": 0}
+
+    # ---------- feed 地址缓存 ----------
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _remember(self, portal_url: str, feeds: List[str]) -> None:
+        with self._lock:
+            self._locations[canonicalize_url(portal_url)] = {"feeds": feeds, "checked_at": time.time()}
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.state_path, "w", encoding="utf-8") as f:
+                    json.dump(self._locations, f, ensure_ascii=False)
+            except OSError:
+                pass
+
+    def cached_locations(self, portal_url: str) -> Optional[List[str]]:
+        """缓存中的 feed 地址（[] 表示已确认没有 feed）；未缓存或已过期时返回 None。"""
+        with self._lock:
+            entry = self._locations.get(canonicalize_url(portal_url))
+        if not entry:
+            return None
+        feeds = list(entry.get("feeds") or [])
+        ttl = FEED_LOCATION_TTL if feeds else FEED_NEGATIVE_TTL
+        if time.time() - float(entry.get("checked_at", 0)) > ttl:
+            return None
+        return feeds
+
+    # ---------- 下载与解析 ----------
+    def _get(self, url: str, stream: bool = False) -> requests.Response:
+        timeout = (self.connect_timeout, domain_health.timeout_for(url, "http"))
+        resp = self._session.get(url, timeout=timeout, allow_redirects=True, stream=stream)
+        if resp.status_code != 200:
+            resp.close()
+            raise requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
+        return resp
+
+    def parse_feed(self, feed_url: str, _depth: int = 0) -> List[Dict[str, Any]]:
+        """下载并流式解析一个 feed/sitemap，返回条目 [{title, url, published?}]。"""
+        try:
+            resp = self._get(feed_url, stream=True)
+        except requests.RequestException:
+            return []
+        items: List[Dict[str, Any]] = []
+        children: List[Tuple[str, Optional[float]]] = []
+        try:
+            resp.raw.decode_content = True
+            for kind, fields in _iter_feed_entries(resp.raw):
+                if kind == "sitemap":
+                    children.append((fields["url"], parse_timestamp(fields.get("published"))))
+                    continue
+                items.append(fields)
+                if len(items) >= self.max_items:
+                    break
+        except (ET.ParseError, requests.RequestException, OSError):
+            pass
+        finally:
+            resp.close()
+
+        if children and _depth == 0:
+            return self._parse_sitemap_index(children)
+        return self._normalize(feed_url, items)
+
+    def _parse_sitemap_index(self, children: List[Tuple[str, Optional[float]]]) -> List[Dict[str, Any]]:
+        """sitemap 索引：优先新闻子 sitemap，否则取最近更新的两个。"""
+        news = [u for u, _ in children if "news" in u.lower()]
+        if not news:
+            news = [u for u, _ in sorted(children, key=lambda c: -(c[1] or 0))[:2]]
+        items: List[Dict[str, Any]] = []
+        for child in news[:3]:
+            items.extend(self.parse_feed(child, _depth=1))
+            if len(items) >= self.max_items:
+                break
+        return items[: self.max_items]
+
+    def _normalize(self, feed_url: str, raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        is_news_sitemap = any(it.get("news") for it in raw_items)
+        cutoff = time.time() - FEED_SITEMAP_MAX_AGE_DAYS * 24 * 3600
+        items: List[Dict[str, Any]] = []
+        for it in raw_items:
+            url = urljoin(feed_url, it.get("url") or it.get("guid_url") or "")
+            if not url.startswith("http"):
+                continue
+            ts = parse_timestamp(it.get("published"))
+            title = it.get("title") or ""
+            if not title:
+                # 普通 sitemap：只要近期更新的页面，标题从 URL 推出
+                if is_news_sitemap or ts is None or ts < cutoff:
+                    continue
+                title = _title_from_url(url)
+            if len(title) < 3:
+                continue
+            item: Dict[str, Any] = {"title": title[:200], "url": url}
+            if ts is not None:
+                item["published"] = _iso(ts)
+            items.append(item)
+        return items
+
+    # ---------- 发现 ----------
+    def _alternate_links(self, portal_url: str) -> List[str]:
+        try:
+            resp = self._get(portal_url, stream=True)
+        except requests.RequestException:
+            return []
+        try:
+            # 只读到 </head> 附近，<link rel="alternate"> 都在头部
+            head = b""
+            for chunk in resp.iter_content(16384):
+                head += chunk
+                if b"</head>" in head.lower() or len(head) > 512 * 1024:
+                    break
+        except (requests.RequestException, OSError):
+            return []
+        finally:
+            resp.close()
+        text = head.decode(resp.encoding or "utf-8", errors="replace")
+        feeds = []
+        for tag in _ALTERNATE_RE.findall(text):
+            attrs = {m.group(1).lower(): m.group(3) or m.group(4) or m.group(5) or "" for m in _ATTR_RE.finditer(tag)}
+            if "alternate" in attrs.get("rel", "").lower() and attrs.get("type", "").lower() in _FEED_TYPES:
+                href = urljoin(resp.url, attrs.get("href", ""))
+                if href.startswith("http") and not _SKIP_FEED_RE.search(href):
+                    feeds.append(href)
+        return list(dict.fromkeys(feeds))
+
+    def _robots_sitemaps(self, origin: str) -> List[str]:
+        try:
+            resp = self._get(origin + "/robots.txt")
+            text = resp.text
+            resp.close()
+        except requests.RequestException:
+            return []
+        sitemaps = re.findall(r"(?im)^\s*sitemap:\s*(\S+)", text)
+        return [s for s in dict.fromkeys(sitemaps) if "news" in s.lower()]
+
+    def _first_usable(self, candidates: List[str], max_sources: int = 3) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """并行解析候选 feed，按候选顺序取前几个可用的，合并其条目。"""
+        candidates = list(dict.fromkeys(candidates))
+        if not candidates:
+            return [], []
+        with ThreadPoolExecutor(max_workers=min(4, len(candidates))) as executor:
+            parsed = list(executor.map(self.parse_feed, candidates))
+        used: List[str] = []
+        merged: List[Dict[str, Any]] = []
+        for url, items in zip(candidates, parsed):
+            if len(items) >= self.min_items:
+                used.append(url)
+                merged.extend(items)
+                if len(used) >= max_sources:
+                    break
+        return used, merged
+
+    def discover(self, portal_url: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """不看缓存，逐级探测门户的 feed；返回 (feed 地址, 条目)。"""
+        parsed = urlparse(portal_url)
+        origin = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+        stages = [lambda: self._alternate_links(portal_url)]
+        if parsed.path.strip("/") == "":
+            # robots.txt 与常见路径给出的是全站 feed，用在栏目门户上会把候选换成全站新闻
+            stages += [
+                lambda: self._robots_sitemaps(origin),
+                lambda: [origin + p for p in _COMMON_FEED_PATHS],
+            ]
+        for stage in stages:
+            feeds, items = self._first_usable(stage())
+            if feeds:
+                return feeds, items
+        return [], []
+
+    def fetch_items(self, portal_url: str) -> Optional[Dict[str, Any]]:
+        """返回 {"feeds": [...], "items": [...]}（条目按发布时间从新到旧）；门户没有可用 feed 时返回 None。"""
+        cached = self.cached_locations(portal_url)
+        feeds: List[str] = []
+        items: List[Dict[str, Any]] = []
+        if cached:
+            feeds, items = self._first_usable(cached)
+            if feeds:
+                self._count("cached_locations")
+        if cached is None or (cached and not feeds):
+            # 未缓存，或缓存的 feed 已失效：重新探测并记住结果（包括“没有 feed”）
+            self._count("discoveries")
+            feeds, items = self.discover(portal_url)
+            self._remember(portal_url, feeds)
+        if not feeds:
+            self._count("html_fallbacks")
+            return None
+        self._count("feed_hits")
+        seen = set()
+        unique = []
+        for it in items:
+            key = canonicalize_url(it["url"])
+            if key not in seen:
+                seen.add(key)
+                unique.append(it)
+        # ISO 8601 UTC 字符串可直接按字典序比较；没有发布时间的条目排在最后，保持原顺序
+        unique.sort(key=lambda it: it.get("published", ""), reverse=True)
+        return {"feeds": feeds, "items": unique[: self.max_items]}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+feed_discovery = FeedDiscovery()
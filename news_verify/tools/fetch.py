@@ -0,0 +1,307 @@
+"""
+两级抓取：先用长连接 HTTP 客户端直接 GET，内容不合格时才升级到无头浏览器（Crawl4AI 浏览器池）。
+
+- 内容判定：正文足够长（门户则链接足够多），且不是 JS 空壳或同意/订阅墙页面；
+- 内容不合格（JS 空壳、同意墙、正文过短等）的域名会被记住（落盘，带过期时间），之后直接走浏览器；
+  HTTP 请求本身失败（超时、5xx、404 等）只对该 URL 改用浏览器，不影响同站其它页面；
+- stats 记录每一级的次数、成功数与累计耗时，可算出各级平均延迟与 HTTP 命中率；
+- 每级超时按站点延迟历史自适应（tools/domain_health.py），文章页所在站点连续失败被隔离时直接报错跳过。
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup, Comment, NavigableString
+from requests.adapters import HTTPAdapter
+from crawl4ai.async_configs import CrawlerRunConfig
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR, USER_AGENT
+from news_verify.tools.browser_pool import get_crawler_pool
+from news_verify.tools.domain_health import domain_health
+
+FETCH_HTTP_FIRST = os.getenv("FETCH_HTTP_FIRST", "1") not in ("0", "false", "off")
+FETCH_MIN_TEXT_CHARS = int(os.getenv("FETCH_MIN_TEXT_CHARS", "800"))
+FETCH_MIN_PORTAL_LINKS = int(os.getenv("FETCH_MIN_PORTAL_LINKS", "30"))
+# 被判定需要浏览器的域名记多久（秒），过期后重新尝试 HTTP
+FETCH_BROWSER_DOMAIN_TTL = int(os.getenv("FETCH_BROWSER_DOMAIN_TTL", str(24 * 3600)))
+
+_JS_SHELL_RE = re.compile(
+    r"(enable javascript|javascript is (?:disabled|required)|you need to enable javascript|"
+    r"please turn on javascript|checking your browser|just a moment\.\.\.)",
+    re.I,
+)
+_WALL_RE = re.compile(
+    r"(consent\.|/consent|cookie consent|we value your privacy|before you continue|"
+    r"subscribe to continue|subscribe to read|access denied|are you a robot|captcha)",
+    re.I,
+)
+
+
+def _browser_run_config() -> CrawlerRunConfig:
+    return CrawlerRunConfig(page_timeout=90_000, wait_until="commit")
+
+
+def html_to_markdown(html: str, base_url: str = "") -> Tuple[str, str, Dict[str, Any]]:
+    """把静态 HTML 转成简洁 markdown，返回 (markdown, title, metadata)。"""
+    soup = BeautifulSoup(html or "", "html.parser")
+    metadata: Dict[str, Any] = {}
+    for m in soup.find_all("meta"):
+        key = m.get("property") or m.get("name")
+        if key and m.get("content"):
+            metadata[key.lower()] = m["content"]
+    title = metadata.get("og:title") or (soup.title.get_text(strip=True) if soup.title else "")
+    metadata.setdefault("title", title)
+    for tag in soup(["script", "style", "noscript", "template", "svg", "iframe"]):
+        tag.decompose()
+
+    lines = []
+    for el in soup.find_all(["h1", "h2", "h3", "h4", "p", "li", "blockquote"]):
+        if el.find_parent(["p", "li", "blockquote"]):
+            continue
+        parts = []
+        for node in el.descendants:
+            if getattr(node, "name", None) == "a" and node.get("href"):
+                text = node.get_text(" ", strip=True)
+                if text:
+                    parts.append(f"[{text}]({urljoin(base_url, node['href'])})")
+            elif isinstance(node, NavigableString) and not isinstance(node, Comment) and not node.find_parent("a"):
+                parts.append(node)
+        text = re.sub(r"\s+", " ", "".join(parts)).strip()
+        if not text:
+            continue
+        if el.name in ("h1", "h2", "h3", "h4"):
+            lines.append("#" * int(el.name[1]) + " " + text)
+        elif el.name == "li":
+            lines.append("- " + text)
+        elif el.name == "blockquote":
+            lines.append("> " + text)
+        else:
+            lines.append(text)
+    return "\n\n".join(lines), title, metadata
+
+
+def looks_blocked(text: str) -> bool:
+    """文本是否像 JS 空壳、同意墙或付费墙提示。"""
+    return bool(_JS_SHELL_RE.search(text or "") or _WALL_RE.search(text or ""))
+
+
+def _visible_text_length(markdown: str) -> int:
+    return len(re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", markdown or ""))
+
+
+def looks_like_content(kind: str, html: str, markdown: str, final_url: str = "") -> Tuple[bool, str]:
+    """判断 HTTP 直取结果是否可用；返回 (是否合格, 原因)。"""
+    if _WALL_RE.search(final_url or ""):
+        return False, "consent_or_paywall_url"
+    if kind == "portal":
+        links = len(re.findall(r"<a\s[^>]*href=", html or "", re.I))
+        if links < FETCH_MIN_PORTAL_LINKS:
+            return False, f"too_few_links({links})"
+        return True, "ok"
+    text_len = _visible_text_length(markdown)
+    if text_len < FETCH_MIN_TEXT_CHARS:
+        if _JS_SHELL_RE.search(html or ""):
+            return False, "js_shell"
+        if _WALL_RE.search(markdown or ""):
+            return False, "consent_or_paywall"
+        return False, f"too_short({text_len})"
+    return True, "ok"
+
+
+class TieredFetcher:
+    """HTTP 优先、浏览器兜底的抓取器；fetch() 须在浏览器池事件循环中 await。"""
+
+    def __init__(
+        self,
+        http_first: bool = FETCH_HTTP_FIRST,
+        state_path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "browser_domains.json"),
+        connect_timeout: float = 5.0,
+        browser_grace: float = 15.0,
+    ):
+        self.http_first = http_first
+        self.connect_timeout = connect_timeout
+        # page_timeout 之外再留的余量：浏览器卡死时由 asyncio 超时强制中止
+        self.browser_grace = browser_grace
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9,zh-CN;q=0.8",
+        })
+        self._browser_domains: Dict[str, float] = self._load_state()
+        self.stats: Dict[str, Dict[str, float]] = {
+            tier: {"requests": 0, "ok": 0, "seconds": 0.0} for tier in ("http", "browser")
+        }
+        self.escalations: Dict[str, int] = {}
+
+    # ---------- 需要浏览器的域名 ----------
+    def _load_state(self) -> Dict[str, float]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: float(v) for k, v in data.items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_state(self) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(self._browser_domains, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _domain_key(url: str, kind: str) -> str:
+        # 门户首页与文章页分开记：首页需要渲染不代表文章页也需要
+        return f"{kind}:{(urlparse(url).hostname or '').lower()}"
+
+    def needs_browser(self, url: str, kind: str) -> bool:
+        key = self._domain_key(url, kind)
+        with self._lock:
+            marked_at = self._browser_domains.get(key)
+            if marked_at is None:
+                return False
+            if time.time() - marked_at > FETCH_BROWSER_DOMAIN_TTL:
+                del self._browser_domains[key]
+                return False
+            return True
+
+    def mark_browser(self, url: str, kind: str, reason: str) -> None:
+        with self._lock:
+            self._browser_domains[self._domain_key(url, kind)] = time.time()
+            self._save_state()
+
+    def _escalate(self, url: str, kind: str, reason: str) -> None:
+        """记录一次升级；只有内容判定不合格才标记整个站点，请求失败可能是瞬时的或单个死链。"""
+        key = reason.split("(")[0]
+        with self._lock:
+            self.escalations[key] = self.escalations.get(key, 0) + 1
+        if key != "http_error":
+            self.mark_browser(url, kind, reason)
+
+    def _record(self, tier: str, ok: bool, seconds: float) -> None:
+        with self._lock:
+            s = self.stats[tier]
+            s["requests"] += 1
+            s["ok"] += 1 if ok else 0
+            s["seconds"] += seconds
+
+    # ---------- 两级抓取 ----------
+    def _http_get(self, url: str) -> Tuple[str, str, Dict[str, Any]]:
+        timeout = (self.connect_timeout, domain_health.timeout_for(url, "http"))
+        resp = self._session.get(url, timeout=timeout, allow_redirects=True)
+        try:
+            resp.raise_for_status()
+            ctype = resp.headers.get("Content-Type", "")
+            if "html" not in ctype and "xml" not in ctype:
+                raise ValueError(f"unexpected content type {ctype!r}")
+            return resp.text, resp.url, dict(resp.headers)
+        finally:
+            resp.close()
+
+    async def _fetch_http(self, url: str, kind: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        t0 = time.perf_counter()
+        try:
+            html, final_url, headers = await asyncio.to_thread(self._http_get, url)
+        except Exception as e:
+            self._record("http", False, time.perf_counter() - t0)
+            return None, f"http_error({type(e).__name__})"
+        markdown, title, metadata = ("", "", {}) if kind == "portal" else html_to_markdown(html, final_url)
+        ok, reason = looks_like_content(kind, html, markdown, final_url)
+        elapsed = time.perf_counter() - t0
+        self._record("http", ok, elapsed)
+        if not ok:
+            return None, reason
+        domain_health.record(url, "http", elapsed, True)
+        return {"html": html, "markdown": markdown, "title": title, "metadata": metadata,
+                "response_headers": headers, "tier": "http"}, reason
+
+    async def _fetch_browser(self, url: str, run_config: Optional[CrawlerRunConfig]) -> Dict[str, Any]:
+        timeout = domain_health.timeout_for(url, "browser")
+        config = (run_config or _browser_run_config()).clone(page_timeout=int(timeout * 1000))
+        t0 = time.perf_counter()
+        ok = False
+        timed_out = False
+        cancelled = False
+        try:
+            try:
+                r = await asyncio.wait_for(get_crawler_pool().arun(url, config), timeout + self.browser_grace)
+            except asyncio.TimeoutError:
+                timed_out = True
+                raise TimeoutError(f"browser crawl exceeded {timeout + self.browser_grace:.0f}s")
+            if r is None:
+                raise RuntimeError("crawler returned None")
+            ok = bool(getattr(r, "success", True))
+            if not ok:
+                timed_out = "timeout" in str(getattr(r, "error_message", "") or "").lower()
+            meta = getattr(r, "metadata", None)
+            return {
+                "html": getattr(r, "html", None) or "",
+                "markdown": getattr(r, "markdown", None) or "",
+                "title": (meta.get("title", "") or "") if isinstance(meta, dict) else "",
+                "metadata": meta if isinstance(meta, dict) else {},
+                "response_headers": getattr(r, "response_headers", None),
+                "tier": "browser",
+            }
+        except asyncio.CancelledError:
+            # 调用方取消（如按预算抓取提前结束）不算站点失败
+            cancelled = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._record("browser", ok, elapsed)
+            if not cancelled:
+                domain_health.record(url, "browser", elapsed, ok, timed_out)
+
+    async def fetch(self, url: str, kind: str, run_config: Optional[CrawlerRunConfig] = None) -> Dict[str, Any]:
+        """抓取单页，返回 html/markdown/title/metadata/response_headers/tier；浏览器失败或站点被隔离时抛异常。"""
+        if kind == "article":
+            until = domain_health.quarantined_until(url)
+            if until is not None:
+                until_str = time.strftime("%H:%M", time.localtime(until))
+                raise RuntimeError(f"domain quarantined after repeated failures (until {until_str})")
+        if self.http_first and not self.needs_browser(url, kind):
+            page, reason = await self._fetch_http(url, kind)
+            if page is not None:
+                return page
+            self._escalate(url, kind, reason)
+        return await self._fetch_browser(url, run_config)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snap = {tier: dict(s) for tier, s in self.stats.items()}
+            snap["escalations"] = dict(self.escalations)
+            return snap
+
+    def stats_since(self, snapshot: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """相对 snapshot 的各级请求数、成功数、平均延迟、HTTP 命中率与按原因的升级次数。"""
+        now = self.snapshot()
+        out: Dict[str, Any] = {}
+        for tier in ("http", "browser"):
+            s, base = now[tier], snapshot.get(tier, {})
+            n = s["requests"] - base.get("requests", 0)
+            ok = s["ok"] - base.get("ok", 0)
+            secs = s["seconds"] - base.get("seconds", 0.0)
+            out[tier] = {"requests": int(n), "ok": int(ok), "avg_ms": round(secs / n * 1000) if n else 0}
+        pages = out["http"]["ok"] + out["browser"]["requests"]
+        out["http_hit_rate"] = round(out["http"]["ok"] / pages, 3) if pages else 0.0
+        base = snapshot.get("escalations", {})
+        escalations = {k: n - base.get(k, 0) for k, n in now["escalations"].items()}
+        out["escalations"] = {k: n for k, n in escalations.items() if n}
+        return out
+
+
+tiered_fetcher = TieredFetcher()
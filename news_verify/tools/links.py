@@ -0,0 +1,170 @@
+"""
+门户首页链接抽取：流式 tokenizer，只物化 <a> 锚点，不构建整棵 DOM。
+
+结果与原 BeautifulSoup(html, "html.parser") 遍历 <a> 的实现一致：
+- 同样基于 html.parser 的词法切分，锚点文本等价于 a.get_text(strip=True)（各文本节点 strip 后拼接）；
+- 维护开放标签栈并按 html.parser 树构建的规则闭合（结束标签弹出到最近的同名标签，空元素不入栈），
+  因此未闭合、嵌套的 <a> 与原实现取到相同文本；
+- 过滤规则改为预编译正则，并对重复 URL 只判定一次。
+"""
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+# html.parser 树构建器视为空元素（不入栈）的标签
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+})
+# 其内文本不计入 get_text 的标签（bs4 为其使用 Script/Stylesheet/TemplateString 等特殊字符串类型）
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+_SKIP_PATH_RE = re.compile(r"/login|/signup|/tag/|/author/|/subscribe")
+_ARTICLE_PATH_RE = re.compile(r"/article|/news|/story|/202|detail")
+
+
+class _Anchor:
+    __slots__ = ("href", "parts")
+
+    def __init__(self, href: str):
+        self.href = href
+        self.parts: List[str] = []
+
+
+class _AnchorTokenizer(HTMLParser):
+    """只记录 <a href> 锚点及其文本；其余标签只维护名字栈。"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.anchors: List[_Anchor] = []
+        self._stack: List[Tuple[str, Optional[_Anchor]]] = []
+        self._open_anchors: List[_Anchor] = []
+        self._in_raw = 0
+        self._pending: List[str] = []
+        # 与 bs4 一致：<br> 这类空元素开始时即闭合，随后出现的 </br> 被吞掉且不切断文本节点
+        self._closed_void: List[str] = []
+
+    def _flush(self) -> None:
+        """结束当前文本节点（bs4 在每个标签/注释事件处切分 NavigableString）。"""
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending = []
+        if text and self._open_anchors and not self._in_raw:
+            for anchor in self._open_anchors:
+                anchor.parts.append(text)
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag in _VOID_TAGS:
+            self._closed_void.append(tag)
+            return
+        self._push(tag, attrs)
+
+    def _push(self, tag: str, attrs) -> None:
+        anchor = None
+        if tag == "a":
+            href = None
+            for k, v in attrs:
+                if k == "href":
+                    href = v if v is not None else ""
+            if href is not None:
+                anchor = _Anchor(href)
+                self.anchors.append(anchor)
+                self._open_anchors.append(anchor)
+        elif tag in _NON_TEXT_TAGS:
+            self._in_raw += 1
+        self._stack.append((tag, anchor))
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag not in _VOID_TAGS:
+            self._push(tag, attrs)
+            self._pop_to(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        self._flush()
+        self._pop_to(tag)
+
+    def _pop_to(self, tag: str) -> None:
+        stack = self._stack
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(stack) > i:
+            name, anchor = stack.pop()
+            if anchor is not None:
+                self._open_anchors.remove(anchor)
+            elif name in _NON_TEXT_TAGS:
+                self._in_raw -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._open_anchors:
+            self._pending.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def iter_anchors(html: str) -> List[Tuple[str, str]]:
+    """按文档顺序返回 (href, 文本) 列表，文本等价于 BeautifulSoup 的 a.get_text(strip=True)。"""
+    tokenizer = _AnchorTokenizer()
+    tokenizer.feed(html or "")
+    tokenizer.close()
+    return [((a.href or "").strip(), "".join(a.parts)) for a in tokenizer.anchors]
+
+
+def _is_article_path(path: str) -> bool:
+    if _ARTICLE_PATH_RE.search(path):
+        return True
+    if len(path) > 15 and ("/" in path[1:] or path.count("-") >= 2):
+        return True
+    return len(path) > 8 and sum(1 for s in path.split("/") if s) >= 2
+
+
+def extract_portal_items(html: str, portal_url: str) -> List[Dict[str, str]]:
+    """从门户首页 HTML 抽取候选新闻 [{title, url}]，规则与顺序与原实现一致。"""
+    portal_root = portal_url.rstrip("/")
+    seen: set = set()
+    rejected: set = set()
+    items: List[Dict[str, str]] = []
+
+    for href, text in iter_anchors(html):
+        if not text or len(text) < 3:
+            continue
+        full_url = href
+        if full_url.startswith("//"):
+            full_url = "https:" + full_url
+        elif full_url.startswith("/"):
+            full_url = urljoin(portal_url, full_url)
+        if full_url in seen or full_url in rejected:
+            continue
+        if not full_url.startswith("http") or full_url.rstrip("/") == portal_root:
+            rejected.add(full_url)
+            continue
+        path = (urlparse(full_url).path or "").lower()
+        if _SKIP_PATH_RE.search(path) or not _is_article_path(path):
+            rejected.add(full_url)
+            continue
+        seen.add(full_url)
+        items.append({"title": text[:200], "url": full_url})
+    return items
@@ -0,0 +1,119 @@
+"""
+近似重复查询合并：一轮运行中各声明的查询常只是措辞不同（“Fed raises rates 25 basis points” /
+“Fed raised interest rates by 25 basis points”），合并后只搜索代表查询，结果映射回每个提出它的声明。
+
+- 相似度为实词集合的 Jaccard：NFKC、小写、去标点与英文虚词，词尾做极简的复数 / 过去式归一；
+- 按计划顺序贪心聚类：与已有代表查询的最高相似度达到 QUERY_DEDUPE_THRESHOLD（默认 0.7）即并入，否则成为新代表；
+- 含引号或搜索运算符（site:、-词、OR 等）的查询意图明确，只与规范化后完全相同的查询合并；
+- 一个 QueryDeduper 覆盖一轮运行：后面文章的查询也能复用前面文章已成功的代表查询结果；
+  stats 记录计划查询数、代表查询数、合并数、复用数与实际执行数。QUERY_DEDUPE=0 时只合并规范化后相同的查询。
+"""
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from news_verify.tools.common import SEARCH_OPERATOR_RE
+from news_verify.tools.search_cache import normalize_query
+
+QUERY_DEDUPE_ENABLED = os.getenv("QUERY_DEDUPE", "1") not in ("0", "false", "off")
+QUERY_DEDUPE_THRESHOLD = float(os.getenv("QUERY_DEDUPE_THRESHOLD", "0.7"))
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the this to was were will with "
+    "about after against amid over under news latest report reports says said".split()
+)
+
+
+def _stem(word: str) -> str:
+    """极简词尾归一：复数、-ed、-ing；不追求语言学正确，只求把常见改写对齐。"""
+    if word.isascii() and len(word) > 3:
+        for suffix in ("ing", "ed", "es", "s"):
+            if word.endswith(suffix) and not word.endswith("ss") and len(word) - len(suffix) >= 3:
+                return word[: -len(suffix)]
+    return word
+
+
+def query_terms(query: str) -> FrozenSet[str]:
+    """查询的实词集合（相似度计算用）；全是虚词时退回全部词。"""
+    words = _WORD_RE.findall(unicodedata.normalize("NFKC", query or "").lower())
+    terms = frozenset(_stem(w) for w in words if w not in _STOPWORDS)
+    return terms or frozenset(words)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class QueryDeduper:
+    """线程安全；assign() 把查询映射到代表查询，results 保存本轮已成功的代表查询结果供复用。"""
+
+    def __init__(self, threshold: float = QUERY_DEDUPE_THRESHOLD, enabled: bool = QUERY_DEDUPE_ENABLED):
+        self.threshold = threshold
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # (代表查询, 实词集合, 是否含运算符)
+        self._representatives: List[Tuple[str, FrozenSet[str], bool]] = []
+        self._exact: Dict[str, str] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {"planned": 0, "representatives": 0, "merged": 0, "reused": 0, "executed": 0}
+
+    def _match_locked(self, query: str) -> Optional[str]:
+        key = normalize_query(query)
+        if key in self._exact:
+            return self._exact[key]
+        if not self.enabled or SEARCH_OPERATOR_RE.search(query):
+            return None
+        terms = query_terms(query)
+        best, best_score = None, 0.0
+        for rep, rep_terms, rep_operators in self._representatives:
+            if rep_operators:
+                continue
+            score = jaccard(terms, rep_terms)
+            if score > best_score:
+                best, best_score = rep, score
+        return best if best_score >= self.threshold else None
+
+    def assign(self, queries: List[str]) -> Dict[str, str]:
+        """按顺序为每个查询找到代表查询（自己是代表时映射到自己）；计入 stats。"""
+        mapping: Dict[str, str] = {}
+        with self._lock:
+            for query in queries:
+                self.stats["planned"] += 1
+                rep = self._match_locked(query)
+                if rep is None:
+                    rep = query
+                    self._representatives.append((query, query_terms(query), bool(SEARCH_OPERATOR_RE.search(query))))
+                    self.stats["representatives"] += 1
+                elif rep != query:
+                    self.stats["merged"] += 1
+                self._exact.setdefault(normalize_query(query), rep)
+                mapping[query] = rep
+        return mapping
+
+    def cached(self, representative: str) -> Optional[Dict[str, Any]]:
+        """本轮前面的计划已成功执行过该代表查询时返回其结果，并计为一次复用。"""
+        with self._lock:
+            result = self.results.get(representative)
+            if result is not None:
+                self.stats["reused"] += 1
+            return result
+
+    def record(self, representative: str, result: Dict[str, Any]) -> None:
+        """记录一次实际执行；成功结果留给本轮后续计划复用。"""
+        with self._lock:
+            self.stats["executed"] += 1
+            if result.get("ok"):
+                self.results[representative] = result
+
+    def report(self) -> Dict[str, Any]:
+        """本轮累计：计划查询数、代表查询数、近似合并数、跨计划复用数、实际执行数与避免的请求数。"""
+        with self._lock:
+            out: Dict[str, Any] = dict(self.stats)
+        out["requests_avoided"] = out["planned"] - out["executed"]
+        out["threshold"] = self.threshold
+        return out
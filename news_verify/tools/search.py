@@ -0,0 +1,244 @@
+"""
+可替换的搜索后端：SearchBackend 负责连接池、超时重试、缓存与统计，子类只实现请求与结果解析。
+
+- SerperClient：Serper API（SERPER_URL）；LocalSearchBackend：本地替身服务（tools/search_local.py，SEARCH_LOCAL_URL），
+  用于离线运行、压测与调并发，不消耗 API 配额；SEARCH_BACKEND（serper / local）选择进程级的 search_backend；
+- 所有请求共享一个 requests.Session（keep-alive 连接池），连接/读超时显式设置，不会无限挂起；
+- 连接错误、429 与 5xx 由 urllib3 Retry 有限次重试（指数退避，遵守 Retry-After）；
+- 每次查询记录耗时与 HTTP 状态，stats 汇总请求数、失败数、耗时与状态码分布，供单次运行做增量统计；
+- 真实后端的成功结果写入搜索缓存（tools/search_cache.py，规范化后相同的查询直接返回缓存，结果带 cached 标记）
+  与本地证据索引（tools/evidence_index.py）；本地替身的假结果两者都不写。
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from news_verify.tools.common import percentile
+from news_verify.tools.evidence_index import evidence_index
+from news_verify.tools.search_cache import search_cache
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "serper").strip().lower()
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
+SEARCH_LOCAL_URL = os.getenv("SEARCH_LOCAL_URL", "http://127.0.0.1:8765/search")
+SEARCH_POOL_SIZE = int(os.getenv("SEARCH_POOL_SIZE", "16"))
+SEARCH_CONNECT_TIMEOUT = float(os.getenv("SEARCH_CONNECT_TIMEOUT", "5"))
+SEARCH_READ_TIMEOUT = float(os.getenv("SEARCH_READ_TIMEOUT", "15"))
+SEARCH_MAX_RETRIES = int(os.getenv("SEARCH_MAX_RETRIES", "2"))
+
+
+class SearchBackend(ABC):
+    """线程安全；search() 返回 ok、status、results（title/link/snippet）、error、latency_ms 与 cached。"""
+
+    name = "base"
+    # 是否需要 SERPER_API_KEY 之类的密钥
+    requires_api_key = False
+    # 结果是否写入持久化搜索缓存与本地证据索引（假数据后端必须为 False）
+    persist_results = True
+
+    def __init__(self, url: str, history: int = 1000):
+        self.url = url
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self.calls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.stats: Dict[str, Any] = {"requests": 0, "errors": 0, "seconds": 0.0, "statuses": {}}
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                retry = Retry(
+                    total=SEARCH_MAX_RETRIES,
+                    connect=SEARCH_MAX_RETRIES,
+                    read=SEARCH_MAX_RETRIES,
+                    status=SEARCH_MAX_RETRIES,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=SEARCH_POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                self._session = session
+            return self._session
+
+    # ---------- 子类实现 ----------
+    @abstractmethod
+    def _send(self, query: str, num: int, api_key: Optional[str]) -> requests.Response:
+        """发出一次搜索请求（使用 self.session 与显式超时）。"""
+
+    @abstractmethod
+    def _parse(self, data: Dict[str, Any], num: int) -> List[Dict[str, str]]:
+        """把响应 JSON 转成 title / link / snippet 列表。"""
+
+    def _api_key(self, api_key: Optional[str]) -> Optional[str]:
+        return api_key
+
+    # ---------- 公共流程 ----------
+    def _record(self, query: str, status: Optional[int], seconds: float, error: Optional[str]) -> Dict[str, Any]:
+        record = {
+            "query": query,
+            "status": status,
+            "latency_ms": round(seconds * 1000),
+            "error": error,
+            "at": time.time(),
+        }
+        key = str(status) if status is not None else "exception"
+        with self._lock:
+            self.calls.append(record)
+            self.stats["requests"] += 1
+            self.stats["errors"] += 1 if error else 0
+            self.stats["seconds"] += seconds
+            self.stats["statuses"][key] = self.stats["statuses"].get(key, 0) + 1
+        return record
+
+    @staticmethod
+    def _result(
+        status: Optional[int], results: List[Dict[str, str]], error: Optional[str], latency_ms: int, cached: bool = False
+    ) -> Dict[str, Any]:
+        return {
+            "ok": error is None, "status": status, "results": results, "error": error,
+            "latency_ms": latency_ms, "cached": cached,
+        }
+
+    def search(
+        self, query: str, num_results: int = 10, api_key: Optional[str] = None, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """执行一次搜索；use_cache 时先查搜索缓存。不抛异常，失败时 ok 为 False 并带 error。"""
+        num = max(1, min(num_results, 100))
+        use_cache = use_cache and self.persist_results
+        if use_cache:
+            hit = search_cache.get(query, num)
+            if hit is not None:
+                return self._result(200, hit["results"], None, 0, cached=True)
+        api_key = self._api_key(api_key)
+        if self.requires_api_key and not api_key:
+            return self._result(None, [], "SERPER_API_KEY environment variable is not set", 0)
+        t0 = time.perf_counter()
+        try:
+            response = self._send(query, num, api_key)
+        except requests.RequestException as e:
+            record = self._record(query, None, time.perf_counter() - t0, f"{type(e).__name__}: {e}")
+            return self._result(None, [], record["error"], record["latency_ms"])
+        seconds = time.perf_counter() - t0
+        if response.status_code != 200:
+            error = f"API request failed with status {response.status_code}: {response.text[:500]}"
+            record = self._record(query, response.status_code, seconds, error)
+            return self._result(response.status_code, [], error, record["latency_ms"])
+        try:
+            results = self._parse(response.json(), num)
+        except (ValueError, TypeError, AttributeError) as e:
+            record = self._record(query, 200, seconds, f"invalid JSON: {e}")
+            return self._result(200, [], record["error"], record["latency_ms"])
+        record = self._record(query, 200, seconds, None)
+        if use_cache:
+            search_cache.put(query, num, results, record["latency_ms"])
+        if self.persist_results:
+            evidence_index.add_search_results(results)
+        return self._result(200, results, None, record["latency_ms"])
+
+    # ---------- 统计 ----------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snap = dict(self.stats)
+            snap["statuses"] = dict(self.stats["statuses"])
+            snap["at"] = time.time()
+            return snap
+
+    def stats_since(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """相对 snapshot 的请求数、失败数、平均 / p95 耗时与状态码分布，附后端名称。"""
+        now = self.snapshot()
+        requests_ = now["requests"] - snapshot.get("requests", 0)
+        seconds = now["seconds"] - snapshot.get("seconds", 0.0)
+        before = snapshot.get("statuses", {})
+        statuses = {k: v - before.get(k, 0) for k, v in now["statuses"].items() if v - before.get(k, 0)}
+        since = snapshot.get("at", 0.0)
+        with self._lock:
+            latencies = [c["latency_ms"] for c in self.calls if c["at"] >= since]
+        return {
+            "backend": self.name,
+            "requests": requests_,
+            "errors": now["errors"] - snapshot.get("errors", 0),
+            "avg_latency_ms": round(seconds / requests_ * 1000) if requests_ else 0,
+            "p95_latency_ms": round(percentile(latencies, 0.95)),
+            "statuses": statuses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+class SerperClient(SearchBackend):
+    """Serper API：POST {"q", "num"}，密钥放在 X-API-KEY 头，结果在 organic 字段。"""
+
+    name = "serper"
+    requires_api_key = True
+
+    def __init__(self, url: str = SERPER_URL, history: int = 1000):
+        super().__init__(url, history)
+
+    def _api_key(self, api_key: Optional[str]) -> Optional[str]:
+        return api_key or os.getenv("SERPER_API_KEY")
+
+    def _send(self, query: str, num: int, api_key: Optional[str]) -> requests.Response:
+        return self.session.post(
+            self.url,
+            json={"q": query, "num": num},
+            headers={"X-API-KEY": api_key or ""},
+            timeout=(SEARCH_CONNECT_TIMEOUT, SEARCH_READ_TIMEOUT),
+        )
+
+    def _parse(self, data: Dict[str, Any], num: int) -> List[Dict[str, str]]:
+        return [
+            {"title": item.get("title", ""), "link": item.get("link", ""), "snippet": item.get("snippet", "")}
+            for item in (data.get("organic") or [])[:num]
+        ]
+
+
+class LocalSearchBackend(SearchBackend):
+    """本地替身服务（tools/search_local.py）：GET ?q=&num=，结果在 results 字段；不需要密钥，结果不落缓存与证据索引。"""
+
+    name = "local"
+    persist_results = False
+
+    def __init__(self, url: str = SEARCH_LOCAL_URL, history: int = 1000):
+        super().__init__(url, history)
+
+    def _send(self, query: str, num: int, api_key: Optional[str]) -> requests.Response:
+        return self.session.get(
+            self.url, params={"q": query, "num": num}, timeout=(SEARCH_CONNECT_TIMEOUT, SEARCH_READ_TIMEOUT)
+        )
+
+    def _parse(self, data: Dict[str, Any], num: int) -> List[Dict[str, str]]:
+        return [
+            {"title": item.get("title", ""), "link": item.get("link", ""), "snippet": item.get("snippet", "")}
+            for item in (data.get("results") or [])[:num]
+        ]
+
+
+SEARCH_BACKENDS = {"serper": SerperClient, "local": LocalSearchBackend}
+
+
+def create_search_backend(name: str = SEARCH_BACKEND, url: Optional[str] = None) -> SearchBackend:
+    """按名称创建后端；url 为空时用该后端的默认地址。未知名称抛 ValueError。"""
+    try:
+        cls = SEARCH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown SEARCH_BACKEND {name!r}, expected one of {sorted(SEARCH_BACKENDS)}") from None
+    return cls(url) if url else cls()
+
+
+search_backend = create_search_backend()
@@ -0,0 +1,156 @@
+"""
+Serper 搜索结果持久化缓存（SQLite）：同一通稿在多个门户、多篇文章、多轮运行中产生的相同查询只请求一次。
+
+- 查询先规范化：NFKC、小写、去标点、合并空白；不含引号与搜索运算符（site:、-词、OR 等）的词袋查询再按词排序，
+  “Fed raises rates” 与 “rates, fed RAISES” 命中同一条；
+- 键为 (规范化查询, num_results)；条目超过 SEARCH_CACHE_TTL（默认 6 小时，适合新闻时效）过期，
+  总大小超过 SEARCH_CACHE_MAX_MB 时按最近访问时间淘汰；SEARCH_CACHE=0 关闭；
+- stats 记录命中/未命中/写入/淘汰，以及命中节省的 API 调用与延迟（按原请求耗时计）。
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+from news_verify.tools.common import SEARCH_OPERATOR_RE
+
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE", "1") not in ("0", "false", "off")
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600)))
+SEARCH_CACHE_MAX_BYTES = int(float(os.getenv("SEARCH_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
+_PUNCT_RE = re.compile(r"[^\w\s:\"'-]+")
+
+
+def normalize_query(query: str) -> str:
+    """规范化查询；运算符查询只统一大小写、标点与空白，词袋查询再按词排序去重。"""
+    text = unicodedata.normalize("NFKC", query or "").strip()
+    operators = bool(SEARCH_OPERATOR_RE.search(text))
+    text = text.lower()
+    if operators:
+        return " ".join(text.split())
+    words = _PUNCT_RE.sub(" ", text).replace("'", "").split()
+    return " ".join(sorted(set(w.strip("-:") for w in words if w.strip("-:"))))
+
+
+class SearchCache:
+    """线程安全的搜索结果缓存；值为 {"results": [...], "latency_ms": 原请求耗时}。"""
+
+    def __init__(
+        self,
+        path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "search_cache.sqlite3"),
+        ttl: int = SEARCH_CACHE_TTL,
+        max_bytes: int = SEARCH_CACHE_MAX_BYTES,
+        enabled: bool = SEARCH_CACHE_ENABLED,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts_since_evict = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "stores": 0, "evictions": 0, "saved_latency_ms": 0,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                "key TEXT PRIMARY KEY, query TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS searches_last_access ON searches (last_access)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(query: str, num_results: int) -> str:
+        return hashlib.sha256(f"{normalize_query(query)}\n{num_results}".encode("utf-8")).hexdigest()
+
+    def get(self, query: str, num_results: int) -> Optional[Dict[str, Any]]:
+        """返回缓存的结果 dict；未启用、不存在或已过期时返回 None。"""
+        if not self.enabled:
+            return None
+        key = self.make_key(query, num_results)
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            row = conn.execute("SELECT value, created_at FROM searches WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+                    conn.commit()
+                self.stats["misses"] += 1
+                return None
+            conn.execute("UPDATE searches SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            value = json.loads(row[0])
+            self.stats["hits"] += 1
+            self.stats["saved_latency_ms"] += int(value.get("latency_ms") or 0)
+            return value
+
+    def put(self, query: str, num_results: int, results: Any, latency_ms: int) -> None:
+        if not self.enabled:
+            return
+        key = self.make_key(query, num_results)
+        blob = json.dumps({"results": results, "latency_ms": latency_ms}, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO searches (key, query, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, normalize_query(query), blob, len(blob.encode("utf-8")), now, now),
+            )
+            conn.commit()
+            self.stats["stores"] += 1
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= 50:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """删除过期条目；总大小仍超限时按最近访问时间从旧到新删除。"""
+        self._puts_since_evict = 0
+        conn = self._db()
+        cur = conn.execute("DELETE FROM searches WHERE created_at < ?", (time.time() - self.ttl,))
+        self.stats["evictions"] += max(0, cur.rowcount)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM searches").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM searches ORDER BY last_access").fetchall():
+                conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+                self.stats["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        conn.commit()
+
+    def evict(self) -> None:
+        with self._lock:
+            self._evict_locked()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def stats_since(self, snapshot: Dict[str, int]) -> Dict[str, Any]:
+        """相对 snapshot 的命中情况；saved_calls 即命中次数（每次命中省一次 API 调用）。"""
+        now = self.snapshot()
+        delta: Dict[str, Any] = {k: now[k] - snapshot.get(k, 0) for k in now}
+        lookups = delta["hits"] + delta["misses"]
+        delta["saved_calls"] = delta["hits"]
+        delta["hit_rate"] = round(delta["hits"] / lookups, 3) if lookups else 0.0
+        return delta
+
+
+search_cache = SearchCache()
@@ -0,0 +1,261 @@
+"""
+本地搜索替身服务：从夹具语料（JSON 数组或 JSONL，每项 title / link / snippet 或 text）按 BM25 返回结果，
+可配置延迟与错误注入，用于离线运行核查流程、压测搜索吞吐与调并发，不消耗 Serper 配额。
+
+- GET /search?q=&num= 返回 {"results": [...]}（LocalSearchBackend 使用）；POST {"q", "num"} 返回
+  {"organic": [...]}，与 Serper 格式相同，SerperClient(url=...) 也可直接指向它；
+- latency 为每次请求的基础延迟，jitter 为额外的 [0, jitter] 随机延迟；error_rate 的请求返回 503，
+  rate_limit_rate 的请求返回 429（带 Retry-After: 1）；seed 固定时注入序列可复现；
+- 未给语料时生成 synthetic_corpus() 合成语料；stats 记录请求数与各状态码次数。
+
+命令行：python -m news_verify.tools.search_local --port 8765 --corpus corpus.jsonl --latency 0.3 --error-rate 0.05
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_TOPICS = (
+    "central bank interest rates inflation",
+    "trade tariffs exports imports",
+    "election results parliament vote",
+    "climate summit emissions targets",
+    "technology company earnings quarter",
+    "public health vaccine outbreak",
+    "energy prices oil production",
+    "court ruling appeal judge",
+)
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def synthetic_corpus(size: int = 500, seed: int = 7) -> List[Dict[str, str]]:
+    """生成确定性的合成新闻语料：每篇围绕一个主题，混入编号与地名，供没有夹具文件时使用。"""
+    rng = random.Random(seed)
+    places = ("Berlin", "Tokyo", "Brasilia", "Nairobi", "Ottawa", "Canberra", "Seoul", "Madrid")
+    docs = []
+    for i in range(size):
+        topic = _TOPICS[i % len(_TOPICS)]
+        place = rng.choice(places)
+        words = topic.split()
+        rng.shuffle(words)
+        docs.append({
+            "title": f"{place}: {' '.join(words[:3]).capitalize()} report {i}",
+            "link": f"https://local-news.example/{topic.split()[0]}/{i}",
+            "snippet": f"Officials in {place} said on Tuesday that {topic} figures for period {i % 12 + 1} "
+                       f"were revised, according to a statement seen by reporters.",
+        })
+    return docs
+
+
+def load_corpus(path: str) -> List[Dict[str, str]]:
+    """读取 JSON 数组或 JSONL 语料；text 字段截取前 300 字符作为 snippet。"""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    if raw.lstrip().startswith("["):
+        items = json.loads(raw)
+    else:
+        items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    docs = []
+    for item in items:
+        if not isinstance(item, dict) or not (item.get("link") or item.get("url")):
+            continue
+        docs.append({
+            "title": item.get("title", ""),
+            "link": item.get("link") or item.get("url"),
+            "snippet": item.get("snippet") or (item.get("text") or "")[:300],
+        })
+    return docs
+
+
+class BM25Corpus:
+    """内存 BM25 检索（k1=1.5, b=0.75），语料在构造时一次建好倒排表。"""
+
+    def __init__(self, docs: List[Dict[str, str]], k1: float = 1.5, b: float = 0.75):
+        self.docs = docs
+        self.k1 = k1
+        self.b = b
+        self._tf: List[Counter] = [Counter(_tokens(f"{d['title']} {d['snippet']}")) for d in docs]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg = (sum(self._len) / len(self._len)) if docs else 0.0
+        self._postings: Dict[str, List[int]] = {}
+        for i, tf in enumerate(self._tf):
+            for term in tf:
+                self._postings.setdefault(term, []).append(i)
+
+    def search(self, query: str, num: int) -> List[Dict[str, str]]:
+        scores: Dict[int, float] = {}
+        n = len(self.docs)
+        for term in set(_tokens(query)):
+            postings = self._postings.get(term, [])
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i in postings:
+                tf = self._tf[i][term]
+                norm = tf + self.k1 * (1 - self.b + self.b * self._len[i] / self._avg)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / norm
+        ranked = sorted(scores, key=lambda i: -scores[i])[:num]
+        return [dict(self.docs[i]) for i in ranked]
+
+
+class LocalSearchServer:
+    """仅监听 127.0.0.1 的替身服务；start()/stop() 或 with serve_local_search(...) 使用。"""
+
+    def __init__(
+        self,
+        corpus: Optional[List[Dict[str, str]]] = None,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.index = BM25Corpus(corpus if corpus is not None else synthetic_corpus())
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.stats: Dict[str, Any] = {"requests": 0, "statuses": {}}
+
+    @property
+    def url(self) -> str:
+        """GET 接口地址（LocalSearchBackend 用）；POST 到同一地址为 Serper 格式。"""
+        return f"http://127.0.0.1:{self.port}/search"
+
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        """本次请求的延迟与注入状态码（None 表示正常）。"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return delay, 503
+        if roll < self.error_rate + self.rate_limit_rate:
+            return delay, 429
+        return delay, None
+
+    def _count(self, status: int) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["statuses"][str(status)] = self.stats["statuses"].get(str(status), 0) + 1
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+                server._count(status)
+
+            def _serve(self, query: str, num: int, field: str) -> None:
+                delay, injected = server._draw()
+                if delay:
+                    time.sleep(delay)
+                if injected == 429:
+                    self._reply(429, {"message": "rate limited (injected)"}, {"Retry-After": "1"})
+                elif injected:
+                    self._reply(injected, {"message": "unavailable (injected)"})
+                else:
+                    self._reply(200, {field: server.index.search(query, max(1, min(num, 100)))})
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                if parsed.path.rstrip("/") != "/search":
+                    self._reply(404, {"message": "not found"})
+                    return
+                params = parse_qs(parsed.query)
+                self._serve(params.get("q", [""])[0], int(params.get("num", ["10"])[0] or 10), "results")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._reply(400, {"message": "invalid JSON"})
+                    return
+                self._serve(str(body.get("q", "")), int(body.get("num", 10) or 10), "organic")
+
+        return Handler
+
+    def start(self) -> "LocalSearchServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+@contextmanager
+def serve_local_search(**kwargs: Any) -> Iterator[LocalSearchServer]:
+    """启动替身服务（参数同 LocalSearchServer），退出时关闭。"""
+    server = LocalSearchServer(**kwargs).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地搜索替身服务（SEARCH_BACKEND=local 时使用）")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--corpus", help="JSON 数组或 JSONL 语料文件；缺省时用合成语料")
+    parser.add_argument("--latency", type=float, default=0.3, help="每次请求的基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="额外随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 503 的请求比例")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回 429 的请求比例")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    server = LocalSearchServer(
+        corpus=load_corpus(args.corpus) if args.corpus else None,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    ).start()
+    print(f"local search backend on {server.url} ({len(server.index.docs)} documents); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
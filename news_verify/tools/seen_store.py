@@ -0,0 +1,175 @@
+"""
+增量监控用的“已见 URL”持久化存储：SQLite 落盘，内存 Bloom 过滤器做快速否定判断。
+
+- 键为 (门户, 规范化 URL)，记录首次出现与最近出现时间；
+- Bloom 判定“肯定没见过”时直接视为新链接，只有可能见过时才查 SQLite；
+- 按最近出现时间做过期清理（仍挂在首页的旧报道会持续续期），清理后重建 Bloom；
+- filter_new 只判断、不记录；报道核查完成后才经 mark_seen 记为已见，运行中途失败或未被选中的报道下轮仍会出现。
+  IncrementalRun 保存一轮运行中门户爬虫给出的链接（所属门户与别名），供流程按篇提交。
+"""
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from news_verify.tools.canonical import canonicalize_url
+from news_verify.config import NEWS_VERIFY_CACHE_DIR
+
+SEEN_STORE_MAX_AGE_DAYS = float(os.getenv("SEEN_STORE_MAX_AGE_DAYS", "7"))
+SEEN_STORE_BLOOM_CAPACITY = int(os.getenv("SEEN_STORE_BLOOM_CAPACITY", "200000"))
+
+
+class BloomFilter:
+    """定长位数组 Bloom 过滤器（双重哈希），只支持添加与查询。"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenUrlStore:
+    """线程安全的已见 URL 存储；filter_new 返回新链接，mark_seen 记为已见。"""
+
+    def __init__(
+        self,
+        path: str = os.path.join(NEWS_VERIFY_CACHE_DIR, "seen_urls.sqlite3"),
+        max_age_days: float = SEEN_STORE_MAX_AGE_DAYS,
+        bloom_capacity: int = SEEN_STORE_BLOOM_CAPACITY,
+    ):
+        self.path = Path(path)
+        self.max_age = max_age_days * 24 * 3600
+        self.bloom_capacity = bloom_capacity
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._last_expire = 0.0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                "portal TEXT NOT NULL, url TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL, "
+                "PRIMARY KEY (portal, url))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS seen_last_seen ON seen (last_seen)")
+            self._conn = conn
+            self._expire_locked()
+        return self._conn
+
+    def _rebuild_bloom_locked(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        rows = self._conn.execute("SELECT portal, url FROM seen")
+        bloom = BloomFilter(max(self.bloom_capacity, count * 2))
+        for portal, url in rows:
+            bloom.add(f"{portal}\t{url}")
+        self._bloom = bloom
+
+    def _expire_locked(self) -> None:
+        now = time.time()
+        self._conn.execute("DELETE FROM seen WHERE last_seen < ?", (now - self.max_age,))
+        self._conn.commit()
+        self._last_expire = now
+        self._rebuild_bloom_locked()
+
+    def filter_new(self, portal_url: str, urls: List[str]) -> List[str]:
+        """返回 urls 中该门户从未记为已见的链接（保持顺序）；已见的链接刷新最近出现时间，新链接不写入。"""
+        portal = canonicalize_url(portal_url)
+        now = time.time()
+        fresh: List[str] = []
+        with self._lock:
+            conn = self._db()
+            if now - self._last_expire > 3600:
+                self._expire_locked()
+            for url in urls:
+                key = canonicalize_url(url)
+                seen = False
+                if f"{portal}\t{key}" in self._bloom:
+                    seen = conn.execute(
+                        "UPDATE seen SET last_seen = ? WHERE portal = ? AND url = ?", (now, portal, key)
+                    ).rowcount > 0
+                if not seen:
+                    fresh.append(url)
+            conn.commit()
+        return fresh
+
+    def mark_seen(self, portal_url: str, urls: Iterable[str]) -> None:
+        """把链接记为该门户已见（已有记录只刷新最近出现时间）。"""
+        portal = canonicalize_url(portal_url)
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            for url in urls:
+                key = canonicalize_url(url)
+                conn.execute(
+                    "INSERT INTO seen (portal, url, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (portal, url) DO UPDATE SET last_seen = excluded.last_seen",
+                    (portal, key, now, now),
+                )
+                self._bloom.add(f"{portal}\t{key}")
+            conn.commit()
+
+    def count(self, portal_url: Optional[str] = None) -> int:
+        with self._lock:
+            conn = self._db()
+            if portal_url is None:
+                return conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+            return conn.execute(
+                "SELECT COUNT(*) FROM seen WHERE portal = ?", (canonicalize_url(portal_url),)
+            ).fetchone()[0]
+
+
+class IncrementalRun:
+    """一轮增量运行：记下门户爬虫给出的新链接来自哪个门户及其别名，核查完成的报道由 commit() 记为已见。"""
+
+    def __init__(self, portal_url: str, store: Optional[SeenUrlStore] = None):
+        self.portal_url = portal_url
+        self.store = store or seen_url_store
+        self._lock = threading.Lock()
+        # 规范化 URL → (门户, 该报道的全部 URL 变体)
+        self._offered: Dict[str, Tuple[str, List[str]]] = {}
+        self.committed = 0
+
+    def only_new(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """过滤门户爬虫结果，只保留任一 URL 变体都未见过的报道，并记下它们以便提交。"""
+        portal = data.get("portal_url") or self.portal_url
+        items = data.get("items", [])
+        variants = [[u for u in [it.get("url", "")] + list(it.get("aliases", [])) if u] for it in items]
+        fresh = set(self.store.filter_new(portal, [u for urls in variants for u in urls]))
+        keep = [bool(urls) and all(u in fresh for u in urls) for urls in variants]
+        new_items = [it for it, k in zip(items, keep) if k]
+        with self._lock:
+            for urls, k in zip(variants, keep):
+                for u in urls if k else []:
+                    self._offered[canonicalize_url(u)] = (portal, urls)
+        return dict(data, items=new_items, incremental=True, skipped_seen=len(items) - len(new_items))
+
+    def commit(self, url: str) -> None:
+        """报道已核查完成：连同别名记为已见；不是门户爬虫给出的链接时记在本轮门户下。"""
+        with self._lock:
+            portal, urls = self._offered.get(canonicalize_url(url), (self.portal_url, [url]))
+            self.committed += 1
+        self.store.mark_seen(portal, urls)
+
+
+seen_url_store = SeenUrlStore()
@@ -1,12 +1,19 @@
-"""验证阶段工具：文件读取、Serper 搜索。"""
-import os
+"""验证阶段工具：文件读取、Serper 搜索（先查本地证据索引，不足时经 tools/search.py 的搜索后端）。"""
 import json
-from typing import Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, List, Tuple, Type
 
-import requests
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from news_verify.tools.evidence_index import evidence_index, EVIDENCE_INDEX_ENABLED
+from news_verify.tools.search import search_backend
+
+# 本地证据中不计入的 (URL, 标题)（正在核查的文章本身及其转载）。工具是模块级单例，Web 端多个运行并发，
+# 放在 ContextVar 中按运行隔离；CrewAI 在调用 kickoff 的线程内执行工具，因此能读到。
+_excluded: ContextVar[Tuple[Tuple[str, ...], Tuple[str, ...]]] = ContextVar("search_excluded", default=((), ()))
+
 
 class FileReadToolInput(BaseModel):
     file_path: str = Field(..., description="The absolute path to the file to read")
@@ -37,34 +44,31 @@ class SerperSearchTool(BaseTool):
     name: str = "Serper Search"
     description: str = "Searches the web using Serper API to verify claims and find information"
     args_schema: Type[BaseModel] = SerperSearchToolInput
+    # 本地证据充足时直接返回，不请求 Serper
+    use_local_index: bool = EVIDENCE_INDEX_ENABLED
+
+    @contextmanager
+    def excluding(self, urls: List[str], titles: Iterable[str] = ()) -> Iterator[None]:
+        """
+        在当前运行内把 urls 及标题与 titles 属于同一报道的文档（转载副本）排除出本地证据；
+        只影响本运行，不影响并发的其它运行。
+        """
+        token = _excluded.set((tuple(u for u in urls if u), tuple(t for t in titles if t)))
+        try:
+            yield
+        finally:
+            _excluded.reset(token)
 
     def _run(self, query: str, num_results: int = 10) -> str:
-        try:
-            api_key = os.getenv("SERPER_API_KEY")
-            if not api_key:
-                return "Error: SERPER_API_KEY environment variable is not set"
-
-            url = "https://google.serper.dev/search"
-            payload = json.dumps({"q": query, "num": min(num_results, 100)})
-            headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
-
-            response = requests.request("POST", url, headers=headers, data=payload)
-
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                if "organic" in data:
-                    for item in data["organic"][:num_results]:
-                        results.append({
-                            "title": item.get("title", ""),
-                            "link": item.get("link", ""),
-                            "snippet": item.get("snippet", ""),
-                        })
-                return json.dumps(results, ensure_ascii=False, indent=2)
-            else:
-                return f"Error: API request failed with status {response.status_code}: {response.text}"
-        except Exception as e:
-            return f"Error executing search: {str(e)}"
+        if self.use_local_index:
+            urls, titles = _excluded.get()
+            local = evidence_index.lookup(query, num_results, urls, titles)
+            if local["sufficient"]:
+                return json.dumps(local["results"], ensure_ascii=False, indent=2)
+        result = search_backend.search(query, num_results)
+        if not result["ok"]:
+            return f"Error: {result['error']}"
+        return json.dumps(result["results"], ensure_ascii=False, indent=2)
 
 
 file_read_tool = FileReadTool()
@@ -0,0 +1,22 @@
+"""
+单元测试只覆盖可单独导入的模块（canonical、links、chunking、rate_limit、query_dedupe、seen_store、structured 等）。
+
+news_verify/__init__.py 与 news_verify/tools/__init__.py 会导入整个流程（crewai、crawl4ai），这里先注册两个
+不执行 __init__ 的包对象，子模块仍按原路径正常导入；缓存目录指向临时目录，测试不写入工作区的 .cache。
+"""
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ.setdefault("NEWS_VERIFY_CACHE_DIR", tempfile.mkdtemp(prefix="news_verify_test_"))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+for _name, _path in (("news_verify", ROOT / "news_verify"), ("news_verify.tools", ROOT / "news_verify" / "tools")):
+    if _name not in sys.modules:
+        _pkg = types.ModuleType(_name)
+        _pkg.__path__ = [str(_path)]
+        sys.modules[_name] = _pkg
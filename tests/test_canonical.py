@@ -0,0 +1,55 @@
+"""tools/canonical.py：URL 规范化与重复报道合并。"""
+import pytest
+
+from news_verify.tools.canonical import canonicalize_url, collapse_duplicates, same_story
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://www.Example.com/a/b/?utm_source=x&b=2&a=1#frag", "https://example.com/a/b?a=1&b=2"),
+    ("https://m.example.com/a/b", "https://example.com/a/b"),
+    ("https://amp.example.com/a/b/amp", "https://example.com/a/b"),
+    ("https://example.com/a/b.amp.html", "https://example.com/a/b.html"),
+    ("https://example.com//a//b/", "https://example.com/a/b"),
+    ("https://example.com/?fbclid=1&ref=tw", "https://example.com/"),
+    ("https://example.com:8080/a", "https://example.com:8080/a"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_url_keeps_two_label_hosts_and_relative_urls():
+    # 只有两段的主机名不去前缀（m.com 本身就是站点）；没有主机的字符串原样返回
+    assert canonicalize_url("https://m.com/a") == "https://m.com/a"
+    assert canonicalize_url(" /relative/path ") == "/relative/path"
+
+
+def test_collapse_duplicates_merges_url_variants_into_aliases():
+    items = [
+        {"title": "Story one", "url": "https://www.example.com/news/1?utm_source=rss"},
+        {"title": "Story one (mobile)", "url": "https://m.example.com/news/1/"},
+        {"title": "Story two", "url": "https://example.com/news/2"},
+    ]
+    kept = collapse_duplicates(items)
+    assert [x["url"] for x in kept] == [items[0]["url"], items[2]["url"]]
+    assert kept[0]["aliases"] == ["https://m.example.com/news/1/"]
+    assert "aliases" not in items[0]
+
+
+def test_collapse_duplicates_merges_near_identical_titles():
+    title = "Central bank raises interest rates by half a point"
+    kept = collapse_duplicates([
+        {"title": title, "url": "https://a.com/story"},
+        {"title": title + " today", "url": "https://b.com/copy"},
+        {"title": "Short", "url": "https://c.com/short"},
+        {"title": "Short", "url": "https://d.com/short"},
+    ])
+    # 标题词集 Jaccard ≥ 0.85 的合并；词数不足 min_title_tokens 的短标题不按标题合并
+    assert [x["url"] for x in kept] == ["https://a.com/story", "https://c.com/short", "https://d.com/short"]
+    assert kept[0]["aliases"] == ["https://b.com/copy"]
+
+
+def test_same_story_uses_the_collapse_threshold():
+    title = "Central bank raises interest rates by half a point"
+    assert same_story(title + " today", [title])
+    assert not same_story("Analysts react to the rate decision", [title])
+    assert not same_story("Short", ["Short"])
@@ -0,0 +1,66 @@
+"""chunking.py：按 token 预算切分，各块拼接即原文且不超预算。"""
+import pytest
+
+from news_verify import chunking
+from news_verify.chunking import count_tokens, split_by_tokens, truncate_to_tokens
+
+
+class _ByteEncoder:
+    """每 2 个 UTF-8 字节一个 token 的替身编码器：汉字（3 字节）必然跨 token，用于检查切点落在字符边界。"""
+
+    def encode(self, text, disallowed_special=()):
+        data = text.encode("utf-8")
+        return [data[i:i + 2] for i in range(0, len(data), 2)]
+
+    def decode_single_token_bytes(self, token):
+        return token
+
+
+@pytest.fixture
+def estimator(monkeypatch):
+    """固定使用估算规则（中日韩字符 1 token、其余约 4 字符 1 token），结果与是否安装 tiktoken 无关。"""
+    monkeypatch.setattr(chunking, "_encoder", None)
+    monkeypatch.setattr(chunking, "_encoder_loaded", True)
+
+
+@pytest.fixture
+def byte_encoder(monkeypatch):
+    monkeypatch.setattr(chunking, "_encoder", _ByteEncoder())
+    monkeypatch.setattr(chunking, "_encoder_loaded", True)
+
+
+TEXT = "第一段。" * 10 + "\n\n" + "Second paragraph with some English words. " * 5 + "\n\n" + "短"
+
+
+def test_count_tokens_estimate(estimator):
+    assert count_tokens("") == 0
+    assert count_tokens("abcd") == 1
+    assert count_tokens("中文ab") == 3
+
+
+@pytest.mark.parametrize("max_tokens", [1, 5, 20, 100])
+def test_split_round_trips_within_budget(estimator, max_tokens):
+    chunks = split_by_tokens(TEXT, max_tokens)
+    assert "".join(chunks) == TEXT
+    assert all(count_tokens(c) <= max(max_tokens, 1) for c in chunks)
+
+
+def test_split_prefers_paragraph_boundaries(estimator):
+    chunks = split_by_tokens(TEXT, 60)
+    assert chunks[0] == "第一段。" * 10 + "\n\n"
+    assert split_by_tokens(TEXT, 1000) == [TEXT]
+    assert split_by_tokens("", 10) == []
+
+
+@pytest.mark.parametrize("max_tokens", [1, 2, 3, 5, 8])
+def test_hard_split_cuts_on_character_boundaries(byte_encoder, max_tokens):
+    text = "中文新闻事实核查示例abc，没有任何标点的长句子" * 3
+    pieces = split_by_tokens(text, max_tokens)
+    assert "".join(pieces) == text
+    assert all("�" not in p for p in pieces)
+
+
+def test_truncate_to_tokens(estimator):
+    assert truncate_to_tokens("短文本", 10) == ("短文本", False)
+    head, truncated = truncate_to_tokens(TEXT, 20)
+    assert truncated and TEXT.startswith(head) and count_tokens(head) <= 20
@@ -0,0 +1,106 @@
+"""tools/links.py：流式锚点抽取与原 BeautifulSoup 实现的规则、顺序一致。"""
+from typing import Dict, List
+from urllib.parse import urljoin, urlparse
+
+import pytest
+
+from news_verify.tools.links import extract_portal_items, iter_anchors
+
+PORTAL = "https://news.example.com/"
+
+HTML = """
+<html><head><title>Portal</title><script>var a = "<a href='/x'>no</a>";</script></head>
+<body>
+  <a href="/">Home page</a>
+  <a href="/news/2024/05/01/markets-rally">Markets <b>rally</b> on   earnings</a>
+  <a href="//cdn.example.com/story/abc">CDN story link</a>
+  <a href="https://news.example.com/login">Log in here</a>
+  <a href="/tag/politics">Politics tag</a>
+  <a href="/about">About us</a>
+  <a href="/world/europe/summit-ends">Summit ends <img src="x.png"> without deal</a>
+  <a href="/news/2024/05/01/markets-rally">Markets rally (duplicate)</a>
+  <a href="mailto:tips@example.com">Send tips</a>
+  <a href="/opinion/a-long-opinion-piece-title">Op</a>
+  <a href="/detail?id=7"><span>Detail page</span><style>.x{}</style></a>
+  <a href="/video/clip">Video <a href="/story/nested-link">Nested story</a> tail</a>
+  <p><a href="/sport/football/cup-final-report">Cup final
+     report</a></p>
+  <a name="anchor-without-href">No href</a>
+</body></html>
+"""
+
+
+def _baseline(html: str, portal_url: str) -> List[Dict[str, str]]:
+    """原 PortalCrawlerTool 中基于 BeautifulSoup 的实现（规则逐条照搬）。"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    seen: set = set()
+    items: List[Dict[str, str]] = []
+    for a in soup.find_all("a", href=True):
+        href = (a["href"] or "").strip()
+        text = a.get_text(strip=True)
+        if not text or len(text) < 3:
+            continue
+        full_url = href
+        if full_url.startswith("//"):
+            full_url = "https:" + full_url
+        elif full_url.startswith("/"):
+            full_url = urljoin(portal_url, full_url)
+        if not full_url.startswith("http"):
+            continue
+        path = (urlparse(full_url).path or "").lower()
+        if full_url.rstrip("/") == portal_url.rstrip("/"):
+            continue
+        if any(skip in path for skip in ["/login", "/signup", "/tag/", "/author/", "/subscribe"]):
+            continue
+        path_segments = [s for s in path.split("/") if s]
+        is_article = (
+            "/article" in path
+            or "/news" in path
+            or "/story" in path
+            or "/202" in path
+            or "detail" in path
+            or (len(path) > 15 and ("/" in path[1:] or path.count("-") >= 2))
+            or (len(path_segments) >= 2 and len(path) > 8)
+        )
+        if not is_article or full_url in seen:
+            continue
+        seen.add(full_url)
+        items.append({"title": text[:200], "url": full_url})
+    return items
+
+
+def test_extract_portal_items_applies_filters_in_document_order():
+    items = extract_portal_items(HTML, PORTAL)
+    urls = [x["url"] for x in items]
+    assert urls[0] == "https://news.example.com/news/2024/05/01/markets-rally"
+    assert items[0]["title"] == "Marketsrallyon   earnings"
+    assert "https://cdn.example.com/story/abc" in urls
+    assert not any("/login" in u or "/tag/" in u or u.startswith("mailto:") for u in urls)
+    assert "https://news.example.com/about" not in urls
+    assert len(urls) == len(set(urls))
+
+
+def test_iter_anchors_skips_script_text_and_anchors_without_href():
+    anchors = iter_anchors(HTML)
+    assert all(href != "/x" and text != "No href" for href, text in anchors)
+    # 文本节点各自 strip 后拼接，与 a.get_text(strip=True) 相同
+    assert ("/world/europe/summit-ends", "Summit endswithout deal") in anchors
+
+
+def test_extract_portal_items_matches_beautifulsoup_baseline():
+    pytest.importorskip("bs4")
+    assert extract_portal_items(HTML, PORTAL) == _baseline(HTML, PORTAL)
+
+
+@pytest.mark.parametrize("html", [
+    "<a href='/news/a'>Unclosed <b>bold",
+    "<div><a href='/story/one'>One</div><a href='/story/two'>Two</a>",
+    "<a href='/2024/x'>&amp; entity &lt;ok&gt;</a><a href=' /news/padded '>Padded href</a>",
+    "<a href='/news/x'><!-- comment -->Commented title</a>",
+    "<table><tr><td><a href='/news/cell-link'>Cell link</td></tr></table>",
+])
+def test_malformed_markup_matches_beautifulsoup_baseline(html):
+    pytest.importorskip("bs4")
+    assert extract_portal_items(html, PORTAL) == _baseline(html, PORTAL)
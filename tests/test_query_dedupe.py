@@ -0,0 +1,51 @@
+"""tools/query_dedupe.py：近似重复查询合并到代表查询。"""
+from news_verify.tools.query_dedupe import QueryDeduper
+
+
+def test_assign_merges_rewordings_and_exact_duplicates():
+    deduper = QueryDeduper(threshold=0.7, enabled=True)
+    mapping = deduper.assign([
+        "Fed raises rates 25 basis points",
+        "Fed raised interest rates by 25 basis points",
+        "ECB holds rates steady",
+        "ecb holds rates steady",
+    ])
+    assert mapping == {
+        "Fed raises rates 25 basis points": "Fed raises rates 25 basis points",
+        "Fed raised interest rates by 25 basis points": "Fed raises rates 25 basis points",
+        "ECB holds rates steady": "ECB holds rates steady",
+        "ecb holds rates steady": "ECB holds rates steady",
+    }
+    assert deduper.stats == {"planned": 4, "representatives": 2, "merged": 2, "reused": 0, "executed": 0}
+
+
+def test_operator_queries_only_merge_with_identical_queries():
+    deduper = QueryDeduper(threshold=0.1, enabled=True)
+    mapping = deduper.assign(["Fed rates", "site:a.com Fed rates", "site:a.com  FED rates", "Fed rates news"])
+    assert mapping["site:a.com Fed rates"] == "site:a.com Fed rates"
+    assert mapping["site:a.com  FED rates"] == "site:a.com Fed rates"
+    # 近似合并只与不含运算符的代表比较
+    assert mapping["Fed rates news"] == "Fed rates"
+
+
+def test_disabled_deduper_only_merges_normalized_duplicates():
+    deduper = QueryDeduper(enabled=False)
+    mapping = deduper.assign(["Fed raises rates", "rates Fed raises", "Fed raised rates"])
+    assert mapping == {
+        "Fed raises rates": "Fed raises rates",
+        "rates Fed raises": "Fed raises rates",
+        "Fed raised rates": "Fed raised rates",
+    }
+
+
+def test_later_plans_reuse_successful_results():
+    deduper = QueryDeduper(enabled=True)
+    rep = deduper.assign(["Fed raises rates"])["Fed raises rates"]
+    assert deduper.cached(rep) is None
+    deduper.record(rep, {"ok": True, "results": [{"link": "https://a.com"}]})
+    deduper.record("failed query", {"ok": False, "results": []})
+    assert deduper.assign(["fed raises rates"])["fed raises rates"] == rep
+    assert deduper.cached(rep)["results"] == [{"link": "https://a.com"}]
+    assert deduper.cached("failed query") is None
+    report = deduper.report()
+    assert report["reused"] == 1 and report["executed"] == 2 and report["requests_avoided"] == 0
@@ -0,0 +1,142 @@
+"""rate_limit.py：令牌桶、AIMD 并发上限与 call() 的重试。"""
+import pytest
+
+from news_verify.rate_limit import LLMRateLimiter, TokenBucket
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+class _ServerError(Exception):
+    status_code = 503
+
+
+def _bucket(rate_per_minute: float) -> TokenBucket:
+    bucket = TokenBucket(rate_per_minute)
+    bucket.updated = 0.0
+    return bucket
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = _bucket(60)  # 每秒补 1
+    assert bucket.wait_time(60, now=0.0) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now=1.0) == 0.0
+
+
+def test_token_bucket_caps_oversized_requests_and_refunds():
+    bucket = _bucket(60)
+    # 超过容量的请求按容量计，否则永远等不到
+    assert bucket.wait_time(1000, now=0.0) == 0.0
+    bucket.take(1000)
+    assert bucket.level == 0
+    bucket.give_back(30)
+    assert bucket.level == 30
+    bucket.give_back(-40)  # 实际用量超过预扣时补扣，允许透支
+    assert bucket.level == -10
+    bucket.give_back(1000)
+    assert bucket.level == 60
+
+
+def test_unlimited_bucket():
+    bucket = _bucket(0)
+    assert bucket.unlimited
+    bucket.take(10 ** 9)
+    assert bucket.wait_time(10 ** 9, now=0.0) == 0.0
+
+
+def _limiter(max_concurrency: int = 8) -> LLMRateLimiter:
+    return LLMRateLimiter(rpm=0, tpm=0, max_concurrency=max_concurrency)
+
+
+def test_aimd_halves_on_429_once_per_wave_and_grows_after_a_round_of_successes():
+    limiter = _limiter(8)
+    for _ in range(3):
+        limiter.acquire()
+    for _ in range(3):
+        limiter.release(rate_limited=True)
+    assert limiter.limit == 4
+    assert limiter.stats["decreases"] == 1
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 4
+    limiter.acquire()
+    limiter.release()
+    assert limiter.limit == 5
+    assert limiter.stats["increases"] == 1
+
+
+def test_failures_do_not_count_toward_increase():
+    limiter = _limiter(8)
+    limiter.limit = 2
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(ok=False)
+    assert limiter.limit == 2
+
+
+def test_limit_never_exceeds_max_concurrency():
+    limiter = _limiter(2)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 2
+
+
+def test_release_corrects_tpm_with_actual_usage():
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, max_concurrency=4)
+    limiter.acquire(600)
+    limiter.release(600, used_tokens=100)
+    assert limiter._tokens.level == pytest.approx(900, abs=1)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(LLMRateLimiter, "backoff", lambda self, attempt, exc=None: 0.0)
+
+
+def test_call_retries_rate_limits_and_refunds_tokens(no_backoff):
+    limiter = LLMRateLimiter(rpm=0, tpm=100000, max_concurrency=4)
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _RateLimited("429 Too Many Requests")
+        return "ok"
+
+    assert limiter.call(fn, tokens=50000, used_tokens=lambda r: 100) == "ok"
+    assert len(attempts) == 3
+    # 失败的两次全额退回，只按成功那次的实际用量扣减
+    assert limiter._tokens.level == pytest.approx(99900, abs=1)
+
+
+def test_call_without_retry_raises_on_first_failure(no_backoff):
+    limiter = _limiter()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise _ServerError("503")
+
+    with pytest.raises(_ServerError):
+        limiter.call(fn, retry=False)
+    assert len(attempts) == 1
+    assert limiter._in_flight == 0
+
+
+def test_call_does_not_retry_other_errors(no_backoff):
+    limiter = _limiter()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    assert len(attempts) == 1
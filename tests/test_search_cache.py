@@ -0,0 +1,25 @@
+"""tools/search_cache.py：查询规范化（缓存键）。"""
+import pytest
+
+from news_verify.tools.search_cache import normalize_query
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Fed  raises RATES!", "fed raises rates"),
+    ("rates raises fed", "fed raises rates"),
+    ("  Ｆｅｄ raises  ", "fed raises"),
+])
+def test_bag_of_words_queries_ignore_case_punctuation_and_order(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("“Fed raises” site:x.com", "“fed raises” site:x.com"),
+    ("Fed -rates", "fed -rates"),
+])
+def test_operator_queries_keep_word_order(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_operator_query_is_not_sorted():
+    assert normalize_query("site:x.com rates fed") != normalize_query("site:x.com fed rates")
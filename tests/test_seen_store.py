@@ -0,0 +1,60 @@
+"""tools/seen_store.py：Bloom 过滤器、已见 URL 存储与增量运行。"""
+import pytest
+
+from news_verify.tools.seen_store import BloomFilter, IncrementalRun, SeenUrlStore
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"https://example.com/news/{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(2000))
+    assert false_positives < 100  # 设计误判率 1%，留足余量
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SeenUrlStore(path=str(tmp_path / "seen.sqlite3"), bloom_capacity=1000)
+
+
+def test_store_filters_seen_urls_per_portal(store):
+    portal = "https://news.example.com/"
+    store.mark_seen(portal, ["https://news.example.com/a?utm_source=rss"])
+    # 按规范化 URL 判定，URL 变体同样视为已见
+    assert store.filter_new(portal, ["https://www.news.example.com/a/", "https://news.example.com/b"]) == [
+        "https://news.example.com/b"
+    ]
+    assert store.filter_new("https://other.example.com/", ["https://news.example.com/a"]) == [
+        "https://news.example.com/a"
+    ]
+    assert store.count(portal) == 1
+
+
+def _portal_data(*items):
+    return {"portal_url": "https://news.example.com/", "items": list(items)}
+
+
+def test_incremental_run_only_commits_checked_stories(store):
+    a = {"title": "A", "url": "https://news.example.com/a", "aliases": ["https://m.news.example.com/a-mobile"]}
+    b = {"title": "B", "url": "https://news.example.com/b"}
+    first = IncrementalRun("https://news.example.com/", store)
+    data = first.only_new(_portal_data(a, b))
+    assert [x["url"] for x in data["items"]] == [a["url"], b["url"]]
+    assert data["incremental"] is True and data["skipped_seen"] == 0
+    # 门户爬虫给出时不写入，核查完成才连同别名记为已见
+    assert store.count() == 0
+    first.commit(a["url"])
+    assert store.count() == 2 and first.committed == 1
+
+    second = IncrementalRun("https://news.example.com/", store)
+    data = second.only_new(_portal_data(a, b, {"title": "A again", "url": "https://m.news.example.com/a-mobile"}))
+    assert [x["url"] for x in data["items"]] == [b["url"]]
+    assert data["skipped_seen"] == 2
+
+
+def test_commit_of_unknown_url_is_recorded_under_the_run_portal(store):
+    run = IncrementalRun("https://news.example.com/", store)
+    run.commit("https://elsewhere.com/story")
+    assert store.filter_new("https://news.example.com/", ["https://elsewhere.com/story"]) == []
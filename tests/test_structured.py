@@ -0,0 +1,119 @@
+"""structured.py：结构化输出解析、按校验错误修复与 output_pydantic 结果的直接采用。"""
+import json
+
+import pytest
+
+from news_verify import structured
+from news_verify.structured import (
+    InterestResult,
+    NewsSelection,
+    StructuredOutput,
+    StructuredOutputError,
+    ensure_model,
+    parse_model,
+)
+
+
+class _FakeGateway:
+    """按顺序返回预设修复结果的 llm_gateway 替身；某项为异常时抛出。"""
+
+    def __init__(self, replies, available=True):
+        self.replies = list(replies)
+        self.available = available
+        self.calls = []
+
+    def chat(self, messages, stage="direct", **params):
+        self.calls.append({"messages": messages, "stage": stage, **params})
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return {"text": reply}
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    def install(replies, available=True):
+        fake = _FakeGateway(replies, available)
+        monkeypatch.setattr(structured, "llm_gateway", fake)
+        return fake
+    return install
+
+
+def test_parse_model_accepts_fences_trailing_text_and_bare_arrays():
+    obj, error = parse_model('```json\n{"interests": [" AI ", ""]}\n```\nDone.', InterestResult)
+    assert error == "" and obj.interests == ["AI"]
+    obj, _ = parse_model('Here: [{"title": "A\nB", "url": "https://a.com"}] ok', NewsSelection)
+    assert obj.items[0].title == "A B"
+    obj, error = parse_model("no json here", InterestResult)
+    assert obj is None and "Invalid JSON" in error
+
+
+def test_valid_output_needs_no_repair(gateway):
+    fake = gateway([])
+    out = StructuredOutput(max_repairs=2)
+    assert out.ensure('{"interests": ["AI"]}', InterestResult).interests == ["AI"]
+    assert fake.calls == []
+    assert out.snapshot() == {"native": 0, "parsed": 1, "repaired": 0, "repair_calls": 0, "failed": 0}
+
+
+def test_invalid_output_is_repaired_from_the_error_only(gateway):
+    fake = gateway(['{"interests": ["AI", "chips"]}'])
+    out = StructuredOutput(max_repairs=2)
+    obj = out.ensure('{"tags": ["AI"]}', InterestResult, stage="interest")
+    assert obj.interests == ["AI", "chips"]
+    call = fake.calls[0]
+    assert call["stage"] == "interest" and call["temperature"] == 0
+    assert call["response_format"]["type"] == "json_schema"
+    assert '{"tags": ["AI"]}' in call["messages"][-1]["content"]
+    assert out.stats["repaired"] == 1 and out.stats["repair_calls"] == 1
+
+
+def test_json_schema_rejection_falls_back_to_json_mode(gateway):
+    fake = gateway([_BadRequest("response_format json_schema unsupported"), '{"interests": ["AI"]}'])
+    out = StructuredOutput(max_repairs=1)
+    assert out.ensure("{}", InterestResult).interests == ["AI"]
+    assert [c["response_format"]["type"] for c in fake.calls] == ["json_schema", "json_object"]
+    # 本进程后续修复直接用 JSON mode
+    gateway(['{"interests": ["B"]}'])
+    out.ensure("{}", InterestResult)
+    assert structured.llm_gateway.calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_repair_gives_up_after_max_repairs(gateway):
+    fake = gateway(["still wrong", '{"interests": []}'])
+    out = StructuredOutput(max_repairs=2)
+    with pytest.raises(StructuredOutputError) as info:
+        out.ensure("nope", InterestResult)
+    assert len(fake.calls) == 2
+    assert info.value.raw == '{"interests": []}'
+    assert out.stats["failed"] == 1
+
+
+def test_no_repair_when_gateway_unavailable(gateway):
+    fake = gateway([], available=False)
+    with pytest.raises(StructuredOutputError):
+        StructuredOutput(max_repairs=2).ensure("nope", InterestResult)
+    assert fake.calls == []
+
+
+class _CrewOutput:
+    def __init__(self, pydantic=None, raw=""):
+        self.pydantic = pydantic
+        self.raw = raw
+
+
+def test_ensure_model_uses_output_pydantic_result(gateway):
+    fake = gateway([])
+    native = InterestResult(interests=["AI"])
+    before = structured.structured_output.snapshot()
+    assert ensure_model(_CrewOutput(native), InterestResult) is native
+    # 没有 pydantic 结果（或类型不符）时解析原始文本
+    raw = json.dumps({"items": [{"title": "T", "url": "https://a.com"}]})
+    assert ensure_model(_CrewOutput(native, raw), NewsSelection).items[0].url == "https://a.com"
+    delta = structured.structured_output.stats_since(before)
+    assert delta["native"] == 1 and delta["parsed"] == 1
+    assert fake.calls == []
@@ -2,9 +2,9 @@
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-import os
 import json
-import requests
+
+from news_verify.tools.search import search_backend
 
 
 class FileReadToolInput(BaseModel):
@@ -38,29 +38,7 @@ class SerperSearchTool(BaseTool):
     args_schema: Type[BaseModel] = SerperSearchToolInput
 
     def _run(self, query: str, num_results: int = 10) -> str:
-        try:
-            api_key = os.getenv("SERPER_API_KEY")
-            if not api_key:
-                return "Error: SERPER_API_KEY environment variable is not set"
-
-            url = "https://google.serper.dev/search"
-            payload = json.dumps({"q": query, "num": min(num_results, 100)})
-            headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
-
-            response = requests.request("POST", url, headers=headers, data=payload)
-
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                if "organic" in data:
-                    for item in data["organic"][:num_results]:
-                        results.append({
-                            "title": item.get("title", ""),
-                            "link": item.get("link", ""),
-                            "snippet": item.get("snippet", ""),
-                        })
-                return json.dumps(results, ensure_ascii=False, indent=2)
-            else:
-                return f"Error: API request failed with status {response.status_code}: {response.text}"
-        except Exception as e:
-            return f"Error executing search: {str(e)}"
+        result = search_backend.search(query, num_results)
+        if not result["ok"]:
+            return f"Error: {result['error']}"
+        return json.dumps(result["results"], ensure_ascii=False, indent=2)
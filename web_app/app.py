@@ -42,7 +42,7 @@ def _get_llm_info():
     return {"llm_provider": provider, "llm_model": model}
 
 
-def run_pipeline(portal_url: str, user_interest_desc: str, max_articles: int):
+def run_pipeline(portal_url: str, user_interest_desc: str, max_articles: int, incremental: bool = False):
     global current_log_path
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     current_log_path = RUNS_DIR / f"run_{ts}.log"
@@ -59,6 +59,7 @@ def run_pipeline(portal_url: str, user_interest_desc: str, max_articles: int):
                 "portal_url": portal_url,
                 "user_interest_desc": user_interest_desc[:200],
                 "max_articles": max_articles,
+                "incremental": incremental,
                 "llm_provider": llm_info["llm_provider"],
                 "llm_model": llm_info["llm_model"],
             },
@@ -92,6 +93,7 @@ def run_pipeline(portal_url: str, user_interest_desc: str, max_articles: int):
             user_interest_desc,
             max_articles=max_articles,
             on_event=on_event,
+            incremental=incremental,
         )
         event_queue.put_nowait({"step_id": "complete", "status": "done", "message": "流程结束", "detail": result[:500] if result else None})
     except Exception as e:
@@ -120,6 +122,7 @@ def api_run():
     user_interest_desc = (data.get("user_interest_desc") or "").strip() or "我对特朗普对外政策比较感兴趣"
     max_articles = int(data.get("max_articles") or 1)
     max_articles = max(1, min(10, max_articles))
+    incremental = bool(data.get("incremental"))
 
     # 清空旧事件
     while True:
@@ -130,7 +133,7 @@ def api_run():
 
     thread = threading.Thread(
         target=run_pipeline,
-        args=(portal_url, user_interest_desc, max_articles),
+        args=(portal_url, user_interest_desc, max_articles, incremental),
         daemon=True,
     )
     thread.start()